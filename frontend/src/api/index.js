@@ -112,13 +112,16 @@ export const riskApi = {
         update: (id, data) => api.put(`/risk/risks/${id}/`, data),
         delete: (id) => api.delete(`/risk/risks/${id}/`),
         matrix: (orgId) => api.get('/risk/risks/matrix/', { params: { organization: orgId } }),
+        matrixCounts: (orgId) => api.get('/risk/risks/matrix/', { params: { organization: orgId, mode: 'counts' } }),
+        matrixCell: (params) => api.get('/risk/risks/matrix_cell/', { params }),
         statistics: (orgId) => api.get('/risk/risks/statistics/', { params: { organization: orgId } })
     },
     assets: {
         list: (params) => api.get('/risk/assets/', { params })
     },
     categories: {
-        list: () => api.get('/risk/risk-categories/')
+        list: () => api.get('/risk/risk-categories/'),
+        tree: (params) => api.get('/risk/risk-categories/tree/', { params })
     }
 }
 
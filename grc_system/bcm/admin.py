@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     BusinessFunction, BusinessImpactAnalysis, BCPlan, DisasterRecoveryPlan,
     CrisisManagementTeam, CrisisTeamMember, CallTree, CallTreeNode,
-    CrisisIncident, BCMTest, BCMTestFinding
+    CrisisIncident, CrisisReadinessPack, BCMTest, BCMTestFinding
 )
 
 
@@ -59,6 +59,13 @@ class CrisisIncidentAdmin(admin.ModelAdmin):
     date_hierarchy = 'reported_at'
 
 
+@admin.register(CrisisReadinessPack)
+class CrisisReadinessPackAdmin(admin.ModelAdmin):
+    list_display = ['organization', 'is_stale', 'built_at']
+    list_filter = ['is_stale']
+    readonly_fields = ['payload', 'built_at']
+
+
 @admin.register(BCMTest)
 class BCMTestAdmin(admin.ModelAdmin):
     list_display = ['test_id', 'title', 'test_type', 'status', 'scheduled_date', 'coordinator']
@@ -0,0 +1,398 @@
+"""
+BCM Dependency Graph - In-memory analysis of business function dependencies.
+
+A function's `dependent_functions` are the functions it depends on, so
+when function D fails every function listing D (directly or transitively)
+is impacted. The graph loads an organization's functions and dependency
+edges once and indexes nodes 0..n-1, so every analysis runs in memory
+without further queries.
+
+Analyses:
+1. impact(function_id): who is affected if one function fails (iterative BFS)
+2. impact_scores(): transitive dependents, cascade depth and maximum
+   affected criticality for every function at once. Cycles are collapsed
+   into strongly connected components and reachability is propagated as
+   integer bitsets in reverse topological order, so a 3,000-function
+   organization is scored in milliseconds.
+3. recovery_schedule(rto_hours): recovery order in which every function
+   follows the functions it depends on, with earliest start times and
+   RTOs that cannot be met because of slower dependencies (Kahn, O(V+E)).
+
+For a single function, depths are shortest dependency hops. For scoring
+all functions at once, cascade depth is the longest chain of dependents
+below a function, with every dependency cycle collapsed into one level.
+"""
+from collections import deque
+
+
+# Criticality ranking (higher = more critical)
+CRITICALITY_RANKING = {
+    'desirable': 1,
+    'necessary': 2,
+    'essential': 3,
+    'critical': 4,
+}
+
+CRITICALITY_NAMES = {rank: name for name, rank in CRITICALITY_RANKING.items()}
+
+
+def disruption_risk(criticality, total_affected):
+    """
+    Score function disruption risk from its criticality and cascade size.
+
+    Args:
+        criticality: Function criticality
+        total_affected: Number of functions impacted by its failure
+
+    Returns:
+        dict: {'disruption_risk_score': float (1-5), 'risk_level': str}
+    """
+    base_score = CRITICALITY_RANKING.get(criticality, 1)
+
+    # Increase score based on cascade impact
+    cascade_multiplier = 1 + (total_affected * 0.1)
+    final_score = min(base_score * cascade_multiplier, 5)
+
+    if final_score >= 4:
+        risk_level = 'critical'
+    elif final_score >= 3:
+        risk_level = 'high'
+    elif final_score >= 2:
+        risk_level = 'medium'
+    else:
+        risk_level = 'low'
+
+    return {
+        'disruption_risk_score': round(final_score, 1),
+        'risk_level': risk_level,
+    }
+
+
+class DependencyGraph:
+    """
+    Integer-indexed dependency graph of an organization's business functions.
+
+    Attributes:
+        ids: Function id of each node
+        functions: Node attributes (id, function_id, name, criticality)
+        index: {function id: node}
+        dependents: dependents[i] lists the nodes impacted when node i fails
+        dependencies: dependencies[i] lists the nodes node i depends on
+    """
+
+    def __init__(self, functions, edges):
+        """
+        Args:
+            functions: Iterable of dicts with id, function_id, name, criticality
+            edges: Iterable of (function_id, depends_on_id) pairs; pairs with
+                   an endpoint outside `functions` are ignored
+        """
+        self.functions = list(functions)
+        self.ids = [func['id'] for func in self.functions]
+        self.index = {func_id: node for node, func_id in enumerate(self.ids)}
+        self.ranks = [CRITICALITY_RANKING.get(func['criticality'], 0) for func in self.functions]
+
+        self.dependents = [[] for _ in self.ids]
+        self.dependencies = [[] for _ in self.ids]
+        for function_id, depends_on_id in edges:
+            node = self.index.get(function_id)
+            target = self.index.get(depends_on_id)
+            if node is None or target is None:
+                continue
+            self.dependents[target].append(node)
+            self.dependencies[node].append(target)
+
+        self._components = None
+        self._scores = None
+
+    @classmethod
+    def for_organization(cls, organization_id):
+        """
+        Load an organization's dependency graph.
+
+        One query for the functions and one for the whole adjacency.
+
+        Args:
+            organization_id: Organization id
+
+        Returns:
+            DependencyGraph
+        """
+        from bcm.models import BusinessFunction
+
+        functions = BusinessFunction.objects.filter(
+            organization_id=organization_id
+        ).values('id', 'function_id', 'name', 'criticality').order_by('id')
+
+        edges = BusinessFunction.dependent_functions.through.objects.filter(
+            from_businessfunction__organization_id=organization_id
+        ).values_list('from_businessfunction_id', 'to_businessfunction_id')
+
+        return cls(functions, edges)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def impact(self, function_id):
+        """
+        Functions impacted if one function fails.
+
+        Args:
+            function_id: Id of the failing function
+
+        Returns:
+            dict: {
+                'direct_dependents': list of function names,
+                'all_affected': list of {id, name, criticality, depth},
+                'total_affected': count of all affected functions,
+                'max_criticality': highest criticality in chain,
+                'cascade_depth': how many levels of dependencies
+            }
+            depth is the shortest number of dependency hops from the failing
+            function; cascade_depth is the deepest of them.
+        """
+        start = self.index[function_id]
+        depth = self.distances(start)
+        affected = sorted(depth, key=lambda node: (depth[node], self.ids[node]))
+        max_rank = max((self.ranks[node] for node in affected), default=0)
+
+        return {
+            'direct_dependents': [
+                self.functions[node]['name'] for node in affected if depth[node] == 1
+            ],
+            'all_affected': [
+                {
+                    'id': self.ids[node],
+                    'name': self.functions[node]['name'],
+                    'criticality': self.functions[node]['criticality'],
+                    'depth': depth[node],
+                }
+                for node in affected
+            ],
+            'total_affected': len(affected),
+            'max_criticality': CRITICALITY_NAMES.get(max_rank, 'desirable'),
+            'cascade_depth': max(depth.values(), default=0),
+        }
+
+    def distances(self, start):
+        """
+        Shortest dependency hops from one node to every node it impacts.
+
+        Args:
+            start: Node index
+
+        Returns:
+            dict: {node: depth}; includes start only if it lies on a cycle
+        """
+        depth = {}
+        queue = deque([(start, 0)])
+
+        while queue:
+            node, level = queue.popleft()
+            for dependent in self.dependents[node]:
+                if dependent not in depth:
+                    depth[dependent] = level + 1
+                    queue.append((dependent, level + 1))
+
+        return depth
+
+    def strongly_connected_components(self):
+        """
+        Group nodes into strongly connected components (iterative Tarjan).
+
+        Returns:
+            tuple: (component of each node, list of member lists); components
+                   are numbered in reverse topological order of the
+                   `dependents` edges, i.e. every component's dependents
+                   have a lower number
+        """
+        if self._components is not None:
+            return self._components
+
+        count = len(self.ids)
+        order = [None] * count
+        low = [0] * count
+        on_stack = [False] * count
+        component = [None] * count
+        members = []
+        stack = []
+        counter = 0
+
+        for root in range(count):
+            if order[root] is not None:
+                continue
+
+            work = [(root, 0)]
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                node, position = work[-1]
+                neighbours = self.dependents[node]
+
+                if position < len(neighbours):
+                    work[-1] = (node, position + 1)
+                    child = neighbours[position]
+                    if order[child] is None:
+                        order[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack[child] = True
+                        work.append((child, 0))
+                    elif on_stack[child]:
+                        low[node] = min(low[node], order[child])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+
+                if low[node] == order[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component[member] = len(members)
+                        group.append(member)
+                        if member == node:
+                            break
+                    members.append(group)
+
+        self._components = (component, members)
+        return self._components
+
+    def cycles(self):
+        """
+        Dependency cycles, as lists of function ids.
+
+        Returns:
+            list: One list per strongly connected component that contains a cycle
+        """
+        component, members = self.strongly_connected_components()
+        return [
+            sorted(self.ids[node] for node in group)
+            for group in members
+            if len(group) > 1 or group[0] in self.dependents[group[0]]
+        ]
+
+    def impact_scores(self):
+        """
+        Impact of failure for every function at once.
+
+        Components are processed dependents-first; each one's reachable set
+        is the union of its dependents' sets, held as an integer bitset over
+        nodes.
+
+        Returns:
+            list: Per node {'total_affected', 'cascade_depth', 'max_criticality'}
+        """
+        if self._scores is not None:
+            return self._scores
+
+        component, members = self.strongly_connected_components()
+        cyclic = [
+            len(group) > 1 or group[0] in self.dependents[group[0]]
+            for group in members
+        ]
+        masks = [sum(1 << node for node in group) for group in members]
+        top_rank = [max(self.ranks[node] for node in group) for group in members]
+
+        # Nodes reachable strictly below each component, their highest
+        # criticality and the longest chain to reach them
+        below = [0] * len(members)
+        below_rank = [0] * len(members)
+        depth = [0] * len(members)
+
+        for comp, group in enumerate(members):
+            reach = 0
+            rank = 0
+            longest = 0
+            for node in group:
+                for dependent in self.dependents[node]:
+                    target = component[dependent]
+                    if target == comp:
+                        continue
+                    reach |= below[target] | masks[target]
+                    rank = max(rank, top_rank[target], below_rank[target])
+                    longest = max(longest, depth[target] + 1)
+            if cyclic[comp]:
+                # The rest of the cycle, and the function itself, are affected
+                reach |= masks[comp]
+                rank = max(rank, top_rank[comp])
+            below[comp] = reach
+            below_rank[comp] = rank
+            depth[comp] = longest
+
+        scores = []
+        for node in range(len(self.ids)):
+            comp = component[node]
+            scores.append({
+                'total_affected': bin(below[comp]).count('1'),
+                'cascade_depth': max(depth[comp], 1 if cyclic[comp] else 0),
+                'max_criticality': CRITICALITY_NAMES.get(below_rank[comp], 'desirable'),
+            })
+
+        self._scores = scores
+        return scores
+
+    def recovery_schedule(self, rto_hours):
+        """
+        Topologically ordered recovery schedule.
+
+        A function can only be restored once everything it depends on is
+        restored, so its earliest start is the latest achievable recovery
+        time of its dependencies and its achievable recovery time is the
+        later of that start and its own RTO. Functions on a dependency
+        cycle cannot be ordered and are left out of the schedule.
+
+        Args:
+            rto_hours: RTO of each node, in hours
+
+        Returns:
+            dict: {
+                'schedule': per node in recovery order {'node', 'wave',
+                    'earliest_start_hours', 'achievable_hours',
+                    'rto_reachable', 'blocking_node'},
+                'unscheduled': nodes on or behind a dependency cycle
+            }
+            wave is 1 for functions without dependencies and one more than
+            the highest wave among a function's dependencies.
+        """
+        count = len(self.ids)
+        waiting = [len(dependencies) for dependencies in self.dependencies]
+        start = [0] * count
+        blocking = [None] * count
+        wave = [1] * count
+        achievable = [0] * count
+
+        queue = deque(node for node in range(count) if waiting[node] == 0)
+        schedule = []
+        while queue:
+            node = queue.popleft()
+            achievable[node] = max(start[node], rto_hours[node])
+            schedule.append({
+                'node': node,
+                'wave': wave[node],
+                'earliest_start_hours': start[node],
+                'achievable_hours': achievable[node],
+                'rto_reachable': start[node] <= rto_hours[node],
+                'blocking_node': blocking[node] if start[node] > rto_hours[node] else None,
+            })
+            for dependent in self.dependents[node]:
+                # The slowest dependency sets the start
+                if blocking[dependent] is None or achievable[node] > start[dependent]:
+                    start[dependent] = achievable[node]
+                    blocking[dependent] = node
+                wave[dependent] = max(wave[dependent], wave[node] + 1)
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    queue.append(dependent)
+
+        scheduled = {entry['node'] for entry in schedule}
+        return {
+            'schedule': schedule,
+            'unscheduled': [node for node in range(count) if node not in scheduled],
+        }
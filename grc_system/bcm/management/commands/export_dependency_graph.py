@@ -0,0 +1,50 @@
+"""
+Management command to export a business function dependency graph.
+Streams the graph to a file or stdout without loading it into memory.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from bcm.export import DEFAULT_CHUNK_SIZE, GRAPH_EXPORT_FORMATS, export_graph
+
+
+class Command(BaseCommand):
+    help = 'Exports business functions, assets and their dependencies as GraphML, DOT or JSON lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization', type=int, required=True,
+            help='Organization ID to export'
+        )
+        parser.add_argument(
+            '--graph-format', choices=list(GRAPH_EXPORT_FORMATS), default='graphml',
+            help='Export format (default: graphml)'
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write (default: stdout)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help=f'Rows fetched per round trip (default: {DEFAULT_CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        from core.models import Organization
+
+        if not Organization.objects.filter(pk=options['organization']).exists():
+            raise CommandError(f"Organization {options['organization']} does not exist")
+
+        blocks = export_graph(
+            options['organization'], options['graph_format'], chunk_size=options['chunk_size']
+        )
+        if not options.get('output'):
+            for block in blocks:
+                self.stdout.write(block, ending='')
+            return
+
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            for block in blocks:
+                output.write(block)
+        self.stderr.write(self.style.SUCCESS(
+            f"Exported organization {options['organization']} to {options['output']}"
+        ))
@@ -0,0 +1,33 @@
+"""
+Management command to rebuild the business function dependency closure.
+"""
+from django.core.management.base import BaseCommand
+
+from bcm.services import DependencyClosureService
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds BusinessFunctionDependencyClosure from dependent_functions and reports cycles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization', type=int,
+            help='Only process this organization ID'
+        )
+
+    def handle(self, *args, **options):
+        from core.models import Organization
+
+        organizations = Organization.objects.all()
+        if options.get('organization'):
+            organizations = organizations.filter(pk=options['organization'])
+
+        for organization in organizations:
+            rows = DependencyClosureService.rebuild(organization.pk)
+            self.stdout.write(self.style.SUCCESS(
+                f'{organization.code}: {rows} closure row(s)'
+            ))
+            for cycle in DependencyClosureService.cycles(organization.pk):
+                self.stdout.write(self.style.WARNING(
+                    f'{organization.code}: dependency cycle between functions {cycle}'
+                ))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bcm', '0003_alter_businessimpactanalysis_assessment_date_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessFunctionDependencyClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(verbose_name='Depth')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_descendants', to='bcm.businessfunction', verbose_name='Ancestor')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='closure_ancestors', to='bcm.businessfunction', verbose_name='Descendant')),
+            ],
+            options={
+                'verbose_name': 'Business Function Dependency Closure',
+                'verbose_name_plural': 'Business Function Dependency Closures',
+                'ordering': ['ancestor', 'depth'],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated migration to build the dependency closure for existing functions
+
+from collections import defaultdict, deque
+
+from django.db import migrations
+
+
+def build_closure(apps, schema_editor):
+    BusinessFunction = apps.get_model('bcm', 'BusinessFunction')
+    Closure = apps.get_model('bcm', 'BusinessFunctionDependencyClosure')
+    Through = BusinessFunction.dependent_functions.through
+    
+    # F depends on D: D's failure affects F
+    dependents = defaultdict(list)
+    for function_id, depends_on_id in Through.objects.values_list(
+        'from_businessfunction_id', 'to_businessfunction_id'
+    ):
+        dependents[depends_on_id].append(function_id)
+    
+    rows = []
+    for ancestor_id in list(dependents):
+        depth = {}
+        queue = deque([(ancestor_id, 0)])
+        while queue:
+            node, level = queue.popleft()
+            for dependent in dependents.get(node, []):
+                if dependent not in depth:
+                    depth[dependent] = level + 1
+                    queue.append((dependent, level + 1))
+        rows.extend(
+            Closure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=hops)
+            for descendant_id, hops in depth.items()
+        )
+    
+    Closure.objects.bulk_create(rows, batch_size=1000)
+
+
+def clear_closure(apps, schema_editor):
+    apps.get_model('bcm', 'BusinessFunctionDependencyClosure').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bcm', '0004_businessfunctiondependencyclosure'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_closure, clear_closure),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bcm', '0005_build_dependency_closure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calltreenode',
+            name='call_duration_minutes',
+            field=models.PositiveIntegerField(blank=True, help_text='Expected time for the caller to reach this person; the simulation default applies if blank', null=True, verbose_name='Call Duration (Minutes)'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_create_departments'),
+        ('bcm', '0006_calltreenode_call_duration_minutes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrisisReadinessPack',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField(default=dict, verbose_name='Payload')),
+                ('is_stale', models.BooleanField(default=True, verbose_name='Stale')),
+                ('built_at', models.DateTimeField(blank=True, null=True, verbose_name='Built At')),
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='crisis_readiness_pack', to='core.organization', verbose_name='Organization')),
+            ],
+            options={
+                'verbose_name': 'Crisis Readiness Pack',
+                'verbose_name_plural': 'Crisis Readiness Packs',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bcm', '0007_crisisreadinesspack'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crisisreadinesspack',
+            name='generation',
+            field=models.PositiveIntegerField(default=0, verbose_name='Generation'),
+        ),
+    ]
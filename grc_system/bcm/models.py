@@ -102,6 +102,40 @@ class BusinessFunction(models.Model):
         return f"{self.function_id}: {self.name}"
 
 
+class BusinessFunctionDependencyClosure(models.Model):
+    """
+    إغلاق تبعيات الوظائف - Transitive closure of business function dependencies
+    
+    One row per (ancestor, descendant) pair where the descendant depends on
+    the ancestor directly or transitively, i.e. is affected if the ancestor
+    fails. depth is the shortest number of dependency hops; a row whose
+    ancestor is its own descendant marks a dependency cycle.
+    Maintained by bcm.services.DependencyClosureService.
+    """
+    ancestor = models.ForeignKey(
+        BusinessFunction,
+        on_delete=models.CASCADE,
+        related_name='closure_descendants',
+        verbose_name=_('Ancestor')
+    )
+    descendant = models.ForeignKey(
+        BusinessFunction,
+        on_delete=models.CASCADE,
+        related_name='closure_ancestors',
+        verbose_name=_('Descendant')
+    )
+    depth = models.PositiveIntegerField(_('Depth'))
+    
+    class Meta:
+        verbose_name = _('Business Function Dependency Closure')
+        verbose_name_plural = _('Business Function Dependency Closures')
+        ordering = ['ancestor', 'depth']
+        unique_together = ['ancestor', 'descendant']
+    
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+
 class BusinessImpactAnalysis(models.Model):
     """
     تحليل أثر الأعمال - Business Impact Analysis (BIA)
@@ -661,6 +695,11 @@ class CallTreeNode(models.Model):
     order = models.PositiveIntegerField(_('Call Order'), default=1)
     phone = models.CharField(_('Phone'), max_length=20)
     alternate_phone = models.CharField(_('Alternate Phone'), max_length=20, blank=True)
+    call_duration_minutes = models.PositiveIntegerField(
+        _('Call Duration (Minutes)'),
+        null=True, blank=True,
+        help_text=_('Expected time for the caller to reach this person; the simulation default applies if blank')
+    )
     
     class Meta:
         verbose_name = _('Call Tree Node')
@@ -801,6 +840,36 @@ class CrisisIncident(models.Model):
         return f"{self.incident_id}: {self.title}"
 
 
+class CrisisReadinessPack(models.Model):
+    """
+    حزمة الجاهزية للأزمات - Precomputed crisis response data of an organization
+    
+    Denormalizes functions and their dependencies, active BC/DR plans,
+    crisis team members and call tree recipients into one JSON payload, so
+    declaring a crisis reads a single row. Source changes mark the pack
+    stale and schedule a debounced rebuild (see bcm.services.CrisisReadinessService).
+    Each change also bumps the generation, so a rebuild that read the sources
+    before the change leaves the pack stale.
+    """
+    organization = models.OneToOneField(
+        'core.Organization', 
+        on_delete=models.CASCADE,
+        related_name='crisis_readiness_pack',
+        verbose_name=_('Organization')
+    )
+    payload = models.JSONField(_('Payload'), default=dict)
+    is_stale = models.BooleanField(_('Stale'), default=True)
+    generation = models.PositiveIntegerField(_('Generation'), default=0)
+    built_at = models.DateTimeField(_('Built At'), null=True, blank=True)
+    
+    class Meta:
+        verbose_name = _('Crisis Readiness Pack')
+        verbose_name_plural = _('Crisis Readiness Packs')
+    
+    def __str__(self):
+        return f"Crisis readiness: {self.organization_id} ({'stale' if self.is_stale else self.built_at})"
+
+
 class BCMTest(models.Model):
     """
     اختبار استمرارية الأعمال - BCM Test/Exercise
@@ -0,0 +1,303 @@
+"""
+BCM Test Scheduling - Conflict-free annual test calendar for BC/DR plans.
+
+Plans must be tested at least annually (see check_plan_test_status). The
+scheduler picks up every active plan whose next test falls due within a
+horizon and assigns each a working day on which none of its participants
+is already booked:
+
+1. Participants of a plan are the people who took part in or coordinated
+   its earlier tests, plus the plan owner.
+2. Plans are placed earliest due date first. Each takes the latest free
+   day on or before its due date, so the annual cycle is kept; overdue
+   plans take the earliest free day.
+3. A day is free for a plan when the test count is below the daily
+   capacity and it shares no participant with the tests already booked
+   that day (planned tests and earlier placements). If no day is free, the
+   day with the fewest double-booked participants is used and the
+   conflicts are reported.
+
+Bookings are held as {day: set of user ids}, so each check is a set
+intersection, and all data is loaded with four queries.
+
+Each placed test gets a test_id made of the plan kind, plan id and date,
+with a numeric suffix if that id is already taken in the organization
+(e.g. by a cancelled test of the same plan on the same day).
+"""
+import bisect
+from collections import defaultdict
+from datetime import timedelta
+
+from .services import ACTIVE_PLAN_STATUSES
+
+
+# Friday and Saturday
+WEEKEND_DAYS = {4, 5}
+
+# Plans are due for a test this many days after the last one
+TEST_INTERVAL_DAYS = 365
+
+# Test statuses that occupy their participants
+ACTIVE_TEST_STATUSES = ['planned', 'in_progress']
+
+
+class TestCalendar:
+    """
+    Working-day bookings within a scheduling window.
+
+    Attributes:
+        days: Working days of the window, in order
+        booked: {day: set of booked user ids}
+        load: {day: number of tests}
+    """
+
+    def __init__(self, start, end, tests_per_day=2):
+        self.days = [
+            start + timedelta(days=offset)
+            for offset in range((end - start).days + 1)
+            if (start + timedelta(days=offset)).weekday() not in WEEKEND_DAYS
+        ]
+        self.tests_per_day = tests_per_day
+        self.booked = defaultdict(set)
+        self.load = defaultdict(int)
+
+    def book(self, day, participants):
+        """Record a test on a day."""
+        self.booked[day].update(participants)
+        self.load[day] += 1
+
+    def candidates(self, due_date):
+        """Days in placement order: on or before the due date latest first, then later days."""
+        split = bisect.bisect_right(self.days, due_date)
+        return self.days[:split][::-1] + self.days[split:]
+
+    def place(self, due_date, participants):
+        """
+        Choose the day for one test.
+
+        Args:
+            due_date: Date the plan's test is due
+            participants: Set of participant user ids
+
+        Returns:
+            tuple: (day or None if every day is at capacity, set of
+                    double-booked user ids)
+        """
+        best = None
+        for day in self.candidates(due_date):
+            if self.load[day] >= self.tests_per_day:
+                continue
+            conflicts = participants & self.booked[day]
+            if not conflicts:
+                return day, set()
+            if best is None or len(conflicts) < len(best[1]):
+                best = (day, conflicts)
+        return best if best is not None else (None, set())
+
+
+def _unique_test_id(base, taken):
+    """base, or base with the lowest free numeric suffix; the result is added to taken."""
+    test_id, suffix = base, 1
+    while test_id in taken:
+        suffix += 1
+        test_id = f'{base}-{suffix}'
+    taken.add(test_id)
+    return test_id
+
+
+def plan_test_calendar(organization_id, start, horizon_days=90, tests_per_day=2):
+    """
+    Schedule tests for every active plan due within a horizon.
+
+    Args:
+        organization_id: Organization id
+        start: First schedulable day
+        horizon_days: Length of the scheduling window in days
+        tests_per_day: Maximum tests on one day
+
+    Returns:
+        dict: {
+            'start', 'end',
+            'scheduled': one entry per placed plan test, by date,
+            'already_scheduled': plans with an upcoming planned test,
+            'unscheduled': plans for which every day was at capacity,
+            'summary': counts and double-booked participants
+        }
+    """
+    from .models import BCMTest, BCPlan, DisasterRecoveryPlan
+
+    end = start + timedelta(days=horizon_days - 1)
+
+    plans = []
+    for kind, model in (('bc', BCPlan), ('dr', DisasterRecoveryPlan)):
+        for plan in model.objects.filter(
+            organization_id=organization_id, status__in=ACTIVE_PLAN_STATUSES
+        ).values('id', 'plan_id', 'title', 'owner_id', 'last_tested_date'):
+            plans.append({'kind': kind, **plan})
+
+    calendar = TestCalendar(start, end, tests_per_day=tests_per_day)
+
+    # Past and upcoming tests: who tested each plan, and which days are taken
+    test_plan = {}
+    test_day = {}
+    participants = defaultdict(set)
+    upcoming = set()
+    taken_test_ids = set()
+    for test_id, code, bc_plan_id, dr_plan_id, test_status, scheduled_date, coordinator_id in BCMTest.objects.filter(
+        organization_id=organization_id
+    ).values_list(
+        'id', 'test_id', 'bc_plan_id', 'dr_plan_id', 'status', 'scheduled_date', 'coordinator_id'
+    ):
+        # Cancelled tests keep their test_id but book nobody
+        taken_test_ids.add(code)
+        if test_status == 'cancelled':
+            continue
+        plan_keys = [key for key in (('bc', bc_plan_id), ('dr', dr_plan_id)) if key[1]]
+        test_plan[test_id] = plan_keys
+        for key in plan_keys:
+            if coordinator_id:
+                participants[key].add(coordinator_id)
+        if test_status in ACTIVE_TEST_STATUSES and scheduled_date >= start:
+            upcoming.update(plan_keys)
+            if scheduled_date <= end:
+                test_day[test_id] = scheduled_date
+                calendar.load[scheduled_date] += 1
+                if coordinator_id:
+                    calendar.booked[scheduled_date].add(coordinator_id)
+
+    for test_id, user_id in BCMTest.participants.through.objects.filter(
+        bcmtest__organization_id=organization_id
+    ).exclude(bcmtest__status='cancelled').values_list('bcmtest_id', 'user_id'):
+        for key in test_plan.get(test_id, []):
+            participants[key].add(user_id)
+        if test_id in test_day:
+            calendar.booked[test_day[test_id]].add(user_id)
+
+    due = []
+    already_scheduled = []
+    for plan in plans:
+        key = (plan['kind'], plan['id'])
+        if plan['last_tested_date']:
+            due_date = plan['last_tested_date'] + timedelta(days=TEST_INTERVAL_DAYS)
+        else:
+            due_date = start
+        if key in upcoming:
+            already_scheduled.append({**plan, 'due_date': due_date})
+        elif due_date <= end:
+            team = set(participants[key])
+            if plan['owner_id']:
+                team.add(plan['owner_id'])
+            due.append((due_date, -len(team), plan['kind'], plan['id'], plan, team))
+
+    scheduled = []
+    unscheduled = []
+    for due_date, _, _, _, plan, team in sorted(due, key=lambda item: item[:4]):
+        day, conflicts = calendar.place(due_date, team)
+        entry = {
+            'plan_type': plan['kind'],
+            'plan': plan['id'],
+            'plan_id': plan['plan_id'],
+            'title': plan['title'],
+            'last_tested_date': plan['last_tested_date'],
+            'due_date': due_date,
+            'participants': sorted(team),
+        }
+        if day is None:
+            unscheduled.append(entry)
+            continue
+        calendar.book(day, team)
+        scheduled.append({
+            **entry,
+            'test_id': _unique_test_id(f"{plan['kind'].upper()}-{plan['plan_id']}-T{day:%Y%m%d}", taken_test_ids),
+            'scheduled_date': day,
+            'overdue': due_date < start,
+            'after_due_date': day > due_date,
+            'double_booked': sorted(conflicts),
+        })
+
+    scheduled.sort(key=lambda entry: (entry['scheduled_date'], entry['plan_id']))
+    return {
+        'start': start,
+        'end': end,
+        'scheduled': scheduled,
+        'already_scheduled': already_scheduled,
+        'unscheduled': unscheduled,
+        'summary': {
+            'plans_due': len(due),
+            'scheduled': len(scheduled),
+            'already_scheduled': len(already_scheduled),
+            'unscheduled': len(unscheduled),
+            'after_due_date': sum(1 for entry in scheduled if entry['after_due_date']),
+            'double_bookings': sum(len(entry['double_booked']) for entry in scheduled),
+        },
+    }
+
+
+def create_scheduled_tests(organization_id, scheduled, created_by=None):
+    """
+    Create planned BCMTest rows for a calendar with bulk inserts.
+
+    bulk_create skips the model signals, so their effects are applied
+    here: tests created by an author who is not a manager are created
+    pending_approval and each gets a content-approval workflow, as when a
+    test is created one at a time (trigger_bcmtest_workflow), and the
+    organization summary counters and response cache are updated.
+
+    Args:
+        organization_id: Organization id
+        scheduled: 'scheduled' entries from plan_test_calendar
+        created_by: User creating the tests
+
+    Returns:
+        list: Created BCMTest instances
+
+    Raises:
+        IntegrityError: A test_id was taken after the calendar was planned
+    """
+    from django.db import transaction
+    from core.cache import bump_organization
+    from dashboard.services import OrganizationSummaryService
+    from .models import BCMTest
+    from .signals import start_content_workflow, user_is_author, user_is_manager
+
+    needs_approval = user_is_author(created_by) and not user_is_manager(created_by)
+    test_status = 'pending_approval' if needs_approval else 'planned'
+    tests = [
+        BCMTest(
+            organization_id=organization_id,
+            test_id=entry['test_id'],
+            title=f"Annual test: {entry['title']}",
+            status=test_status,
+            bc_plan_id=entry['plan'] if entry['plan_type'] == 'bc' else None,
+            dr_plan_id=entry['plan'] if entry['plan_type'] == 'dr' else None,
+            scenario='Scheduled annual plan test',
+            scheduled_date=entry['scheduled_date'],
+            created_by=created_by,
+        )
+        for entry in scheduled
+    ]
+
+    Participant = BCMTest.participants.through
+    with transaction.atomic():
+        BCMTest.objects.bulk_create(tests, batch_size=500)
+        Participant.objects.bulk_create(
+            [
+                Participant(bcmtest_id=test.pk, user_id=user_id)
+                for test, entry in zip(tests, scheduled)
+                for user_id in entry['participants']
+            ],
+            batch_size=1000
+        )
+        source = OrganizationSummaryService.get_source(BCMTest)
+        OrganizationSummaryService.record_changes(source, [
+            (None, (test.organization_id, source['metrics']({'status': test.status})))
+            for test in tests
+        ])
+
+    if needs_approval:
+        for test in tests:
+            start_content_workflow(test, created_by, 'BCMTest', 'test_id')
+
+    # bulk_create bypasses the cache invalidation signals
+    bump_organization(organization_id)
+    return tests
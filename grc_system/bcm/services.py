@@ -0,0 +1,511 @@
+"""
+BCM services for the GRC system.
+Maintains the business function dependency closure table and the
+precomputed crisis readiness packs.
+"""
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyClosureService:
+    """
+    Service class for BusinessFunctionDependencyClosure.
+
+    A dependency "F depends on D" is the impact edge D -> F: if D fails,
+    F is affected. The closure holds every (ancestor, descendant) pair
+    connected by impact edges with the shortest depth, so "who is affected
+    if X fails" is a single indexed lookup on ancestor.
+    """
+
+    @classmethod
+    def add_edges(cls, edges):
+        """
+        Extend the closure with new dependency edges.
+
+        For an edge D -> F every ancestor of D (and D) now reaches every
+        descendant of F (and F) through it; existing pairs keep the shorter
+        depth.
+
+        Args:
+            edges: Iterable of (function_id, depends_on_id) pairs
+
+        Returns:
+            list: Function ids found on a dependency cycle after the change
+        """
+        from .models import BusinessFunctionDependencyClosure as Closure
+
+        touched = set()
+        for function_id, depends_on_id in edges:
+            ancestors = {depends_on_id: 0}
+            for ancestor_id, depth in Closure.objects.filter(
+                descendant_id=depends_on_id
+            ).values_list('ancestor_id', 'depth'):
+                ancestors[ancestor_id] = min(depth, ancestors.get(ancestor_id, depth))
+
+            descendants = {function_id: 0}
+            for descendant_id, depth in Closure.objects.filter(
+                ancestor_id=function_id
+            ).values_list('descendant_id', 'depth'):
+                descendants[descendant_id] = min(depth, descendants.get(descendant_id, depth))
+
+            existing = {
+                (ancestor_id, descendant_id): (pk, depth)
+                for pk, ancestor_id, descendant_id, depth in Closure.objects.filter(
+                    ancestor_id__in=ancestors, descendant_id__in=descendants
+                ).values_list('pk', 'ancestor_id', 'descendant_id', 'depth')
+            }
+
+            new_rows = []
+            shorter = defaultdict(list)
+            for ancestor_id, up in ancestors.items():
+                for descendant_id, down in descendants.items():
+                    depth = up + 1 + down
+                    current = existing.get((ancestor_id, descendant_id))
+                    if current is None:
+                        new_rows.append(Closure(
+                            ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth
+                        ))
+                    elif depth < current[1]:
+                        shorter[depth].append(current[0])
+
+            Closure.objects.bulk_create(new_rows, batch_size=1000)
+            for depth, pks in shorter.items():
+                Closure.objects.filter(pk__in=pks).update(depth=depth)
+
+            touched.update(ancestors)
+
+        return cls.cyclic_functions(touched)
+
+    @classmethod
+    def rebuild(cls, organization_id, ancestor_ids=None):
+        """
+        Recompute closure rows from the current dependency graph.
+
+        Used after dependencies are removed, where shortest depths cannot be
+        updated incrementally.
+
+        Args:
+            organization_id: Organization whose graph to load
+            ancestor_ids: Optional function ids to recompute; all if omitted
+
+        Returns:
+            int: Number of closure rows written
+        """
+        from .graph import DependencyGraph
+        from .models import BusinessFunctionDependencyClosure as Closure
+
+        graph = DependencyGraph.for_organization(organization_id)
+        if ancestor_ids is None:
+            nodes = range(len(graph))
+        else:
+            nodes = [graph.index[pk] for pk in ancestor_ids if pk in graph.index]
+
+        rows = []
+        for node in nodes:
+            ancestor_id = graph.ids[node]
+            for dependent, depth in graph.distances(node).items():
+                rows.append(Closure(
+                    ancestor_id=ancestor_id, descendant_id=graph.ids[dependent], depth=depth
+                ))
+
+        with transaction.atomic():
+            existing = Closure.objects.all()
+            if ancestor_ids is None:
+                existing = existing.filter(ancestor__organization_id=organization_id)
+            else:
+                existing = existing.filter(ancestor_id__in=ancestor_ids)
+            existing.delete()
+            Closure.objects.bulk_create(rows, batch_size=1000)
+
+        return len(rows)
+
+    @classmethod
+    def ancestors_of(cls, function_ids):
+        """
+        Functions whose failure reaches any of the given functions.
+
+        Returns:
+            set: The given ids plus all their ancestors
+        """
+        from .models import BusinessFunctionDependencyClosure as Closure
+
+        function_ids = set(function_ids)
+        return function_ids | set(
+            Closure.objects.filter(descendant_id__in=function_ids).values_list('ancestor_id', flat=True)
+        )
+
+    @classmethod
+    def cyclic_functions(cls, function_ids=None, organization_id=None):
+        """
+        Functions that (transitively) depend on themselves.
+
+        Args:
+            function_ids: Optional ids to restrict the check to
+            organization_id: Optional organization to restrict the check to
+
+        Returns:
+            list: Function ids on a dependency cycle
+        """
+        from .models import BusinessFunctionDependencyClosure as Closure
+
+        rows = Closure.objects.filter(descendant_id=F('ancestor_id'))
+        if function_ids is not None:
+            rows = rows.filter(ancestor_id__in=function_ids)
+        if organization_id:
+            rows = rows.filter(ancestor__organization_id=organization_id)
+        return sorted(rows.values_list('ancestor_id', flat=True))
+
+    @classmethod
+    def cycles(cls, organization_id):
+        """
+        Dependency cycles of an organization, grouped from self rows.
+
+        Returns:
+            list: One sorted list of function ids per cycle
+        """
+        from .models import BusinessFunctionDependencyClosure as Closure
+
+        cyclic = cls.cyclic_functions(organization_id=organization_id)
+        reaches = defaultdict(set)
+        for ancestor_id, descendant_id in Closure.objects.filter(
+            ancestor_id__in=cyclic, descendant_id__in=cyclic
+        ).values_list('ancestor_id', 'descendant_id'):
+            reaches[ancestor_id].add(descendant_id)
+
+        # Two cyclic functions share a cycle when each reaches the other
+        groups = []
+        seen = set()
+        for function_id in cyclic:
+            if function_id in seen:
+                continue
+            group = sorted(
+                other for other in reaches[function_id]
+                if function_id in reaches[other]
+            )
+            seen.update(group)
+            groups.append(group)
+        return groups
+
+    @classmethod
+    def impact(cls, business_function):
+        """
+        Functions affected if one function fails, from a single closure lookup.
+
+        Args:
+            business_function: BusinessFunction instance or id
+
+        Returns:
+            list: [{'id', 'function_id', 'name', 'criticality', 'depth'}] by depth
+        """
+        from .models import BusinessFunctionDependencyClosure as Closure
+
+        return [
+            {
+                'id': row['descendant_id'],
+                'function_id': row['descendant__function_id'],
+                'name': row['descendant__name'],
+                'criticality': row['descendant__criticality'],
+                'depth': row['depth'],
+            }
+            for row in Closure.objects.filter(ancestor=business_function).values(
+                'descendant_id', 'descendant__function_id', 'descendant__name',
+                'descendant__criticality', 'depth',
+            ).order_by('depth', 'descendant_id')
+        ]
+
+
+# Plan statuses that count as ready to activate
+ACTIVE_PLAN_STATUSES = ['approved', 'active']
+
+CRISIS_READINESS_SCHEDULED_KEY = 'bcm:crisis-readiness:scheduled:{organization_id}'
+
+
+class CrisisReadinessService:
+    """
+    Service class for CrisisReadinessPack.
+
+    The pack is rebuilt from a fixed number of queries and read by crisis
+    declaration, which then resolves affected dependents, plans and
+    recipients in memory instead of walking the models at incident time.
+    """
+
+    @classmethod
+    def build(cls, organization_id):
+        """
+        Rebuild the readiness pack of an organization.
+
+        The pack's generation is read before the sources. If a change bumped
+        it while the sources were being read, the new payload is stored but
+        the pack stays stale for the rebuild that change scheduled.
+
+        Args:
+            organization_id: Organization id
+
+        Returns:
+            CrisisReadinessPack
+        """
+        from django.utils import timezone
+        from .models import (
+            BCPlan, BusinessFunction, CallTree, CallTreeNode, CrisisManagementTeam,
+            CrisisReadinessPack, CrisisTeamMember, DisasterRecoveryPlan
+        )
+
+        pack, created = CrisisReadinessPack.objects.get_or_create(organization_id=organization_id)
+        generation = pack.generation
+
+        functions = list(BusinessFunction.objects.filter(
+            organization_id=organization_id
+        ).values('id', 'function_id', 'name', 'criticality', 'status').order_by('id'))
+
+        dependencies = [
+            list(edge) for edge in BusinessFunction.dependent_functions.through.objects.filter(
+                from_businessfunction__organization_id=organization_id
+            ).values_list('from_businessfunction_id', 'to_businessfunction_id')
+        ]
+
+        bc_plans = {
+            plan['id']: {**plan, 'covered_functions': []}
+            for plan in BCPlan.objects.filter(
+                organization_id=organization_id, status__in=ACTIVE_PLAN_STATUSES
+            ).values('id', 'plan_id', 'title', 'status', 'owner_id').order_by('plan_id')
+        }
+        for plan_id, function_id in BCPlan.covered_functions.through.objects.filter(
+            bcplan__organization_id=organization_id,
+            bcplan__status__in=ACTIVE_PLAN_STATUSES,
+        ).values_list('bcplan_id', 'businessfunction_id'):
+            bc_plans[plan_id]['covered_functions'].append(function_id)
+
+        dr_plans = list(DisasterRecoveryPlan.objects.filter(
+            organization_id=organization_id, status__in=ACTIVE_PLAN_STATUSES
+        ).values('id', 'plan_id', 'title', 'status', 'owner_id', 'bc_plan_id').order_by('plan_id'))
+
+        teams = {
+            team['id']: {**team, 'members': []}
+            for team in CrisisManagementTeam.objects.filter(
+                organization_id=organization_id, is_active=True
+            ).values('id', 'name')
+        }
+        for member in CrisisTeamMember.objects.filter(team_id__in=teams).values(
+            'team_id', 'user_id', 'user__first_name', 'user__last_name', 'role',
+            'primary_phone', 'secondary_phone', 'is_primary', 'backup_member__user_id',
+        ).order_by('team_id', 'id'):
+            teams[member['team_id']]['members'].append({
+                'user_id': member['user_id'],
+                'name': f"{member['user__first_name']} {member['user__last_name']}".strip(),
+                'role': member['role'],
+                'primary_phone': member['primary_phone'],
+                'secondary_phone': member['secondary_phone'],
+                'is_primary': member['is_primary'],
+                'backup_user_id': member['backup_member__user_id'],
+            })
+
+        call_trees = {
+            tree['id']: {**tree, 'recipient_ids': []}
+            for tree in CallTree.objects.filter(
+                organization_id=organization_id, is_active=True
+            ).values('id', 'name', 'root_caller_id')
+        }
+        for tree_id, user_id in CallTreeNode.objects.filter(
+            call_tree_id__in=call_trees
+        ).values_list('call_tree_id', 'user_id').order_by('call_tree_id', 'order'):
+            call_trees[tree_id]['recipient_ids'].append(user_id)
+
+        payload = {
+            'functions': functions,
+            'dependencies': dependencies,
+            'bc_plans': list(bc_plans.values()),
+            'dr_plans': dr_plans,
+            'teams': list(teams.values()),
+            'call_trees': list(call_trees.values()),
+        }
+        packs = CrisisReadinessPack.objects.filter(pk=pack.pk)
+        built_at = timezone.now()
+        if not packs.filter(generation=generation).update(
+            payload=payload, is_stale=False, built_at=built_at
+        ):
+            packs.update(payload=payload, built_at=built_at)
+        pack.refresh_from_db()
+        return pack
+
+    @classmethod
+    def get_pack(cls, organization_id):
+        """
+        Current readiness pack, rebuilt first if missing or stale.
+
+        Returns:
+            CrisisReadinessPack
+        """
+        from .models import CrisisReadinessPack
+
+        pack = CrisisReadinessPack.objects.filter(organization_id=organization_id).first()
+        if pack is None or pack.is_stale:
+            pack = cls.build(organization_id)
+        return pack
+
+    @classmethod
+    def mark_stale(cls, organization_id):
+        """Flag an organization's pack as stale and schedule its rebuild."""
+        from django.db.models import F
+        from .models import CrisisReadinessPack
+
+        # Bumped even when already stale, for a rebuild that is running now
+        updated = CrisisReadinessPack.objects.filter(
+            organization_id=organization_id
+        ).update(is_stale=True, generation=F('generation') + 1)
+        if updated:
+            cls.schedule_rebuild(organization_id)
+
+    @classmethod
+    def schedule_rebuild(cls, organization_id):
+        """Schedule the debounced rebuild task unless one is already pending."""
+        from django.conf import settings
+        from django.core.cache import cache
+
+        debounce = getattr(settings, 'CRISIS_READINESS_DEBOUNCE_SECONDS', 30)
+        key = CRISIS_READINESS_SCHEDULED_KEY.format(organization_id=organization_id)
+
+        if not cache.add(key, True, timeout=debounce * 2):
+            return
+
+        def enqueue():
+            from .tasks import rebuild_crisis_readiness_pack
+            try:
+                rebuild_crisis_readiness_pack.apply_async(args=[organization_id], countdown=debounce)
+            except Exception as e:
+                # The pack stays stale; declaration rebuilds it on demand
+                cache.delete(key)
+                logger.warning(f"Could not schedule crisis readiness rebuild: {e}")
+
+        transaction.on_commit(enqueue)
+
+    @classmethod
+    def brief(cls, payload, affected_function_ids, crisis_team_id=None, bc_plan_id=None, dr_plan_id=None):
+        """
+        Resolve the response to a crisis from a readiness pack.
+
+        Args:
+            payload: CrisisReadinessPack payload
+            affected_function_ids: Ids of the functions directly affected
+            crisis_team_id: Assigned crisis team; all active teams if None
+            bc_plan_id, dr_plan_id: Plans activated for the incident, if any
+
+        Returns:
+            dict: {
+                'affected_functions', 'impacted_dependents': functions reached
+                through dependencies with their depth,
+                'bc_plans', 'dr_plans': active plans covering any of them,
+                'crisis_teams', 'call_trees',
+                'recipients': {user id: list of reasons}
+            }
+        """
+        from .graph import DependencyGraph
+
+        graph = DependencyGraph(payload['functions'], payload['dependencies'])
+        affected = [pk for pk in affected_function_ids if pk in graph.index]
+        affected_set = set(affected)
+
+        depth = {}
+        for function_id in affected:
+            for node, level in graph.distances(graph.index[function_id]).items():
+                dependent_id = graph.ids[node]
+                if dependent_id not in affected_set and level < depth.get(dependent_id, level + 1):
+                    depth[dependent_id] = level
+
+        def describe(function_id, **extra):
+            func = graph.functions[graph.index[function_id]]
+            return {
+                'id': function_id,
+                'function_id': func['function_id'],
+                'name': func['name'],
+                'criticality': func['criticality'],
+                **extra,
+            }
+
+        impacted = affected_set | set(depth)
+        bc_plans = [
+            {key: plan[key] for key in ('id', 'plan_id', 'title', 'status', 'owner_id')}
+            for plan in payload['bc_plans']
+            if plan['id'] == bc_plan_id or impacted.intersection(plan['covered_functions'])
+        ]
+        bc_plan_ids = {plan['id'] for plan in bc_plans}
+        dr_plans = [
+            plan for plan in payload['dr_plans']
+            if plan['id'] == dr_plan_id or plan['bc_plan_id'] in bc_plan_ids
+        ]
+        teams = [
+            team for team in payload['teams']
+            if crisis_team_id is None or team['id'] == crisis_team_id
+        ]
+
+        recipients = defaultdict(list)
+        for team in teams:
+            for member in team['members']:
+                recipients[member['user_id']].append(f"crisis_team:{member['role']}")
+        for tree in payload['call_trees']:
+            for user_id in [tree['root_caller_id'], *tree['recipient_ids']]:
+                if user_id and 'call_tree' not in recipients[user_id]:
+                    recipients[user_id].append('call_tree')
+        for plan in bc_plans + dr_plans:
+            if plan['owner_id']:
+                recipients[plan['owner_id']].append('plan_owner')
+
+        return {
+            'affected_functions': [describe(pk) for pk in affected],
+            'impacted_dependents': [
+                describe(pk, depth=level)
+                for pk, level in sorted(depth.items(), key=lambda item: (item[1], item[0]))
+            ],
+            'bc_plans': bc_plans,
+            'dr_plans': dr_plans,
+            'crisis_teams': teams,
+            'call_trees': [
+                {'id': tree['id'], 'name': tree['name'], 'recipients': len(tree['recipient_ids'])}
+                for tree in payload['call_trees']
+            ],
+            'recipients': dict(recipients),
+        }
+
+    @classmethod
+    def notify(cls, incident, recipient_ids, batch_size=1000):
+        """
+        Notify everyone involved in a declared crisis with one bulk insert.
+
+        Args:
+            incident: CrisisIncident being declared
+            recipient_ids: User ids to notify
+
+        Returns:
+            int: Number of notifications created
+        """
+        from notifications.models import Notification
+
+        subject = f"Crisis Declared: {incident.title}"
+        body = f"""
+A crisis has been declared and you are part of the response.
+
+Incident: {incident.incident_id}
+Type: {incident.get_incident_type_display()}
+Severity: {incident.get_severity_display()}
+Declared At: {incident.declared_at.strftime('%Y-%m-%d %H:%M') if incident.declared_at else 'N/A'}
+
+{incident.impact_description}
+"""
+        notifications = [
+            Notification(
+                recipient_id=user_id,
+                subject=subject,
+                body=body,
+                channel='in_app',
+                priority='urgent',
+                content_type='bcm.crisisincident',
+                object_id=incident.pk,
+            )
+            for user_id in sorted(recipient_ids)
+        ]
+        Notification.objects.bulk_create(notifications, batch_size=batch_size)
+        return len(notifications)
@@ -2,11 +2,14 @@
 BCM app signals for workflow integration.
 Auto-triggers workflows when authors create BCM content.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 import logging
 
-from .models import BusinessFunction, BCPlan, DisasterRecoveryPlan, BCMTest
+from .models import (
+    BusinessFunction, BCPlan, DisasterRecoveryPlan, BCMTest,
+    CrisisManagementTeam, CrisisTeamMember, CallTree, CallTreeNode
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,13 +39,10 @@ def user_is_manager(user):
 def start_content_workflow(obj, creator, model_name, id_field='pk'):
     """Helper to start content approval workflow."""
     from workflow.services import WorkflowService
-    from workflow.models import WorkflowTemplate
+    from workflow.compiled import get_compiled_template
     
     try:
-        template = WorkflowTemplate.objects.filter(
-            code='content-approval',
-            is_active=True
-        ).first()
+        template = get_compiled_template('content-approval')
         
         if template:
             existing_workflow = WorkflowService.get_workflow_for_object(obj)
@@ -146,6 +146,108 @@ def trigger_bcmtest_workflow(sender, instance, created, **kwargs):
         logger.info(f"Auto-approved BCM test {instance.test_id} by manager")
 
 
+@receiver(m2m_changed, sender=BusinessFunction.dependent_functions.through)
+def maintain_dependency_closure(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep the dependency closure in step with dependent_functions.
+    
+    Additions extend the closure incrementally; removals recompute the
+    rows of every function that could reach the removed edges.
+    """
+    from core.cache import bump_organization
+    from .services import DependencyClosureService
+    
+    if action == 'pre_clear':
+        # Remember the other side of the edges before they disappear
+        related = instance.dependencies if reverse else instance.dependent_functions
+        instance._cleared_dependency_ids = set(related.values_list('pk', flat=True))
+        return
+    
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_dependency_ids', set())
+    if not pk_set:
+        return
+    
+    if action == 'post_add':
+        if reverse:
+            edges = [(function_id, instance.pk) for function_id in pk_set]
+        else:
+            edges = [(instance.pk, depends_on_id) for depends_on_id in pk_set]
+        cyclic = DependencyClosureService.add_edges(edges)
+        if cyclic:
+            logger.warning(
+                f"Dependency cycle detected after linking business function {instance.function_id}: "
+                f"functions {cyclic} depend on themselves"
+            )
+    else:
+        # The removed edges started at these functions (the ones depended on)
+        sources = {instance.pk} if reverse else set(pk_set)
+        DependencyClosureService.rebuild(
+            instance.organization_id,
+            ancestor_ids=DependencyClosureService.ancestors_of(sources)
+        )
+    
+    bump_organization(instance.organization_id)
+
+
+@receiver(pre_delete, sender=BusinessFunction)
+def capture_dependency_ancestors(sender, instance, **kwargs):
+    """Remember which functions reached a function that is being deleted."""
+    from .services import DependencyClosureService
+    
+    instance._dependency_ancestor_ids = DependencyClosureService.ancestors_of([instance.pk]) - {instance.pk}
+
+
+@receiver(post_delete, sender=BusinessFunction)
+def rebuild_dependency_closure_on_delete(sender, instance, **kwargs):
+    """Recompute closure rows whose paths ran through a deleted function."""
+    from .services import DependencyClosureService
+    
+    ancestor_ids = getattr(instance, '_dependency_ancestor_ids', None)
+    if ancestor_ids:
+        DependencyClosureService.rebuild(instance.organization_id, ancestor_ids=ancestor_ids)
+
+
+# Crisis readiness pack sources, with the attribute path to the organization id
+CRISIS_READINESS_SOURCES = {
+    BusinessFunction: 'organization_id',
+    BCPlan: 'organization_id',
+    DisasterRecoveryPlan: 'organization_id',
+    CrisisManagementTeam: 'organization_id',
+    CrisisTeamMember: 'team.organization_id',
+    CallTree: 'organization_id',
+    CallTreeNode: 'call_tree.organization_id',
+}
+
+
+def mark_crisis_readiness_stale(sender, instance, action=None, **kwargs):
+    """Flag the owning organization's crisis readiness pack as stale."""
+    from .services import CrisisReadinessService
+    
+    # m2m_changed fires before and after each change; react once
+    if action is not None and action.startswith('pre_'):
+        return
+    
+    path = CRISIS_READINESS_SOURCES.get(type(instance), 'organization_id')
+    organization_id = instance
+    for attr in path.split('.'):
+        organization_id = getattr(organization_id, attr, None)
+        if organization_id is None:
+            return
+    CrisisReadinessService.mark_stale(organization_id)
+
+
+for _model in CRISIS_READINESS_SOURCES:
+    post_save.connect(mark_crisis_readiness_stale, sender=_model, dispatch_uid=f'crisis_readiness:{_model.__name__}:save')
+    post_delete.connect(mark_crisis_readiness_stale, sender=_model, dispatch_uid=f'crisis_readiness:{_model.__name__}:delete')
+
+for _through in (BusinessFunction.dependent_functions.through, BCPlan.covered_functions.through):
+    m2m_changed.connect(mark_crisis_readiness_stale, sender=_through, dispatch_uid=f'crisis_readiness:{_through.__name__}:m2m')
+
+
 # Connect workflow completion to update BCM statuses
 def handle_workflow_completed(sender, instance, **kwargs):
     """Update BCM content status when workflow completes."""
@@ -0,0 +1,34 @@
+"""
+Celery tasks for business continuity management.
+Handles debounced crisis readiness pack rebuilds.
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def rebuild_crisis_readiness_pack(self, organization_id):
+    """
+    Rebuild an organization's crisis readiness pack.
+    Scheduled (debounced) when crisis response source data changes.
+    """
+    from django.core.cache import cache
+    from .services import CRISIS_READINESS_SCHEDULED_KEY, CrisisReadinessService
+    
+    # Changes arriving from now on schedule a fresh run
+    cache.delete(CRISIS_READINESS_SCHEDULED_KEY.format(organization_id=organization_id))
+    
+    try:
+        pack = CrisisReadinessService.build(organization_id)
+        logger.info(f"Rebuilt crisis readiness pack for organization {organization_id}")
+        
+        return {
+            'organization_id': organization_id,
+            'built_at': pack.built_at.isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in rebuild_crisis_readiness_pack: {e}")
+        raise self.retry(exc=e, countdown=60)
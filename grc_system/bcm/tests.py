@@ -1,3 +1,148 @@
-from django.test import TestCase
+"""
+Tests for the incrementally maintained BCM dependency structures.
 
-# Create your tests here.
+The closure table and the all-at-once impact scores are checked against
+a full recomputation after random sequences of graph changes.
+"""
+import logging
+import random
+
+from django.test import SimpleTestCase, TestCase
+
+from core.models import Organization
+
+from .graph import CRITICALITY_NAMES, CRITICALITY_RANKING, DependencyGraph
+from .models import BusinessFunction, BusinessFunctionDependencyClosure
+from .services import DependencyClosureService
+
+
+CRITICALITIES = list(CRITICALITY_RANKING)
+
+
+def _random_graph(rng, size, edge_count, acyclic=False):
+    functions = [
+        {'id': pk, 'function_id': f'F{pk}', 'name': f'Function {pk}', 'criticality': rng.choice(CRITICALITIES)}
+        for pk in range(1, size + 1)
+    ]
+    edges = set()
+    while len(edges) < edge_count:
+        function_id, depends_on_id = rng.randint(1, size), rng.randint(1, size)
+        if acyclic and function_id <= depends_on_id:
+            continue
+        edges.add((function_id, depends_on_id))
+    return DependencyGraph(functions, sorted(edges))
+
+
+class DependencyGraphTests(SimpleTestCase):
+    """impact_scores() against a per-function breadth-first search."""
+
+    def test_reach_and_criticality_match_bfs(self):
+        rng = random.Random(7)
+        for _ in range(30):
+            graph = _random_graph(rng, size=25, edge_count=rng.randint(0, 60))
+            for node, score in enumerate(graph.impact_scores()):
+                depth = graph.distances(node)
+                rank = max((graph.ranks[other] for other in depth), default=0)
+                self.assertEqual(score['total_affected'], len(depth))
+                self.assertEqual(score['max_criticality'], CRITICALITY_NAMES.get(rank, 'desirable'))
+
+    def test_cascade_depth_is_longest_chain_without_cycles(self):
+        rng = random.Random(11)
+        for _ in range(30):
+            graph = _random_graph(rng, size=25, edge_count=rng.randint(0, 60), acyclic=True)
+            longest = {}
+
+            def chain(node):
+                if node not in longest:
+                    longest[node] = max((chain(other) + 1 for other in graph.dependents[node]), default=0)
+                return longest[node]
+
+            for node, score in enumerate(graph.impact_scores()):
+                self.assertEqual(score['cascade_depth'], chain(node))
+
+    def test_cycles_match_components(self):
+        graph = DependencyGraph(
+            [{'id': pk, 'function_id': f'F{pk}', 'name': str(pk), 'criticality': 'necessary'} for pk in range(1, 6)],
+            [(1, 2), (2, 3), (3, 1), (4, 4), (5, 1)]
+        )
+        self.assertEqual(sorted(graph.cycles()), [[1, 2, 3], [4]])
+        scores = graph.impact_scores()
+        self.assertEqual(scores[graph.index[1]]['total_affected'], 4)
+        self.assertEqual(scores[graph.index[5]]['total_affected'], 0)
+
+
+class DependencyClosureTests(TestCase):
+    """The closure maintained by the m2m signals against a full rebuild."""
+
+    def setUp(self):
+        # Random graphs form cycles, which the signals log as warnings
+        signals_logger = logging.getLogger('bcm.signals')
+        self.addCleanup(signals_logger.setLevel, signals_logger.level)
+        signals_logger.setLevel(logging.ERROR)
+
+        self.organization = Organization.objects.create(name='Closure test', code='CLOSURE')
+        self.functions = [
+            BusinessFunction.objects.create(
+                organization=self.organization, function_id=f'F{index}', name=f'Function {index}'
+            )
+            for index in range(10)
+        ]
+
+    def closure_rows(self):
+        return set(BusinessFunctionDependencyClosure.objects.filter(
+            ancestor__organization=self.organization
+        ).values_list('ancestor_id', 'descendant_id', 'depth'))
+
+    def assertMatchesRebuild(self):
+        # The rows rebuild() would write, computed without replacing the
+        # incremental ones so that drift accumulates across steps
+        graph = DependencyGraph.for_organization(self.organization.pk)
+        expected = {
+            (graph.ids[node], graph.ids[dependent], depth)
+            for node in range(len(graph))
+            for dependent, depth in graph.distances(node).items()
+        }
+        self.assertEqual(self.closure_rows(), expected)
+
+    def test_random_changes_match_rebuild(self):
+        rng = random.Random(3)
+        for _ in range(60):
+            function = rng.choice(self.functions)
+            others = rng.sample(self.functions, 3)
+            action = rng.random()
+            if action < 0.5:
+                function.dependent_functions.add(*others)
+            elif action < 0.7:
+                function.dependent_functions.remove(*others)
+            elif action < 0.8:
+                # Reverse side: functions that depend on this one
+                function.dependencies.add(*others[:1])
+            elif action < 0.9:
+                function.dependent_functions.clear()
+            else:
+                function.dependencies.clear()
+            self.assertMatchesRebuild()
+
+        incremental = self.closure_rows()
+        DependencyClosureService.rebuild(self.organization.pk)
+        self.assertEqual(self.closure_rows(), incremental)
+
+    def test_deleting_a_function_matches_rebuild(self):
+        first, middle, last = self.functions[:3]
+        middle.dependent_functions.add(first)
+        last.dependent_functions.add(middle)
+        self.assertIn((first.pk, last.pk, 2), self.closure_rows())
+
+        middle.delete()
+        self.assertMatchesRebuild()
+        self.assertNotIn((first.pk, last.pk, 2), self.closure_rows())
+
+    def test_cycle_is_reported(self):
+        first, second = self.functions[:2]
+        first.dependent_functions.add(second)
+        second.dependent_functions.add(first)
+        self.assertEqual(
+            DependencyClosureService.cyclic_functions(organization_id=self.organization.pk),
+            sorted([first.pk, second.pk])
+        )
+        self.assertMatchesRebuild()
@@ -41,6 +41,51 @@ IMPACT_TO_MTPD = {
     '72_hours': {'impact_threshold': 5, 'recommended_mtpd': 72},
 }
 
+# BIA impact columns in time order: (hours, field, model default)
+BIA_IMPACT_FIELDS = [
+    (1, 'impact_1_hour', 1),
+    (4, 'impact_4_hours', 2),
+    (8, 'impact_8_hours', 3),
+    (24, 'impact_24_hours', 4),
+    (72, 'impact_72_hours', 5),
+]
+
+# BIA review violations: severity and message template
+BIA_VIOLATION_TYPES = {
+    'rto_exceeds_mtpd': {
+        'severity': 'high',
+        'field': 'rto_hours',
+        'message': 'RTO ({rto}h) exceeds MTPD ({mtpd}h) - recovery must happen before maximum tolerable disruption',
+    },
+    'rto_exceeds_recommended': {
+        'severity': 'high',
+        'field': 'rto_hours',
+        'message': 'RTO ({rto}h) is longer than recommended ({recommended_rto}h) based on impact progression',
+    },
+    'mtpd_exceeds_recommended': {
+        'severity': 'medium',
+        'field': 'mtpd_hours',
+        'message': 'MTPD ({mtpd}h) is longer than recommended ({recommended_mtpd}h) based on impact progression',
+    },
+    'rpo_exceeds_rto': {
+        'severity': 'medium',
+        'field': 'rpo_hours',
+        'message': 'RPO ({rpo}h) exceeds RTO ({rto}h) - data loss point should be before service recovery',
+    },
+    'criticality_understated': {
+        'severity': 'medium',
+        'field': 'criticality',
+        'message': 'Function is rated {criticality} but its impact progression indicates {recommended_criticality}',
+    },
+    'objectives_missing': {
+        'severity': 'low',
+        'field': None,
+        'message': 'Recovery objectives not set: {missing}',
+    },
+}
+
+BIA_SEVERITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
 
 def validate_rto_mtpd(rto_hours, mtpd_hours):
     """
@@ -85,32 +130,28 @@ def validate_rpo_rto(rpo_hours, rto_hours):
         )
 
 
-def calculate_recommended_rto(bia):
+def _impact_progression(bia):
+    """Impact values of a BIA in time order, with the model defaults for missing fields."""
+    return [getattr(bia, field, default) for hours, field, default in BIA_IMPACT_FIELDS]
+
+
+def recommended_rto_from_impacts(impacts):
     """
-    Calculate recommended RTO based on BIA impact progression.
+    Recommended RTO for an impact progression.
     
     Logic: RTO should be set at the point where impact transitions 
     from acceptable (≤3) to unacceptable (>3).
     
     Args:
-        bia: BusinessImpactAnalysis instance
+        impacts: Impact values (1-5) at 1, 4, 8, 24 and 72 hours
     
     Returns:
         int: Recommended RTO in hours
     """
-    # Impact thresholds by time
-    impacts = [
-        (1, bia.impact_1_hour if hasattr(bia, 'impact_1_hour') else 1),
-        (4, bia.impact_4_hours if hasattr(bia, 'impact_4_hours') else 2),
-        (8, bia.impact_8_hours if hasattr(bia, 'impact_8_hours') else 3),
-        (24, bia.impact_24_hours if hasattr(bia, 'impact_24_hours') else 4),
-        (72, bia.impact_72_hours if hasattr(bia, 'impact_72_hours') else 5),
-    ]
-    
     # Find the first point where impact exceeds 3 (unacceptable)
     unacceptable_threshold = 3
     
-    for hours, impact in impacts:
+    for (hours, field, default), impact in zip(BIA_IMPACT_FIELDS, impacts):
         if impact > unacceptable_threshold:
             # RTO should be before this point
             return hours
@@ -119,29 +160,21 @@ def calculate_recommended_rto(bia):
     return 72
 
 
-def calculate_recommended_mtpd(bia):
+def recommended_mtpd_from_impacts(impacts):
     """
-    Calculate recommended MTPD based on BIA impact progression.
+    Recommended MTPD for an impact progression.
     
     Logic: MTPD is when impact reaches critical level (5).
     
     Args:
-        bia: BusinessImpactAnalysis instance
+        impacts: Impact values (1-5) at 1, 4, 8, 24 and 72 hours
     
     Returns:
         int: Recommended MTPD in hours
     """
-    impacts = [
-        (1, bia.impact_1_hour if hasattr(bia, 'impact_1_hour') else 1),
-        (4, bia.impact_4_hours if hasattr(bia, 'impact_4_hours') else 2),
-        (8, bia.impact_8_hours if hasattr(bia, 'impact_8_hours') else 3),
-        (24, bia.impact_24_hours if hasattr(bia, 'impact_24_hours') else 4),
-        (72, bia.impact_72_hours if hasattr(bia, 'impact_72_hours') else 5),
-    ]
-    
     critical_threshold = 5
     
-    for hours, impact in impacts:
+    for (hours, field, default), impact in zip(BIA_IMPACT_FIELDS, impacts):
         if impact >= critical_threshold:
             return hours
     
@@ -149,6 +182,32 @@ def calculate_recommended_mtpd(bia):
     return 168
 
 
+def calculate_recommended_rto(bia):
+    """
+    Calculate recommended RTO based on BIA impact progression.
+    
+    Args:
+        bia: BusinessImpactAnalysis instance
+    
+    Returns:
+        int: Recommended RTO in hours
+    """
+    return recommended_rto_from_impacts(_impact_progression(bia))
+
+
+def calculate_recommended_mtpd(bia):
+    """
+    Calculate recommended MTPD based on BIA impact progression.
+    
+    Args:
+        bia: BusinessImpactAnalysis instance
+    
+    Returns:
+        int: Recommended MTPD in hours
+    """
+    return recommended_mtpd_from_impacts(_impact_progression(bia))
+
+
 def get_criticality_from_rto(rto_hours):
     """
     Determine function criticality based on RTO.
@@ -172,11 +231,295 @@ def get_criticality_from_rto(rto_hours):
         return 'desirable'
 
 
+def analyze_bia(rto_hours, rpo_hours, mtpd_hours, impacts, criticality=None):
+    """
+    Derive recommendations and review violations for one BIA.
+    
+    Pure function over column values, so whole organizations can be analyzed
+    from a single values_list query.
+    
+    Args:
+        rto_hours, rpo_hours, mtpd_hours: Current recovery objectives
+        impacts: Impact values (1-5) at 1, 4, 8, 24 and 72 hours
+        criticality: Current criticality of the business function, if any
+    
+    Returns:
+        dict: {
+            'recommended_rto_hours', 'recommended_mtpd_hours',
+            'recommended_criticality': from the recommended RTO,
+            'violations': list of {'type', 'severity', 'field', 'message'}
+        }
+    """
+    from bcm.graph import CRITICALITY_RANKING
+    
+    recommended_rto = recommended_rto_from_impacts(impacts)
+    recommended_mtpd = recommended_mtpd_from_impacts(impacts)
+    recommended_criticality = get_criticality_from_rto(recommended_rto)
+    
+    found = []
+    if rto_hours and mtpd_hours and rto_hours > mtpd_hours:
+        found.append('rto_exceeds_mtpd')
+    if rto_hours and rto_hours > recommended_rto:
+        found.append('rto_exceeds_recommended')
+    if mtpd_hours and mtpd_hours > recommended_mtpd:
+        found.append('mtpd_exceeds_recommended')
+    if rpo_hours and rto_hours and rpo_hours > rto_hours:
+        found.append('rpo_exceeds_rto')
+    if criticality and (
+        CRITICALITY_RANKING.get(criticality, 0) < CRITICALITY_RANKING[recommended_criticality]
+    ):
+        found.append('criticality_understated')
+    missing = [
+        name for name, value in (('RTO', rto_hours), ('RPO', rpo_hours), ('MTPD', mtpd_hours))
+        if value is None
+    ]
+    if missing:
+        found.append('objectives_missing')
+    
+    context = {
+        'rto': rto_hours,
+        'rpo': rpo_hours,
+        'mtpd': mtpd_hours,
+        'recommended_rto': recommended_rto,
+        'recommended_mtpd': recommended_mtpd,
+        'criticality': criticality,
+        'recommended_criticality': recommended_criticality,
+        'missing': ', '.join(missing),
+    }
+    violations = [
+        {
+            'type': violation_type,
+            'severity': BIA_VIOLATION_TYPES[violation_type]['severity'],
+            'field': BIA_VIOLATION_TYPES[violation_type]['field'],
+            'message': BIA_VIOLATION_TYPES[violation_type]['message'].format(**context),
+        }
+        for violation_type in found
+    ]
+    
+    return {
+        'recommended_rto_hours': recommended_rto,
+        'recommended_mtpd_hours': recommended_mtpd,
+        'recommended_criticality': recommended_criticality,
+        'violations': violations,
+    }
+
+
+def bia_violation_report(organization_id, bia_status=None, include_compliant=False):
+    """
+    Analyze every BIA of an organization in one pass.
+    
+    Loads the recovery objectives and impact columns of all BIAs with a
+    single values_list query and derives recommendations in memory.
+    
+    Args:
+        organization_id: Organization id
+        bia_status: Optional BIA status to restrict the report to
+        include_compliant: Include BIAs without violations
+    
+    Returns:
+        dict: {
+            'total_analyzed': int,
+            'with_violations': int,
+            'by_type': {violation type: count},
+            'by_severity': {severity: count},
+            'results': list of per-BIA rows, in BIA id order
+        }
+    """
+    from bcm.models import BusinessImpactAnalysis
+    
+    impact_fields = [field for hours, field, default in BIA_IMPACT_FIELDS]
+    rows = BusinessImpactAnalysis.objects.filter(organization_id=organization_id)
+    if bia_status:
+        rows = rows.filter(status=bia_status)
+    rows = rows.order_by('id').values_list(
+        'id', 'status', 'assessment_date', 'business_function_id',
+        'business_function__function_id', 'business_function__name',
+        'business_function__criticality', 'rto_hours', 'rpo_hours', 'mtpd_hours',
+        *impact_fields,
+    )
+    
+    total = 0
+    by_type = {violation_type: 0 for violation_type in BIA_VIOLATION_TYPES}
+    by_severity = {severity: 0 for severity in BIA_SEVERITY_ORDER}
+    results = []
+    
+    for (bia_id, bia_status_value, assessment_date, function_pk, function_code,
+         function_name, criticality, rto, rpo, mtpd, *impacts) in rows:
+        total += 1
+        analysis = analyze_bia(rto, rpo, mtpd, impacts, criticality)
+        violations = analysis['violations']
+        for violation in violations:
+            by_type[violation['type']] += 1
+            by_severity[violation['severity']] += 1
+        if not violations and not include_compliant:
+            continue
+        
+        results.append({
+            'id': bia_id,
+            'status': bia_status_value,
+            'assessment_date': assessment_date,
+            'business_function': {
+                'id': function_pk,
+                'function_id': function_code,
+                'name': function_name,
+                'criticality': criticality,
+            } if function_pk else None,
+            'current_values': {
+                'rto_hours': rto,
+                'rpo_hours': rpo,
+                'mtpd_hours': mtpd,
+            },
+            'recommended_values': {
+                'rto_hours': analysis['recommended_rto_hours'],
+                'mtpd_hours': analysis['recommended_mtpd_hours'],
+                'criticality': analysis['recommended_criticality'],
+            },
+            # Hours the current RTO overshoots the recommendation by
+            'rto_gap_hours': max((rto or 0) - analysis['recommended_rto_hours'], 0),
+            'highest_severity': min(
+                (v['severity'] for v in violations),
+                key=BIA_SEVERITY_ORDER.get, default=None
+            ),
+            'violations': violations,
+        })
+    
+    return {
+        'total_analyzed': total,
+        'with_violations': sum(1 for row in results if row['violations']),
+        'by_type': by_type,
+        'by_severity': by_severity,
+        'results': results,
+    }
+
+
+# Sort keys of the BIA violation report (ascending order)
+BIA_REPORT_ORDERINGS = {
+    'severity': lambda row: (
+        BIA_SEVERITY_ORDER.get(row['highest_severity'], len(BIA_SEVERITY_ORDER)),
+        -len(row['violations']),
+        -row['rto_gap_hours'],
+    ),
+    'violations': lambda row: len(row['violations']),
+    'rto_gap': lambda row: row['rto_gap_hours'],
+    'function': lambda row: (row['business_function'] or {}).get('name') or '',
+    'assessment_date': lambda row: (row['assessment_date'] is None, row['assessment_date']),
+}
+
+
+def sort_bia_report(results, ordering='severity'):
+    """
+    Sort BIA report rows.
+    
+    Args:
+        results: Rows from bia_violation_report
+        ordering: A BIA_REPORT_ORDERINGS key, prefixed with '-' for descending
+    
+    Returns:
+        list: Sorted rows
+    
+    Raises:
+        ValueError: If the ordering is unknown
+    """
+    key = ordering.lstrip('-')
+    if key not in BIA_REPORT_ORDERINGS:
+        raise ValueError(f"ordering must be one of: {', '.join(BIA_REPORT_ORDERINGS)}")
+    return sorted(results, key=BIA_REPORT_ORDERINGS[key], reverse=ordering.startswith('-'))
+
+
+def plan_recovery(organization_id):
+    """
+    Recovery schedule of all business functions of an organization.
+    
+    RTOs come from each function's most recent BIA with an RTO, or from
+    CRITICALITY_RTO_MAPPING when there is none. Three queries load the
+    functions, dependencies and RTOs; scheduling is O(V+E) in memory.
+    
+    Args:
+        organization_id: Organization id
+    
+    Returns:
+        dict: {
+            'summary': totals, waves and hours to full recovery,
+            'schedule': functions in recovery order with earliest start,
+                achievable recovery time and RTO reachability,
+            'unreachable_rto': scheduled functions whose RTO cannot be met,
+            'unscheduled': functions on or depending on a dependency cycle,
+            'cycles': dependency cycles, as lists of function ids
+        }
+    """
+    from django.db.models import F
+    from bcm.graph import DependencyGraph
+    from bcm.models import BusinessImpactAnalysis
+    
+    graph = DependencyGraph.for_organization(organization_id)
+    
+    bia_rto = {}
+    for function_id, rto in BusinessImpactAnalysis.objects.filter(
+        business_function__organization_id=organization_id,
+        rto_hours__isnull=False,
+    ).order_by(
+        'business_function_id', F('assessment_date').desc(nulls_last=True), '-id'
+    ).values_list('business_function_id', 'rto_hours'):
+        bia_rto.setdefault(function_id, rto)
+    
+    default_rto = CRITICALITY_RTO_MAPPING['necessary']
+    rto_hours = [
+        bia_rto.get(func['id'], CRITICALITY_RTO_MAPPING.get(func['criticality'], default_rto))
+        for func in graph.functions
+    ]
+    plan = graph.recovery_schedule(rto_hours)
+    
+    def describe(node):
+        func = graph.functions[node]
+        return {
+            'id': func['id'],
+            'function_id': func['function_id'],
+            'name': func['name'],
+            'criticality': func['criticality'],
+        }
+    
+    schedule = []
+    for position, entry in enumerate(plan['schedule'], start=1):
+        node = entry['node']
+        schedule.append({
+            'order': position,
+            **describe(node),
+            'rto_hours': rto_hours[node],
+            'rto_source': 'bia' if graph.ids[node] in bia_rto else 'criticality',
+            'wave': entry['wave'],
+            'earliest_start_hours': entry['earliest_start_hours'],
+            'achievable_hours': entry['achievable_hours'],
+            'rto_reachable': entry['rto_reachable'],
+            'shortfall_hours': entry['achievable_hours'] - rto_hours[node],
+            'blocking_dependency': (
+                describe(entry['blocking_node']) if entry['blocking_node'] is not None else None
+            ),
+        })
+    unreachable = [row for row in schedule if not row['rto_reachable']]
+    
+    return {
+        'summary': {
+            'total_functions': len(graph),
+            'scheduled': len(schedule),
+            'unreachable_rto': len(unreachable),
+            'unscheduled': len(plan['unscheduled']),
+            'waves': max((row['wave'] for row in schedule), default=0),
+            'full_recovery_hours': max((row['achievable_hours'] for row in schedule), default=0),
+            'functions_without_bia_rto': sum(1 for row in schedule if row['rto_source'] == 'criticality'),
+        },
+        'schedule': schedule,
+        'unreachable_rto': sorted(unreachable, key=lambda row: -row['shortfall_hours']),
+        'unscheduled': [describe(node) for node in plan['unscheduled']],
+        'cycles': graph.cycles(),
+    }
+
+
 def calculate_dependency_impact(business_function):
     """
     Calculate cascading impact from function dependencies.
     
-    If a function fails, all dependent functions are impacted.
+    If a function fails, all dependent functions are impacted. Served by a
+    single lookup on the dependency closure table.
     
     Args:
         business_function: BusinessFunction instance
@@ -189,98 +532,48 @@ def calculate_dependency_impact(business_function):
             'cascade_depth': how many levels of dependencies
         }
     """
-    from bcm.models import BusinessFunction
-    
-    visited = set()
-    affected_functions = []
-    max_criticality_level = 0
-    
-    criticality_ranking = {
-        'desirable': 1,
-        'necessary': 2,
-        'essential': 3,
-        'critical': 4,
-    }
-    
-    def traverse_dependents(func, depth=0):
-        nonlocal max_criticality_level
-        
-        if func.id in visited:
-            return depth
-        visited.add(func.id)
-        
-        max_depth = depth
-        
-        # Get functions that depend on this one
-        dependents = BusinessFunction.objects.filter(dependent_functions=func)
-        
-        for dep in dependents:
-            affected_functions.append({
-                'id': dep.id,
-                'name': dep.name,
-                'criticality': dep.criticality,
-                'depth': depth + 1
-            })
-            
-            crit_level = criticality_ranking.get(dep.criticality, 0)
-            if crit_level > max_criticality_level:
-                max_criticality_level = crit_level
-            
-            child_depth = traverse_dependents(dep, depth + 1)
-            max_depth = max(max_depth, child_depth)
-        
-        return max_depth
-    
-    cascade_depth = traverse_dependents(business_function)
+    from bcm.graph import CRITICALITY_NAMES, CRITICALITY_RANKING
+    from bcm.services import DependencyClosureService
     
-    # Reverse lookup for max criticality
-    criticality_names = {v: k for k, v in criticality_ranking.items()}
+    affected = DependencyClosureService.impact(business_function)
+    max_rank = max((CRITICALITY_RANKING.get(f['criticality'], 0) for f in affected), default=0)
     
     return {
-        'direct_dependents': [f['name'] for f in affected_functions if f['depth'] == 1],
-        'all_affected': affected_functions,
-        'total_affected': len(affected_functions),
-        'max_criticality': criticality_names.get(max_criticality_level, 'desirable'),
-        'cascade_depth': cascade_depth,
+        'direct_dependents': [f['name'] for f in affected if f['depth'] == 1],
+        'all_affected': affected,
+        'total_affected': len(affected),
+        'max_criticality': CRITICALITY_NAMES.get(max_rank, 'desirable'),
+        'cascade_depth': max((f['depth'] for f in affected), default=0),
     }
 
 
-def validate_bc_plan_coverage(bc_plan):
+# Criticality levels a BC plan must cover
+PLAN_REQUIRED_CRITICALITY = ['critical', 'essential']
+
+
+def summarize_plan_coverage(critical_functions, covered_ids):
     """
-    Validate that BC Plan covers all critical functions.
+    Coverage of the required functions by one plan.
     
     Args:
-        bc_plan: BCPlan instance
+        critical_functions: List of {'id', 'name', 'criticality'} dicts
+        covered_ids: Set of function ids the plan covers
     
     Returns:
         dict: {
             'is_complete': bool,
             'covered_critical': count,
-            'uncovered_critical': list of function names,
+            'uncovered_critical': list of functions,
             'coverage_percentage': float
         }
     """
-    from bcm.models import BusinessFunction
-    
-    # Get all critical/essential functions for the organization
-    critical_functions = BusinessFunction.objects.filter(
-        organization=bc_plan.organization,
-        criticality__in=['critical', 'essential'],
-        status='active'
-    )
-    
-    covered_ids = set(bc_plan.covered_functions.values_list('id', flat=True))
-    
-    uncovered = []
-    for func in critical_functions:
-        if func.id not in covered_ids:
-            uncovered.append({
-                'id': func.id,
-                'name': func.name,
-                'criticality': func.criticality
-            })
+    uncovered = [
+        {'id': func['id'], 'name': func['name'], 'criticality': func['criticality']}
+        for func in critical_functions
+        if func['id'] not in covered_ids
+    ]
     
-    total_critical = critical_functions.count()
+    total_critical = len(critical_functions)
     covered_count = total_critical - len(uncovered)
     coverage_pct = (covered_count / total_critical * 100) if total_critical > 0 else 100
     
@@ -293,14 +586,39 @@ def validate_bc_plan_coverage(bc_plan):
     }
 
 
-def check_plan_test_status(bc_plan):
+def validate_bc_plan_coverage(bc_plan):
     """
-    Check if BC Plan needs testing based on last test date.
+    Validate that BC Plan covers all critical functions.
+    
+    Args:
+        bc_plan: BCPlan instance
+    
+    Returns:
+        dict: See summarize_plan_coverage
+    """
+    from bcm.models import BusinessFunction
+    
+    # Get all critical/essential functions for the organization
+    critical_functions = list(BusinessFunction.objects.filter(
+        organization_id=bc_plan.organization_id,
+        criticality__in=PLAN_REQUIRED_CRITICALITY,
+        status='active'
+    ).values('id', 'name', 'criticality'))
+    
+    covered_ids = set(bc_plan.covered_functions.values_list('id', flat=True))
+    
+    return summarize_plan_coverage(critical_functions, covered_ids)
+
+
+def plan_test_status(last_tested_date, today=None):
+    """
+    Testing status of a plan from its last test date.
     
     Best practice: Plans should be tested at least annually.
     
     Args:
-        bc_plan: BCPlan instance
+        last_tested_date: Date of the last test, or None
+        today: Reference date (default: today)
     
     Returns:
         dict: {
@@ -310,18 +628,17 @@ def check_plan_test_status(bc_plan):
         }
     """
     from django.utils import timezone
-    from datetime import timedelta
     
-    today = timezone.now().date()
+    today = today or timezone.now().date()
     
-    if not bc_plan.last_tested_date:
+    if not last_tested_date:
         return {
             'needs_testing': True,
             'days_since_last_test': None,
             'recommendation': 'Plan has never been tested. Schedule a test immediately.'
         }
     
-    days_since_test = (today - bc_plan.last_tested_date).days
+    days_since_test = (today - last_tested_date).days
     
     if days_since_test > 365:
         return {
@@ -343,6 +660,109 @@ def check_plan_test_status(bc_plan):
         }
 
 
+def check_plan_test_status(bc_plan):
+    """
+    Check if BC Plan needs testing based on last test date.
+    
+    Args:
+        bc_plan: BCPlan instance
+    
+    Returns:
+        dict: See plan_test_status
+    """
+    return plan_test_status(bc_plan.last_tested_date)
+
+
+def calculate_coverage_matrix(organization_id, plan_status=None):
+    """
+    Coverage and test status of every BC plan of an organization.
+    
+    Runs three queries regardless of the number of plans: one for the
+    required functions, one for the covered_functions through table and one
+    for the plans. Coverage is computed with set operations in memory.
+    
+    Args:
+        organization_id: Organization id
+        plan_status: Optional plan status to restrict the matrix to
+    
+    Returns:
+        dict: {
+            'summary': organization totals,
+            'plans': per plan coverage and testing,
+            'functions': per required function, the plans covering it,
+            'uncovered_functions': required functions no plan covers
+        }
+    """
+    from django.utils import timezone
+    from bcm.models import BCPlan, BusinessFunction
+    
+    critical_functions = list(BusinessFunction.objects.filter(
+        organization_id=organization_id,
+        criticality__in=PLAN_REQUIRED_CRITICALITY,
+        status='active'
+    ).values('id', 'function_id', 'name', 'criticality').order_by('function_id'))
+    critical_ids = {func['id'] for func in critical_functions}
+    
+    plans = BCPlan.objects.filter(organization_id=organization_id)
+    if plan_status:
+        plans = plans.filter(status=plan_status)
+    plans = list(plans.values(
+        'id', 'plan_id', 'title', 'status', 'last_tested_date', 'review_date'
+    ).order_by('plan_id'))
+    
+    covered = {plan['id']: set() for plan in plans}
+    for plan_pk, function_pk in BCPlan.covered_functions.through.objects.filter(
+        bcplan__organization_id=organization_id,
+        businessfunction__criticality__in=PLAN_REQUIRED_CRITICALITY,
+        businessfunction__status='active',
+    ).values_list('bcplan_id', 'businessfunction_id'):
+        # Functions of another organization never count towards coverage
+        if plan_pk in covered and function_pk in critical_ids:
+            covered[plan_pk].add(function_pk)
+    
+    today = timezone.now().date()
+    covering_plans = {func_id: [] for func_id in critical_ids}
+    tested_cover = set()
+    plan_rows = []
+    for plan in plans:
+        coverage = summarize_plan_coverage(critical_functions, covered[plan['id']])
+        testing = plan_test_status(plan['last_tested_date'], today)
+        for func_id in covered[plan['id']]:
+            covering_plans[func_id].append(plan['id'])
+        if not testing['needs_testing']:
+            tested_cover |= covered[plan['id']]
+        plan_rows.append({**plan, 'coverage': coverage, 'testing': testing})
+    
+    function_rows = [
+        {
+            **func,
+            'covered_by': covering_plans[func['id']],
+            'covered_by_tested_plan': func['id'] in tested_cover,
+        }
+        for func in critical_functions
+    ]
+    uncovered = [row for row in function_rows if not row['covered_by']]
+    total_critical = len(critical_functions)
+    covered_count = total_critical - len(uncovered)
+    
+    return {
+        'summary': {
+            'total_plans': len(plans),
+            'complete_plans': sum(1 for row in plan_rows if row['coverage']['is_complete']),
+            'plans_needing_testing': sum(1 for row in plan_rows if row['testing']['needs_testing']),
+            'total_critical_functions': total_critical,
+            'covered_by_any_plan': covered_count,
+            'covered_by_tested_plan': len(tested_cover),
+            'coverage_percentage': round(
+                (covered_count / total_critical * 100) if total_critical > 0 else 100, 1
+            ),
+        },
+        'plans': plan_rows,
+        'functions': function_rows,
+        'uncovered_functions': uncovered,
+    }
+
+
 def calculate_minimum_resources(bia):
     """
     Calculate minimum resources needed for recovery.
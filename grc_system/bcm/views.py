@@ -3,12 +3,15 @@ BCM app views.
 """
 import json
 import time
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from core.cache import cached_response
+
 from .models import (
     BusinessFunction, BusinessImpactAnalysis, BCPlan, DisasterRecoveryPlan,
     CrisisManagementTeam, CrisisTeamMember, CallTree, CallTreeNode,
@@ -51,23 +54,40 @@ class BusinessFunctionViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def hierarchy(self, request):
-        """Get business function hierarchy."""
+        """
+        Get business function hierarchy.
+        
+        Query params:
+            organization: Optional organization filter
+            root: Optional function id whose subtree to return
+            depth: Optional number of levels to include
+        """
+        from core.utils import build_tree, parse_tree_params
+        
+        try:
+            root_id, max_depth = parse_tree_params(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         org_id = request.query_params.get('organization')
-        functions = self.queryset.filter(parent_function__isnull=True)
+        functions = BusinessFunction.objects.all()
         if org_id:
             functions = functions.filter(organization_id=org_id)
         
-        def build_tree(func):
-            return {
-                'id': func.id,
-                'function_id': func.function_id,
-                'name': func.name,
-                'name_ar': func.name_ar,
-                'criticality': func.criticality,
-                'children': [build_tree(child) for child in func.sub_functions.all()]
-            }
-        
-        tree = [build_tree(func) for func in functions]
+        rows = functions.values('id', 'function_id', 'name', 'name_ar', 'criticality', 'parent_function_id')
+        tree = build_tree(
+            rows,
+            lambda row: {
+                'id': row['id'],
+                'function_id': row['function_id'],
+                'name': row['name'],
+                'name_ar': row['name_ar'],
+                'criticality': row['criticality'],
+            },
+            parent_field='parent_function_id',
+            root_id=root_id,
+            max_depth=max_depth,
+        )
         return Response(tree)
     
     @action(detail=True, methods=['get'])
@@ -111,28 +131,130 @@ class BusinessFunctionViewSet(viewsets.ModelViewSet):
             'risk_assessment': self._assess_function_risk(func, impact)
         })
     
-    def _assess_function_risk(self, func, impact):
-        """Assess function disruption risk based on criticality and dependencies."""
-        criticality_scores = {'critical': 4, 'essential': 3, 'necessary': 2, 'desirable': 1}
-        base_score = criticality_scores.get(func.criticality, 1)
+    @action(detail=False, methods=['get'])
+    def impact_scores(self, request):
+        """
+        Score the failure impact of every function in an organization.
+        GET /api/bcm/functions/impact_scores/?organization=1
+        
+        Query params:
+            limit: Optional number of top-ranked functions to return
+        """
+        from bcm.graph import DependencyGraph, disruption_risk
+        
+        org_id = request.query_params.get('organization')
+        if not org_id:
+            return Response({'error': 'organization parameter required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        graph = DependencyGraph.for_organization(org_id)
+        results = []
+        for func, score in zip(graph.functions, graph.impact_scores()):
+            results.append({
+                'id': func['id'],
+                'function_id': func['function_id'],
+                'name': func['name'],
+                'criticality': func['criticality'],
+                'total_affected': score['total_affected'],
+                'cascade_depth': score['cascade_depth'],
+                'max_affected_criticality': score['max_criticality'],
+                **disruption_risk(func['criticality'], score['total_affected']),
+            })
+        results.sort(key=lambda r: (-r['disruption_risk_score'], -r['total_affected'], r['function_id']))
+        
+        limit = request.query_params.get('limit')
+        if limit and limit.isdigit():
+            results = results[:int(limit)]
+        
+        return Response({
+            'total_functions': len(graph),
+            'cycles': graph.cycles(),
+            'functions': results,
+        })
+    
+    @action(detail=False, methods=['get'])
+    def dependency_cycles(self, request):
+        """
+        List dependency cycles between business functions.
+        GET /api/bcm/functions/dependency_cycles/?organization=1
+        """
+        from bcm.services import DependencyClosureService
+        
+        org_id = request.query_params.get('organization')
+        if not org_id:
+            return Response({'error': 'organization parameter required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Increase score based on cascade impact
-        cascade_multiplier = 1 + (impact['total_affected'] * 0.1)
+        cycles = DependencyClosureService.cycles(org_id)
+        functions = {
+            func['id']: func
+            for func in BusinessFunction.objects.filter(
+                pk__in=[pk for cycle in cycles for pk in cycle]
+            ).values('id', 'function_id', 'name', 'criticality')
+        }
+        
+        return Response({
+            'total_cycles': len(cycles),
+            'cycles': [[functions[pk] for pk in cycle] for cycle in cycles],
+        })
+    
+    @action(detail=False, methods=['get'])
+    @cached_response('bcm.recovery_plan')
+    def recovery_plan(self, request):
+        """
+        Dependency-ordered recovery schedule with unreachable RTOs flagged.
+        GET /api/bcm/functions/recovery_plan/?organization=1
+        """
+        from bcm.utils import plan_recovery
+        
+        org_id = request.query_params.get('organization')
+        if not org_id:
+            return Response(
+                {'error': 'organization is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(plan_recovery(org_id))
+    
+    @action(detail=False, methods=['get'])
+    def export_graph(self, request):
+        """
+        Stream the organization's dependency graph for external analysis.
+        GET /api/bcm/functions/export_graph/?organization=1&graph_format=graphml
+        
+        Query params:
+            organization: Required
+            graph_format: graphml (default), dot or jsonl
+        """
+        from bcm.export import GRAPH_EXPORT_FORMATS, export_graph
+        
+        org_id = request.query_params.get('organization')
+        if not org_id or not org_id.isdigit():
+            return Response(
+                {'error': 'organization is required and must be an ID'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        graph_format = request.query_params.get('graph_format') or 'graphml'
+        try:
+            content = export_graph(org_id, graph_format)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        final_score = min(base_score * cascade_multiplier, 5)
+        content_type, extension = GRAPH_EXPORT_FORMATS[graph_format][1:]
+        response = StreamingHttpResponse(content, content_type=f'{content_type}; charset=utf-8')
+        response['Content-Disposition'] = (
+            f'attachment; filename="bcm-dependency-graph-{org_id}.{extension}"'
+        )
+        return response
+    
+    def _assess_function_risk(self, func, impact):
+        """Assess function disruption risk based on criticality and dependencies."""
+        from bcm.graph import disruption_risk
         
-        if final_score >= 4:
-            risk_level = 'critical'
-        elif final_score >= 3:
-            risk_level = 'high'
-        elif final_score >= 2:
-            risk_level = 'medium'
-        else:
-            risk_level = 'low'
+        risk = disruption_risk(func.criticality, impact['total_affected'])
+        final_score = risk['disruption_risk_score']
         
         return {
-            'disruption_risk_score': round(final_score, 1),
-            'risk_level': risk_level,
+            **risk,
             'recommendation': f'Function has {impact["total_affected"]} dependent functions. '
                             f'Disruption would cause {"significant" if final_score >= 3 else "moderate"} cascade impact.'
         }
@@ -177,6 +299,43 @@ class BusinessImpactAnalysisViewSet(viewsets.ModelViewSet):
             'validation_warnings': self._get_validation_warnings(bia)
         })
     
+    @action(detail=False, methods=['get'])
+    @cached_response('bcm.bia_violation_report')
+    def violation_report(self, request):
+        """
+        Review every BIA of an organization for recovery objective violations.
+        GET /api/bcm/bia/violation_report/?organization=1
+        
+        Query params:
+            organization: Required
+            status: Optional BIA status
+            ordering: severity (default), violations, rto_gap, function or
+                      assessment_date; prefix with '-' for descending
+            include_compliant: true to also list BIAs without violations
+        """
+        from bcm.utils import bia_violation_report, sort_bia_report
+        
+        org_id = request.query_params.get('organization')
+        if not org_id:
+            return Response(
+                {'error': 'organization is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        report = bia_violation_report(
+            org_id,
+            bia_status=request.query_params.get('status') or None,
+            include_compliant=request.query_params.get('include_compliant', '').lower() == 'true',
+        )
+        try:
+            report['results'] = sort_bia_report(
+                report['results'], request.query_params.get('ordering') or 'severity'
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(report)
+    
     def _get_validation_warnings(self, bia):
         """Generate validation warnings for BIA."""
         warnings = []
@@ -258,6 +417,30 @@ class BCPlanViewSet(viewsets.ModelViewSet):
             'recommendations': self._get_plan_recommendations(plan, coverage, test_status)
         })
     
+    @action(detail=False, methods=['get'])
+    @cached_response('bcm.coverage_matrix')
+    def coverage_matrix(self, request):
+        """
+        Coverage of critical/essential functions and test status for every plan.
+        GET /api/bcm/bc-plans/coverage_matrix/?organization=1
+        
+        Query params:
+            organization: Required
+            status: Optional plan status
+        """
+        from bcm.utils import calculate_coverage_matrix
+        
+        org_id = request.query_params.get('organization')
+        if not org_id:
+            return Response(
+                {'error': 'organization is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(calculate_coverage_matrix(
+            org_id, plan_status=request.query_params.get('status') or None
+        ))
+    
     def _get_plan_recommendations(self, plan, coverage, test_status):
         """Generate recommendations for BC Plan."""
         recommendations = []
@@ -347,6 +530,53 @@ class CallTreeViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_fields = ['organization', 'is_active']
     search_fields = ['name', 'name_ar']
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'simulate':
+            # The simulation loads the nodes itself
+            queryset = queryset.prefetch_related(None)
+        return queryset
+    
+    @action(detail=True, methods=['get'])
+    def simulate(self, request, pk=None):
+        """
+        Simulate the call cascade: time to reach everyone and critical path.
+        GET /api/bcm/call-trees/{id}/simulate/
+        
+        Query params:
+            call_minutes: Duration of calls to nodes without one (default: 2)
+            max_fan_out: Direct calls per caller before a warning (default: 10)
+            include_nodes: true to include every node's reach time
+        """
+        from bcm.calltree import CallTreeSimulation, DEFAULT_CALL_MINUTES, MAX_FAN_OUT
+        
+        options = {}
+        for param, default in (('call_minutes', DEFAULT_CALL_MINUTES), ('max_fan_out', MAX_FAN_OUT)):
+            value = request.query_params.get(param)
+            if value in (None, ''):
+                options[param] = default
+            elif value.isdigit() and int(value) >= 1:
+                options[param] = int(value)
+            else:
+                return Response(
+                    {'error': f'{param} must be a positive integer'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        call_tree = self.get_object()
+        result = CallTreeSimulation.for_call_tree(call_tree.id).run(
+            default_call_minutes=options['call_minutes'],
+            max_fan_out=options['max_fan_out'],
+        )
+        if request.query_params.get('include_nodes', '').lower() != 'true':
+            result.pop('reach_times')
+        
+        return Response({
+            'call_tree': call_tree.id,
+            'name': call_tree.name,
+            **result,
+        })
 
 
 class CrisisIncidentViewSet(viewsets.ModelViewSet):
@@ -366,12 +596,47 @@ class CrisisIncidentViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'])
     def declare_crisis(self, request, pk=None):
+        """
+        Declare a crisis and notify everyone involved in the response.
+        POST /api/bcm/incidents/{id}/declare_crisis/
+        
+        Impacted dependents, active plans, crisis team members and call
+        tree recipients are resolved from the organization's crisis
+        readiness pack; notifications are sent on the first declaration.
+        """
         from django.utils import timezone
+        from bcm.services import CrisisReadinessService
+        
         incident = self.get_object()
+        first_declaration = incident.declared_at is None
         incident.status = 'responding'
         incident.declared_at = timezone.now()
         incident.save()
-        return Response(CrisisIncidentSerializer(incident).data)
+        
+        pack = CrisisReadinessService.get_pack(incident.organization_id)
+        response_plan = CrisisReadinessService.brief(
+            pack.payload,
+            list(incident.affected_functions.values_list('id', flat=True)),
+            crisis_team_id=incident.crisis_team_id,
+            bc_plan_id=incident.activated_bc_plan_id,
+            dr_plan_id=incident.activated_dr_plan_id,
+        )
+        if incident.incident_commander_id:
+            response_plan['recipients'].setdefault(incident.incident_commander_id, []).append('incident_commander')
+        
+        notifications_sent = 0
+        if first_declaration:
+            notifications_sent = CrisisReadinessService.notify(incident, response_plan['recipients'])
+        
+        return Response({
+            **CrisisIncidentSerializer(incident).data,
+            'crisis_response': {
+                **response_plan,
+                'recipients': len(response_plan['recipients']),
+                'notifications_sent': notifications_sent,
+                'readiness_built_at': pack.built_at,
+            },
+        })
     
     @action(detail=True, methods=['post'])
     def resolve(self, request, pk=None):
@@ -454,6 +719,67 @@ class BCMTestViewSet(viewsets.ModelViewSet):
         # #endregion
         return Response(self.get_serializer(test).data, status=201)
     
+    @action(detail=False, methods=['get', 'post'])
+    def schedule(self, request):
+        """
+        Conflict-free test calendar for every active plan due within a horizon.
+        GET /api/bcm/tests/schedule/?organization=1&horizon_days=90 (preview)
+        POST /api/bcm/tests/schedule/?organization=1 (create the planned tests;
+            an author's tests go through content approval like any new test;
+            409 if tests for the same plans and days were created meanwhile)
+        
+        Query params:
+            organization: Required
+            start: First schedulable day, YYYY-MM-DD (default: tomorrow)
+            horizon_days: Window length, 1-366 (default: 90)
+            tests_per_day: Maximum tests on one day (default: 2)
+        """
+        from datetime import date, timedelta
+        from django.db import IntegrityError
+        from django.utils import timezone
+        from bcm.scheduling import create_scheduled_tests, plan_test_calendar
+        
+        org_id = request.query_params.get('organization')
+        if not org_id:
+            return Response(
+                {'error': 'organization is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            start = request.query_params.get('start')
+            start = date.fromisoformat(start) if start else timezone.localdate() + timedelta(days=1)
+            horizon_days = int(request.query_params.get('horizon_days', 90))
+            tests_per_day = int(request.query_params.get('tests_per_day', 2))
+        except ValueError:
+            return Response(
+                {'error': 'start must be YYYY-MM-DD; horizon_days and tests_per_day must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not 1 <= horizon_days <= 366 or tests_per_day < 1:
+            return Response(
+                {'error': 'horizon_days must be between 1 and 366 and tests_per_day at least 1'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        calendar = plan_test_calendar(
+            org_id, start, horizon_days=horizon_days, tests_per_day=tests_per_day
+        )
+        if request.method == 'POST':
+            try:
+                tests = create_scheduled_tests(org_id, calendar['scheduled'], created_by=request.user)
+            except IntegrityError:
+                return Response(
+                    {'error': 'Tests were created for these plans while scheduling; retry to plan around them'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            for entry, test in zip(calendar['scheduled'], tests):
+                entry['test'] = test.pk
+                entry['status'] = test.status
+            return Response(calendar, status=status.HTTP_201_CREATED)
+        
+        return Response(calendar)
+    
     @action(detail=True, methods=['post'])
     def start(self, request, pk=None):
         from django.utils import timezone
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     ControlFramework, ControlDomain, Control, ControlImplementation,
-    Audit, AuditFinding, CorrectiveAction, Evidence, GapAssessment
+    Audit, AuditFinding, CorrectiveAction, Evidence, GapAssessment, GapAssessmentSnapshot,
+    ComplianceScoreRollup
 )
 
 
@@ -67,3 +68,17 @@ class GapAssessmentAdmin(admin.ModelAdmin):
     list_display = ['assessment_id', 'title', 'framework', 'status', 'compliance_score', 'assessment_date']
     list_filter = ['status', 'framework', 'organization']
     search_fields = ['title', 'title_ar', 'assessment_id']
+
+
+@admin.register(GapAssessmentSnapshot)
+class GapAssessmentSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['gap_assessment', 'control', 'status', 'maturity_level', 'captured_at']
+    list_filter = ['status', 'gap_assessment']
+    search_fields = ['control__control_id', 'control__title']
+
+
+@admin.register(ComplianceScoreRollup)
+class ComplianceScoreRollupAdmin(admin.ModelAdmin):
+    list_display = ['organization', 'framework', 'domain', 'date', 'compliance_score', 'maturity_score']
+    list_filter = ['framework', 'organization']
+    date_hierarchy = 'date'
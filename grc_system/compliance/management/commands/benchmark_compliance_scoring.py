@@ -0,0 +1,84 @@
+"""
+Management command to benchmark compliance and maturity scoring.
+Seeds a synthetic framework in a rolled-back transaction and reports query count and latency.
+"""
+import random
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from core.benchmark import call_action, create_benchmark_context, measure, rolled_back
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks compliance/maturity scoring and GapAssessmentViewSet.dashboard'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--controls', type=int, default=1000,
+            help='Controls in the synthetic framework (default: 1000)'
+        )
+        parser.add_argument(
+            '--domains', type=int, default=20,
+            help='Domains the controls are spread over (default: 20)'
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=3,
+            help='Timed calls per measurement (default: 3)'
+        )
+
+    def handle(self, *args, **options):
+        from compliance.models import Control, ControlDomain, ControlFramework, ControlImplementation
+        from compliance.utils import calculate_compliance_profile
+        from compliance.views import GapAssessmentViewSet
+
+        statuses = [choice[0] for choice in ControlImplementation.IMPLEMENTATION_STATUS]
+        rng = random.Random(42)
+
+        # Measure the computation itself, not the response cache
+        with rolled_back(), override_settings(RESPONSE_CACHE_ENABLED=False):
+            organization, user = create_benchmark_context()
+            framework = ControlFramework.objects.create(
+                name='Benchmark framework', code=f'BENCH-{organization.pk}', version='1.0'
+            )
+            domains = ControlDomain.objects.bulk_create([
+                ControlDomain(framework=framework, code=f'D{index:03d}', name=f'Domain {index}', order=index)
+                for index in range(options['domains'])
+            ])
+            controls = Control.objects.bulk_create([
+                Control(
+                    domain=domains[index % len(domains)],
+                    control_id=f'C-{index:05d}',
+                    title=f'Benchmark control {index}',
+                    order=index,
+                )
+                for index in range(options['controls'])
+            ], batch_size=1000)
+            ControlImplementation.objects.bulk_create([
+                ControlImplementation(
+                    organization=organization,
+                    control=control,
+                    status=rng.choice(statuses),
+                    maturity_level=rng.randint(0, 5),
+                )
+                for control in controls
+            ], batch_size=1000)
+
+            def scores():
+                # Callers needing both scores read them from one profile
+                profile = calculate_compliance_profile(organization, framework)
+                return profile['compliance'], profile['maturity']
+
+            measurements = [
+                ('profile', lambda: calculate_compliance_profile(organization, framework)),
+                ('scores', scores),
+                ('dashboard', lambda: call_action(
+                    GapAssessmentViewSet, 'dashboard', user, {'organization': organization.pk}
+                )),
+            ]
+            for label, func in measurements:
+                result = measure(func, iterations=options['iterations'])
+                self.stdout.write(self.style.SUCCESS(
+                    f"{label:>9} ({options['controls']} controls): {result['queries']} queries, "
+                    f"avg {result['avg_ms']} ms, min {result['min_ms']} ms"
+                ))
@@ -0,0 +1,41 @@
+"""
+Management command to write the daily compliance score rollup.
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from compliance.utils import rollup_compliance_scores
+
+
+class Command(BaseCommand):
+    help = 'Writes the daily ComplianceScoreRollup for organizations whose implementations changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization', type=int,
+            help='Only process this organization ID'
+        )
+        parser.add_argument(
+            '--date',
+            help='Rollup date as YYYY-MM-DD (default: today)'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Roll up every organization, changed or not'
+        )
+
+    def handle(self, *args, **options):
+        rollup_date = None
+        if options.get('date'):
+            try:
+                rollup_date = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be YYYY-MM-DD')
+
+        count = rollup_compliance_scores(
+            date=rollup_date,
+            organization_id=options.get('organization'),
+            force=options['force'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Rolled up compliance scores for {count} organization(s)'))
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance', '0003_allow_null_domain'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gapassessment',
+            name='refresh_task_id',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Refresh Task ID'),
+        ),
+        migrations.AddField(
+            model_name='gapassessment',
+            name='snapshot_taken_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Snapshot Taken At'),
+        ),
+        migrations.AlterField(
+            model_name='audit',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Draft'), ('pending_approval', 'Pending Approval'), ('planned', 'Planned'), ('in_progress', 'In Progress'), ('fieldwork', 'Fieldwork'), ('reporting', 'Reporting'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], default='planned', max_length=20, verbose_name='Status'),
+        ),
+        migrations.CreateModel(
+            name='GapAssessmentSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('not_implemented', 'Not Implemented'), ('planned', 'Planned'), ('in_progress', 'In Progress'), ('partially_implemented', 'Partially Implemented'), ('implemented', 'Implemented'), ('not_applicable', 'Not Applicable'), ('not_assessed', 'Not Assessed')], default='not_assessed', max_length=30, verbose_name='Status')),
+                ('maturity_level', models.PositiveIntegerField(blank=True, null=True, verbose_name='Maturity Level')),
+                ('effectiveness_rating', models.PositiveIntegerField(blank=True, null=True, verbose_name='Effectiveness Rating (1-5)')),
+                ('captured_at', models.DateTimeField(verbose_name='Captured At')),
+                ('control', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='gap_snapshots', to='compliance.control', verbose_name='Control')),
+                ('domain', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='gap_snapshots', to='compliance.controldomain', verbose_name='Domain')),
+                ('gap_assessment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='compliance.gapassessment', verbose_name='Gap Assessment')),
+            ],
+            options={
+                'verbose_name': 'Gap Assessment Snapshot',
+                'verbose_name_plural': 'Gap Assessment Snapshots',
+                'ordering': ['gap_assessment', 'domain', 'control'],
+                'unique_together': {('gap_assessment', 'control')},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_create_departments'),
+        ('compliance', '0004_gapassessmentsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplianceScoreRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('total_controls', models.PositiveIntegerField(default=0, verbose_name='Total Controls')),
+                ('implemented_controls', models.PositiveIntegerField(default=0, verbose_name='Implemented Controls')),
+                ('partially_implemented', models.PositiveIntegerField(default=0, verbose_name='Partially Implemented')),
+                ('not_implemented', models.PositiveIntegerField(default=0, verbose_name='Not Implemented')),
+                ('not_applicable', models.PositiveIntegerField(default=0, verbose_name='Not Applicable')),
+                ('compliance_score', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Compliance Score (%)')),
+                ('maturity_score', models.DecimalField(decimal_places=2, default=0, max_digits=3, verbose_name='Maturity Score')),
+                ('maturity_distribution', models.JSONField(blank=True, default=dict, verbose_name='Maturity Distribution')),
+                ('computed_at', models.DateTimeField(verbose_name='Computed At')),
+                ('domain', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='compliance_rollups', to='compliance.controldomain', verbose_name='Domain')),
+                ('framework', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='compliance_rollups', to='compliance.controlframework', verbose_name='Framework')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='compliance_rollups', to='core.organization', verbose_name='Organization')),
+            ],
+            options={
+                'verbose_name': 'Compliance Score Rollup',
+                'verbose_name_plural': 'Compliance Score Rollups',
+                'ordering': ['organization', 'framework', 'date'],
+                'unique_together': {('organization', 'framework', 'domain', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:56
+
+from django.db import migrations, models
+
+
+def remove_duplicate_framework_rollups(apps, schema_editor):
+    """Keep the latest framework total per organization, framework and day."""
+    ComplianceScoreRollup = apps.get_model('compliance', 'ComplianceScoreRollup')
+
+    seen = set()
+    duplicates = []
+    rows = ComplianceScoreRollup.objects.filter(domain__isnull=True).order_by(
+        '-computed_at', '-pk'
+    ).values_list('pk', 'organization_id', 'framework_id', 'date')
+    for pk, organization_id, framework_id, date in rows:
+        key = (organization_id, framework_id, date)
+        if key in seen:
+            duplicates.append(pk)
+        seen.add(key)
+    ComplianceScoreRollup.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance', '0005_compliancescorerollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_framework_rollups, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='compliancescorerollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('domain__isnull', True)), fields=('organization', 'framework', 'date'), name='unique_framework_rollup_per_day'),
+        ),
+    ]
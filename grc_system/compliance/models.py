@@ -705,6 +705,14 @@ class GapAssessment(models.Model):
         ('approved', _('Approved')),
     ]
     
+    # Lower bound of each compliance score band, highest first
+    COMPLIANCE_BANDS = [
+        ('compliant', 90),
+        ('substantially_compliant', 70),
+        ('partially_compliant', 50),
+        ('non_compliant', 0),
+    ]
+    
     organization = models.ForeignKey(
         'core.Organization', 
         on_delete=models.CASCADE,
@@ -787,6 +795,10 @@ class GapAssessment(models.Model):
     )
     approved_date = models.DateField(_('Approved Date'), null=True, blank=True)
     
+    # Snapshot of control implementations (see GapAssessmentSnapshot)
+    snapshot_taken_at = models.DateTimeField(_('Snapshot Taken At'), null=True, blank=True)
+    refresh_task_id = models.CharField(_('Refresh Task ID'), max_length=255, blank=True)
+    
     created_at = models.DateTimeField(_('Created At'), auto_now_add=True)
     updated_at = models.DateTimeField(_('Updated At'), auto_now=True)
     
@@ -806,3 +818,127 @@ class GapAssessment(models.Model):
             weighted_score = (self.implemented_controls * 100 + self.partially_implemented * 50) / applicable
             return round(weighted_score, 2)
         return 0
+    
+    @property
+    def compliance_status(self):
+        """Compliance band for the current compliance score"""
+        if self.compliance_score is None:
+            return 'not_assessed'
+        for band, lower in self.COMPLIANCE_BANDS:
+            if self.compliance_score >= lower:
+                return band
+        return 'non_compliant'
+    
+    def refresh_from_implementations(self):
+        """Snapshot current control implementations and recompute scores"""
+        from .utils import snapshot_gap_assessment
+        return snapshot_gap_assessment(self)
+
+
+class GapAssessmentSnapshot(models.Model):
+    """
+    لقطة تقييم الفجوات - Per-control state frozen by a gap assessment refresh
+    """
+    STATUS_CHOICES = ControlImplementation.IMPLEMENTATION_STATUS + [
+        ('not_assessed', _('Not Assessed')),
+    ]
+    
+    gap_assessment = models.ForeignKey(
+        GapAssessment,
+        on_delete=models.CASCADE,
+        related_name='snapshots',
+        verbose_name=_('Gap Assessment')
+    )
+    control = models.ForeignKey(
+        Control,
+        on_delete=models.CASCADE,
+        related_name='gap_snapshots',
+        verbose_name=_('Control')
+    )
+    domain = models.ForeignKey(
+        ControlDomain,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='gap_snapshots',
+        verbose_name=_('Domain')
+    )
+    
+    status = models.CharField(_('Status'), max_length=30, choices=STATUS_CHOICES, default='not_assessed')
+    maturity_level = models.PositiveIntegerField(_('Maturity Level'), null=True, blank=True)
+    effectiveness_rating = models.PositiveIntegerField(_('Effectiveness Rating (1-5)'), null=True, blank=True)
+    
+    captured_at = models.DateTimeField(_('Captured At'))
+    
+    class Meta:
+        verbose_name = _('Gap Assessment Snapshot')
+        verbose_name_plural = _('Gap Assessment Snapshots')
+        ordering = ['gap_assessment', 'domain', 'control']
+        unique_together = ['gap_assessment', 'control']
+    
+    def __str__(self):
+        return f"{self.gap_assessment.assessment_id} - {self.control.control_id}: {self.status}"
+
+
+class ComplianceScoreRollup(models.Model):
+    """
+    ملخص الامتثال اليومي - Daily compliance score rollup
+    
+    One row per organization, framework and domain per day the organization's
+    implementations changed; rows with no domain hold the framework totals.
+    Days without a row carry the previous row forward.
+    """
+    organization = models.ForeignKey(
+        'core.Organization',
+        on_delete=models.CASCADE,
+        related_name='compliance_rollups',
+        verbose_name=_('Organization')
+    )
+    framework = models.ForeignKey(
+        ControlFramework,
+        on_delete=models.CASCADE,
+        related_name='compliance_rollups',
+        verbose_name=_('Framework')
+    )
+    domain = models.ForeignKey(
+        ControlDomain,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='compliance_rollups',
+        verbose_name=_('Domain')
+    )
+    date = models.DateField(_('Date'))
+    
+    # Status counts
+    total_controls = models.PositiveIntegerField(_('Total Controls'), default=0)
+    implemented_controls = models.PositiveIntegerField(_('Implemented Controls'), default=0)
+    partially_implemented = models.PositiveIntegerField(_('Partially Implemented'), default=0)
+    not_implemented = models.PositiveIntegerField(_('Not Implemented'), default=0)
+    not_applicable = models.PositiveIntegerField(_('Not Applicable'), default=0)
+    
+    # Scores
+    compliance_score = models.DecimalField(_('Compliance Score (%)'), max_digits=5, decimal_places=2, default=0)
+    maturity_score = models.DecimalField(_('Maturity Score'), max_digits=3, decimal_places=2, default=0)
+    maturity_distribution = models.JSONField(_('Maturity Distribution'), default=dict, blank=True)
+    
+    computed_at = models.DateTimeField(_('Computed At'))
+    
+    class Meta:
+        verbose_name = _('Compliance Score Rollup')
+        verbose_name_plural = _('Compliance Score Rollups')
+        ordering = ['organization', 'framework', 'date']
+        # Also the index behind trend range scans
+        unique_together = ['organization', 'framework', 'domain', 'date']
+        constraints = [
+            # NULLs never collide in unique_together, so framework totals need their own
+            models.UniqueConstraint(
+                fields=['organization', 'framework', 'date'],
+                condition=models.Q(domain__isnull=True),
+                name='unique_framework_rollup_per_day'
+            ),
+        ]
+    
+    def __str__(self):
+        scope = self.domain.code if self.domain else self.framework.code
+        return f"{self.organization.code} - {scope} @ {self.date}: {self.compliance_score}%"
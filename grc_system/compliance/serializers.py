@@ -4,7 +4,7 @@ Compliance app serializers.
 from rest_framework import serializers
 from .models import (
     ControlFramework, ControlDomain, Control, ControlImplementation,
-    Audit, AuditFinding, CorrectiveAction, Evidence, GapAssessment
+    Audit, AuditFinding, CorrectiveAction, Evidence, GapAssessment, GapAssessmentSnapshot
 )
 
 
@@ -133,11 +133,23 @@ class EvidenceListSerializer(serializers.ModelSerializer):
 class GapAssessmentSerializer(serializers.ModelSerializer):
     framework_name = serializers.CharField(source='framework.name', read_only=True)
     assessor_name = serializers.CharField(source='assessor.get_full_name', read_only=True)
+    compliance_status = serializers.CharField(read_only=True)
     
     class Meta:
         model = GapAssessment
         fields = '__all__'
-        read_only_fields = ['created_at', 'updated_at']
+        read_only_fields = ['snapshot_taken_at', 'refresh_task_id', 'created_at', 'updated_at']
+
+
+class GapAssessmentSnapshotSerializer(serializers.ModelSerializer):
+    control_code = serializers.CharField(source='control.control_id', read_only=True)
+    control_title = serializers.CharField(source='control.title', read_only=True)
+    domain_name = serializers.CharField(source='domain.name', read_only=True)
+    
+    class Meta:
+        model = GapAssessmentSnapshot
+        fields = ['id', 'control', 'control_code', 'control_title', 'domain', 'domain_name',
+                  'status', 'maturity_level', 'effectiveness_rating', 'captured_at']
 
 
 class GapAssessmentListSerializer(serializers.ModelSerializer):
@@ -36,13 +36,10 @@ def user_is_manager(user):
 def start_content_workflow(obj, creator, model_name, id_field='pk'):
     """Helper to start content approval workflow."""
     from workflow.services import WorkflowService
-    from workflow.models import WorkflowTemplate
+    from workflow.compiled import get_compiled_template
     
     try:
-        template = WorkflowTemplate.objects.filter(
-            code='content-approval',
-            is_active=True
-        ).first()
+        template = get_compiled_template('content-approval')
         
         if template:
             existing_workflow = WorkflowService.get_workflow_for_object(obj)
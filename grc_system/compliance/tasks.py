@@ -0,0 +1,54 @@
+"""
+Celery tasks for compliance management.
+Handles asynchronous gap assessment snapshots.
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def refresh_gap_assessment_snapshot(self, gap_assessment_id):
+    """
+    Snapshot control implementations for a gap assessment and recompute its scores.
+    Queued by refresh_gap_assessment for large frameworks.
+    """
+    from .models import GapAssessment
+    from .utils import snapshot_gap_assessment
+    
+    try:
+        gap_assessment = GapAssessment.objects.filter(pk=gap_assessment_id).first()
+        if gap_assessment is None:
+            logger.warning(f"Gap assessment {gap_assessment_id} no longer exists, skipping refresh")
+            return None
+        
+        result = snapshot_gap_assessment(gap_assessment)
+        logger.info(
+            f"Refreshed gap assessment {gap_assessment.assessment_id}: "
+            f"{result['total_controls']} controls, score {result['compliance_score']}"
+        )
+        
+        result['snapshot_taken_at'] = result['snapshot_taken_at'].isoformat()
+        return result
+        
+    except Exception as e:
+        logger.error(f"Error in refresh_gap_assessment_snapshot: {e}")
+        raise self.retry(exc=e, countdown=60)
+
+
+@shared_task(bind=True, max_retries=3)
+def rollup_compliance_scores(self):
+    """
+    Write today's compliance score rollup for organizations that changed.
+    Runs nightly via Celery Beat.
+    """
+    from .utils import rollup_compliance_scores as rollup
+    
+    try:
+        organizations = rollup()
+        return {'organizations': organizations}
+        
+    except Exception as e:
+        logger.error(f"Error in rollup_compliance_scores: {e}")
+        raise self.retry(exc=e, countdown=300)
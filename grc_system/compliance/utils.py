@@ -7,9 +7,18 @@ Key GRC Compliance Concepts:
 3. Gap Assessment calculations
 4. Compliance Score computation
 """
-from django.db.models import Avg, Count, Q
+import logging
+import uuid
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import (
+    Avg, Case, CharField, Count, FilteredRelation, IntegerField, Q, Value, When
+)
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
 
 # Maturity Level Definitions (CMMI-based)
 MATURITY_LEVELS = {
@@ -61,96 +70,162 @@ STATUS_WEIGHTS = {
     'not_applicable': None,  # Excluded from scoring
 }
 
+# Gap classification (see gap_queryset)
+TARGET_MATURITY_LEVEL = 3
 
-def calculate_compliance_score(organization, framework=None):
+GAP_TYPES = {
+    'not_assessed': {
+        'severity': 'high',
+        'recommendation': 'Create implementation record and assess control',
+    },
+    'not_implemented': {
+        'severity': 'high',
+        'recommendation': 'Implement control as per remediation plan',
+    },
+    'planned': {
+        'severity': 'high',
+        'recommendation': 'Start implementation by the planned target date',
+    },
+    'partially_implemented': {
+        'severity': 'medium',
+        'recommendation': 'Complete implementation as per plan',
+    },
+    'in_progress': {
+        'severity': 'medium',
+        'recommendation': 'Complete the implementation in progress',
+    },
+    'maturity_gap': {
+        'severity': 'low',
+        'recommendation': 'Improve maturity from level {maturity} to at least level {target}',
+    },
+}
+
+GAP_SEVERITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+
+def _weighted_score(status_counts):
+    """Weighted compliance score (0-100) of a {status: count} mapping, or 0."""
+    applicable = sum(status_counts.values()) - status_counts.get('not_applicable', 0)
+    if applicable <= 0:
+        return 0
+    weighted = sum(
+        STATUS_WEIGHTS[impl_status] * count
+        for impl_status, count in status_counts.items()
+        if STATUS_WEIGHTS.get(impl_status) is not None
+    )
+    return weighted / applicable
+
+
+def calculate_compliance_profile(organization, framework=None):
     """
-    Calculate overall compliance score for an organization.
+    Calculate compliance and maturity statistics in a single grouped query.
     
-    Formula: (Fully Implemented × 100 + Partially × 50) / Total Applicable Controls
+    Implementations are grouped by (domain, status, maturity level) and
+    every breakdown is folded from those rows in Python.
     
     Args:
-        organization: Organization instance
+        organization: Organization instance or id
         framework: Optional framework to filter by
     
     Returns:
         dict: {
-            'score': float (0-100),
-            'total_controls': int,
-            'implemented': int,
-            'partially_implemented': int,
-            'in_progress': int,
-            'not_implemented': int,
-            'not_applicable': int,
-            'by_domain': dict
+            'compliance': see calculate_compliance_score,
+            'maturity': see calculate_maturity_score,
+            'by_maturity_level': {level: {'total': int, 'by_status': dict}}
         }
     """
-    from compliance.models import ControlImplementation, Control
+    from compliance.models import ControlImplementation
     
     impls = ControlImplementation.objects.filter(organization=organization)
     
     if framework:
         impls = impls.filter(control__domain__framework=framework)
     
-    stats = impls.aggregate(
-        total=Count('id'),
-        implemented=Count('id', filter=Q(status='implemented')),
-        partially=Count('id', filter=Q(status='partially_implemented')),
-        in_progress=Count('id', filter=Q(status='in_progress')),
-        planned=Count('id', filter=Q(status='planned')),
-        not_impl=Count('id', filter=Q(status='not_implemented')),
-        na=Count('id', filter=Q(status='not_applicable')),
-    )
-    
-    applicable = stats['total'] - stats['na']
+    rows = impls.values_list(
+        'control__domain__code', 'control__domain__name', 'status', 'maturity_level'
+    ).annotate(count=Count('id')).order_by()
+    
+    by_status = Counter()
+    applicable_maturity = Counter()
+    domain_names = {}
+    domain_status = defaultdict(Counter)
+    domain_maturity = defaultdict(Counter)
+    level_status = defaultdict(Counter)
+    
+    for domain_code, domain_name, impl_status, maturity_level, count in rows:
+        by_status[impl_status] += count
+        domain_names[domain_code] = domain_name
+        domain_status[domain_code][impl_status] += count
+        level_status[maturity_level][impl_status] += count
+        if impl_status != 'not_applicable':
+            applicable_maturity[maturity_level] += count
+            domain_maturity[domain_code][maturity_level] += count
     
-    if applicable > 0:
-        weighted_score = (
-            stats['implemented'] * 100 +
-            stats['partially'] * 50 +
-            stats['in_progress'] * 25 +
-            stats['planned'] * 10
-        ) / applicable
-    else:
-        weighted_score = 0
-    
-    # Calculate by domain
     domain_scores = {}
-    domain_impls = impls.values(
-        'control__domain__code',
-        'control__domain__name'
-    ).annotate(
-        total=Count('id'),
-        implemented=Count('id', filter=Q(status='implemented')),
-        partially=Count('id', filter=Q(status='partially_implemented')),
-        na=Count('id', filter=Q(status='not_applicable')),
-    )
-    
-    for d in domain_impls:
-        domain_applicable = d['total'] - d['na']
-        if domain_applicable > 0:
-            domain_score = (d['implemented'] * 100 + d['partially'] * 50) / domain_applicable
-        else:
-            domain_score = 0
-        
-        domain_scores[d['control__domain__code']] = {
-            'name': d['control__domain__name'],
-            'score': round(domain_score, 1),
-            'total': d['total'],
-            'implemented': d['implemented']
+    for domain_code, statuses in domain_status.items():
+        domain_scores[domain_code] = {
+            'name': domain_names[domain_code],
+            'score': round(_weighted_score(statuses), 1),
+            'total': sum(statuses.values()),
+            'implemented': statuses['implemented'],
+            'partially_implemented': statuses['partially_implemented'],
+            'not_applicable': statuses['not_applicable'],
+            'average_maturity': build_maturity_summary(domain_maturity[domain_code])['average_maturity'],
         }
     
-    return {
-        'score': round(weighted_score, 1),
-        'total_controls': stats['total'],
-        'implemented': stats['implemented'],
-        'partially_implemented': stats['partially'],
-        'in_progress': stats['in_progress'],
-        'planned': stats['planned'],
-        'not_implemented': stats['not_impl'],
-        'not_applicable': stats['na'],
-        'applicable': applicable,
+    total = sum(by_status.values())
+    compliance = {
+        'score': round(_weighted_score(by_status), 1),
+        'total_controls': total,
+        'implemented': by_status['implemented'],
+        'partially_implemented': by_status['partially_implemented'],
+        'in_progress': by_status['in_progress'],
+        'planned': by_status['planned'],
+        'not_implemented': by_status['not_implemented'],
+        'not_applicable': by_status['not_applicable'],
+        'applicable': total - by_status['not_applicable'],
         'by_domain': domain_scores
     }
+    
+    return {
+        'compliance': compliance,
+        'maturity': build_maturity_summary(applicable_maturity),
+        'by_maturity_level': {
+            level: {
+                'total': sum(level_status[level].values()),
+                'by_status': dict(level_status[level]),
+            }
+            for level in range(6)
+        },
+    }
+
+
+def calculate_compliance_score(organization, framework=None):
+    """
+    Calculate overall compliance score for an organization.
+    
+    Formula: (Fully Implemented × 100 + Partially × 50) / Total Applicable Controls
+    
+    Callers that also need the maturity score should read both from one
+    calculate_compliance_profile call instead.
+    
+    Args:
+        organization: Organization instance
+        framework: Optional framework to filter by
+    
+    Returns:
+        dict: {
+            'score': float (0-100),
+            'total_controls': int,
+            'implemented': int,
+            'partially_implemented': int,
+            'in_progress': int,
+            'not_implemented': int,
+            'not_applicable': int,
+            'by_domain': dict
+        }
+    """
+    return calculate_compliance_profile(organization, framework)['compliance']
 
 
 def calculate_maturity_score(organization, framework=None):
@@ -168,30 +243,34 @@ def calculate_maturity_score(organization, framework=None):
             'distribution': dict
         }
     """
-    from compliance.models import ControlImplementation
-    
-    impls = ControlImplementation.objects.filter(organization=organization)
+    return calculate_compliance_profile(organization, framework)['maturity']
+
+
+def build_maturity_summary(distribution):
+    """
+    Build the maturity summary from a maturity level distribution.
     
-    if framework:
-        impls = impls.filter(control__domain__framework=framework)
+    Args:
+        distribution: dict {maturity_level: count} of applicable implementations
     
-    # Exclude N/A controls
-    impls = impls.exclude(status='not_applicable')
+    Returns:
+        dict: {
+            'average_maturity': float,
+            'maturity_level': str,
+            'distribution': dict
+        }
+    """
+    distribution = {level: distribution.get(level, 0) for level in range(6)}
+    total = sum(distribution.values())
     
-    if not impls.exists():
+    if not total:
         return {
             'average_maturity': 0,
             'maturity_level': 'Non-existent',
-            'distribution': {i: 0 for i in range(6)}
+            'distribution': distribution
         }
     
-    avg_maturity = impls.aggregate(avg=Avg('maturity_level'))['avg'] or 0
-    
-    # Distribution
-    distribution = {}
-    for level in range(6):
-        count = impls.filter(maturity_level=level).count()
-        distribution[level] = count
+    avg_maturity = sum(level * count for level, count in distribution.items()) / total
     
     # Determine overall level
     rounded_level = round(avg_maturity)
@@ -206,67 +285,294 @@ def calculate_maturity_score(organization, framework=None):
     }
 
 
-def auto_calculate_gap_assessment(gap_assessment):
+def snapshot_gap_assessment(gap_assessment, batch_size=1000):
     """
-    Automatically calculate gap assessment results from control implementations.
+    Freeze current control implementations into GapAssessmentSnapshot rows
+    and recompute the assessment's results from them.
+    
+    Controls are left-joined to the organization's implementations in one
+    query and written with a single bulk insert; controls without an
+    implementation record are captured as 'not_assessed'.
     
     Args:
         gap_assessment: GapAssessment instance
+        batch_size: Rows per INSERT statement
     
     Returns:
-        dict: Updated statistics
+        dict: Updated statistics (see score_gap_assessment)
     """
-    from compliance.models import ControlImplementation, Control
+    from compliance.models import Control, GapAssessmentSnapshot
+    
+    captured_at = timezone.now()
+    rows = Control.objects.filter(domain__framework=gap_assessment.framework_id).annotate(
+        impl=FilteredRelation(
+            'implementations',
+            condition=Q(implementations__organization=gap_assessment.organization_id),
+        ),
+    ).values_list(
+        'id', 'domain_id', 'impl__status', 'impl__maturity_level', 'impl__effectiveness_rating'
+    ).order_by()
+    
+    with transaction.atomic():
+        GapAssessmentSnapshot.objects.filter(gap_assessment=gap_assessment).delete()
+        GapAssessmentSnapshot.objects.bulk_create(
+            (
+                GapAssessmentSnapshot(
+                    gap_assessment=gap_assessment,
+                    control_id=control_id,
+                    domain_id=domain_id,
+                    status=impl_status or 'not_assessed',
+                    maturity_level=maturity_level,
+                    effectiveness_rating=effectiveness_rating,
+                    captured_at=captured_at,
+                )
+                for control_id, domain_id, impl_status, maturity_level, effectiveness_rating
+                in rows.iterator(chunk_size=batch_size)
+            ),
+            batch_size=batch_size,
+        )
+        gap_assessment.snapshot_taken_at = captured_at
+        return score_gap_assessment(gap_assessment)
+
+
+def score_gap_assessment(gap_assessment):
+    """
+    Compute and save gap assessment results from its snapshot.
     
-    # Get all controls for this framework
-    controls = Control.objects.filter(domain__framework=gap_assessment.framework)
+    Only the result fields are written, so edits saved while a background
+    refresh was running are kept.
     
-    # Get implementations for this organization
-    impls = ControlImplementation.objects.filter(
-        organization=gap_assessment.organization,
-        control__domain__framework=gap_assessment.framework
-    )
+    Formula: (Implemented × 100 + Partially × 50) / (Total - Not Applicable);
+    maturity is averaged over assessed, applicable controls.
+    
+    Args:
+        gap_assessment: GapAssessment instance with a snapshot
     
-    impl_stats = impls.aggregate(
+    Returns:
+        dict: Updated statistics
+    """
+    stats = gap_assessment.snapshots.aggregate(
+        total=Count('id'),
         implemented=Count('id', filter=Q(status='implemented')),
         partially=Count('id', filter=Q(status='partially_implemented')),
         not_impl=Count('id', filter=Q(status='not_implemented')),
+        not_assessed=Count('id', filter=Q(status='not_assessed')),
         na=Count('id', filter=Q(status='not_applicable')),
-        avg_maturity=Avg('maturity_level')
+        avg_maturity=Avg('maturity_level', filter=~Q(status__in=['not_applicable', 'not_assessed'])),
     )
     
-    total_controls = controls.count()
-    
-    # Update gap assessment
-    gap_assessment.total_controls = total_controls
-    gap_assessment.implemented_controls = impl_stats['implemented']
-    gap_assessment.partially_implemented = impl_stats['partially']
-    gap_assessment.not_implemented = impl_stats['not_impl']
-    gap_assessment.not_applicable = impl_stats['na']
-    
-    # Calculate compliance score
-    applicable = total_controls - impl_stats['na']
-    if applicable > 0:
-        gap_assessment.compliance_score = round(
-            (impl_stats['implemented'] * 100 + impl_stats['partially'] * 50) / applicable,
-            2
-        )
-    else:
-        gap_assessment.compliance_score = 0
+    gap_assessment.total_controls = stats['total']
+    gap_assessment.implemented_controls = stats['implemented']
+    gap_assessment.partially_implemented = stats['partially']
+    gap_assessment.not_implemented = stats['not_impl']
+    gap_assessment.not_applicable = stats['na']
+    gap_assessment.compliance_score = gap_assessment.calculate_compliance_score()
+    gap_assessment.maturity_score = round(stats['avg_maturity'] or 0, 2)
+    gap_assessment.save(update_fields=[
+        'total_controls', 'implemented_controls', 'partially_implemented',
+        'not_implemented', 'not_applicable', 'compliance_score', 'maturity_score',
+        'snapshot_taken_at', 'updated_at',
+    ])
     
-    # Maturity score
-    gap_assessment.maturity_score = round(impl_stats['avg_maturity'] or 0, 2)
+    return {
+        'total_controls': stats['total'],
+        'implemented': stats['implemented'],
+        'partially_implemented': stats['partially'],
+        'not_implemented': stats['not_impl'],
+        'not_assessed': stats['not_assessed'],
+        'not_applicable': stats['na'],
+        'compliance_score': gap_assessment.compliance_score,
+        'maturity_score': gap_assessment.maturity_score,
+        'snapshot_taken_at': gap_assessment.snapshot_taken_at,
+    }
+
+
+def auto_calculate_gap_assessment(gap_assessment):
+    """
+    Automatically calculate gap assessment results from control implementations.
+    
+    Args:
+        gap_assessment: GapAssessment instance
+    
+    Returns:
+        dict: Updated statistics
+    """
+    return snapshot_gap_assessment(gap_assessment)
+
+
+def refresh_gap_assessment(gap_assessment, run_async=None):
+    """
+    Refresh a gap assessment snapshot, in Celery for large frameworks.
     
-    gap_assessment.save()
+    Frameworks with at least GAP_SNAPSHOT_ASYNC_THRESHOLD controls are
+    refreshed by compliance.tasks.refresh_gap_assessment_snapshot; if the
+    task cannot be queued the refresh runs inline.
     
+    Args:
+        gap_assessment: GapAssessment instance
+        run_async: Force (True) or skip (False) the background task;
+                   decided by framework size when None
+    
+    Returns:
+        tuple: (task_id or None, statistics dict or None)
+    """
+    from django.conf import settings
+    from compliance.models import Control
+    
+    if run_async is None:
+        threshold = getattr(settings, 'GAP_SNAPSHOT_ASYNC_THRESHOLD', 500)
+        run_async = Control.objects.filter(
+            domain__framework=gap_assessment.framework_id
+        ).count() >= threshold
+    
+    if run_async:
+        from compliance.tasks import refresh_gap_assessment_snapshot
+        
+        # Stored before dispatch, so the worker cannot load the row first
+        previous_task_id = gap_assessment.refresh_task_id
+        gap_assessment.refresh_task_id = str(uuid.uuid4())
+        gap_assessment.save(update_fields=['refresh_task_id', 'updated_at'])
+        try:
+            refresh_gap_assessment_snapshot.apply_async(
+                args=[gap_assessment.pk], task_id=gap_assessment.refresh_task_id
+            )
+        except Exception as e:
+            logger.warning(f"Could not queue gap assessment refresh, running inline: {e}")
+            gap_assessment.refresh_task_id = previous_task_id
+            gap_assessment.save(update_fields=['refresh_task_id', 'updated_at'])
+        else:
+            return gap_assessment.refresh_task_id, None
+    
+    return None, snapshot_gap_assessment(gap_assessment)
+
+
+def gap_queryset(organization, framework):
+    """
+    Controls of a framework that are gaps for an organization.
+    
+    Controls are left-joined to the organization's implementations and
+    classified in SQL, so the whole framework is assessed in one query:
+    - not_assessed: no implementation record (high)
+    - not_implemented: implementation not implemented (high)
+    - planned: implementation planned but not started (high)
+    - partially_implemented: implementation partial (medium)
+    - in_progress: implementation under way (medium)
+    - maturity_gap: implemented below the target maturity level (low)
+    Not-applicable controls are never gaps.
+    
+    Args:
+        organization: Organization instance or id
+        framework: Framework instance or id
+    
+    Returns:
+        QuerySet: Gap controls annotated with gap_type and severity_rank,
+                  ordered by severity then domain and control order
+    """
+    from compliance.models import Control
+    
+    severity_rank = Case(
+        *[
+            When(gap_type__in=[
+                gap_type for gap_type, rule in GAP_TYPES.items() if rule['severity'] == severity
+            ], then=Value(rank))
+            for severity, rank in GAP_SEVERITY_ORDER.items()
+        ],
+        output_field=IntegerField(),
+    )
+    
+    return Control.objects.filter(domain__framework=framework).annotate(
+        impl=FilteredRelation(
+            'implementations',
+            condition=Q(implementations__organization=organization),
+        ),
+    ).annotate(
+        gap_type=Case(
+            When(impl__id__isnull=True, then=Value('not_assessed')),
+            When(impl__status='not_implemented', then=Value('not_implemented')),
+            When(impl__status='planned', then=Value('planned')),
+            When(impl__status='partially_implemented', then=Value('partially_implemented')),
+            When(impl__status='in_progress', then=Value('in_progress')),
+            When(
+                impl__status='implemented',
+                impl__maturity_level__lt=TARGET_MATURITY_LEVEL,
+                then=Value('maturity_gap'),
+            ),
+            default=None,
+            output_field=CharField(),
+        ),
+    ).filter(gap_type__isnull=False).annotate(
+        severity_rank=severity_rank,
+    ).order_by('severity_rank', 'domain__order', 'domain__code', 'order', 'control_id')
+
+
+def _build_gap(row):
+    """Turn one gap_queryset row into the gap dict returned by the API."""
+    gap_type = row['gap_type']
+    gap = {
+        'control_id': row['control_id'],
+        'control_title': row['title'],
+        'domain': row['domain__name'] or 'Unknown',
+        'gap_type': gap_type,
+        'severity': GAP_TYPES[gap_type]['severity'],
+    }
+    
+    if gap_type in ('not_implemented', 'planned', 'partially_implemented', 'in_progress'):
+        gap.update({
+            'gap_description': row['impl__gap_description'],
+            'remediation_plan': row['impl__remediation_plan'],
+            'target_date': row['impl__target_date'],
+        })
+    elif gap_type == 'maturity_gap':
+        gap['current_maturity'] = row['impl__maturity_level']
+    
+    gap['recommendation'] = GAP_TYPES[gap_type]['recommendation'].format(
+        maturity=row['impl__maturity_level'], target=TARGET_MATURITY_LEVEL
+    )
+    return gap
+
+
+def iter_gaps(organization, framework, severity=None, chunk_size=500):
+    """
+    Stream control gaps for an organization, most severe first.
+    
+    Args:
+        organization: Organization instance or id
+        framework: Framework instance or id
+        severity: Optional severity ('high', 'medium', 'low') to restrict to
+        chunk_size: Rows fetched per database round trip
+    
+    Yields:
+        dict: Gap details
+    """
+    gaps = gap_queryset(organization, framework)
+    if severity:
+        gaps = gaps.filter(severity_rank=GAP_SEVERITY_ORDER[severity])
+    
+    rows = gaps.values(
+        'control_id', 'title', 'domain__name', 'gap_type',
+        'impl__gap_description', 'impl__remediation_plan',
+        'impl__target_date', 'impl__maturity_level',
+    )
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield _build_gap(row)
+
+
+def count_gaps(organization, framework):
+    """
+    Count control gaps by severity in a single grouped query.
+    
+    Returns:
+        dict: {'high': n, 'medium': n, 'low': n}
+    """
+    counts = dict(
+        gap_queryset(organization, framework)
+        .values_list('severity_rank')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
     return {
-        'total_controls': total_controls,
-        'implemented': impl_stats['implemented'],
-        'partially_implemented': impl_stats['partially'],
-        'not_implemented': impl_stats['not_impl'],
-        'not_applicable': impl_stats['na'],
-        'compliance_score': gap_assessment.compliance_score,
-        'maturity_score': gap_assessment.maturity_score
+        severity: counts.get(rank, 0)
+        for severity, rank in GAP_SEVERITY_ORDER.items()
     }
 
 
@@ -279,71 +585,9 @@ def identify_gaps(organization, framework):
         framework: Framework to assess
     
     Returns:
-        list: List of gap details
+        list: List of gap details, sorted by severity
     """
-    from compliance.models import ControlImplementation, Control
-    
-    gaps = []
-    
-    # Get all controls in framework
-    controls = Control.objects.filter(domain__framework=framework)
-    
-    for control in controls:
-        impl = ControlImplementation.objects.filter(
-            organization=organization,
-            control=control
-        ).first()
-        
-        if not impl:
-            # No implementation record - gap
-            gaps.append({
-                'control_id': control.control_id,
-                'control_title': control.title,
-                'domain': control.domain.name if control.domain else 'Unknown',
-                'gap_type': 'not_assessed',
-                'severity': 'high',
-                'recommendation': 'Create implementation record and assess control'
-            })
-        elif impl.status == 'not_implemented':
-            gaps.append({
-                'control_id': control.control_id,
-                'control_title': control.title,
-                'domain': control.domain.name if control.domain else 'Unknown',
-                'gap_type': 'not_implemented',
-                'severity': 'high',
-                'gap_description': impl.gap_description,
-                'remediation_plan': impl.remediation_plan,
-                'target_date': impl.target_date,
-                'recommendation': 'Implement control as per remediation plan'
-            })
-        elif impl.status == 'partially_implemented':
-            gaps.append({
-                'control_id': control.control_id,
-                'control_title': control.title,
-                'domain': control.domain.name if control.domain else 'Unknown',
-                'gap_type': 'partially_implemented',
-                'severity': 'medium',
-                'gap_description': impl.gap_description,
-                'remediation_plan': impl.remediation_plan,
-                'target_date': impl.target_date,
-                'recommendation': 'Complete implementation as per plan'
-            })
-        elif impl.maturity_level < 3:
-            gaps.append({
-                'control_id': control.control_id,
-                'control_title': control.title,
-                'domain': control.domain.name if control.domain else 'Unknown',
-                'gap_type': 'maturity_gap',
-                'severity': 'low',
-                'current_maturity': impl.maturity_level,
-                'recommendation': f'Improve maturity from level {impl.maturity_level} to at least level 3'
-            })
-    
-    # Sort by severity
-    severity_order = {'high': 0, 'medium': 1, 'low': 2}
-    gaps.sort(key=lambda x: severity_order.get(x['severity'], 3))
-    
-    return gaps
+    return list(iter_gaps(organization, framework))
 
 
 def check_evidence_status(organization):
@@ -494,3 +738,210 @@ def get_audit_statistics(organization):
             due_date__lt=timezone.now().date()
         ).count(),
     }
+
+
+def _rollup_values(status_counts, maturity_counts):
+    """
+    Score one rollup bucket.
+    
+    Args:
+        status_counts: Counter {status: count}
+        maturity_counts: Counter {maturity_level: count} of applicable implementations
+    
+    Returns:
+        dict: ComplianceScoreRollup field values
+    """
+    total = sum(status_counts.values())
+    assessed = sum(maturity_counts.values())
+    
+    return {
+        'total_controls': total,
+        'implemented_controls': status_counts['implemented'],
+        'partially_implemented': status_counts['partially_implemented'],
+        'not_implemented': status_counts['not_implemented'],
+        'not_applicable': status_counts['not_applicable'],
+        'compliance_score': round(_weighted_score(status_counts), 2),
+        'maturity_score': round(
+            sum(level * count for level, count in maturity_counts.items()) / assessed, 2
+        ) if assessed else 0,
+        'maturity_distribution': {str(level): maturity_counts[level] for level in range(6)},
+    }
+
+
+def compute_compliance_rollups(organization_id):
+    """
+    Compute rollup values for every framework and domain of an organization.
+    
+    One grouped query over the organization's implementations.
+    
+    Args:
+        organization_id: Organization id
+    
+    Returns:
+        dict: {(framework_id, domain_id or None): rollup field values};
+              domain None holds the framework totals
+    """
+    from compliance.models import ControlImplementation
+    
+    status_counts = defaultdict(Counter)
+    maturity_counts = defaultdict(Counter)
+    
+    rows = ControlImplementation.objects.filter(
+        organization_id=organization_id, control__domain__isnull=False
+    ).values_list(
+        'control__domain__framework_id', 'control__domain_id', 'status', 'maturity_level'
+    ).annotate(count=Count('id')).order_by()
+    
+    for framework_id, domain_id, impl_status, maturity_level, count in rows:
+        for key in ((framework_id, domain_id), (framework_id, None)):
+            status_counts[key][impl_status] += count
+            if impl_status != 'not_applicable':
+                maturity_counts[key][maturity_level] += count
+    
+    return {
+        key: _rollup_values(status_counts[key], maturity_counts[key])
+        for key in status_counts
+    }
+
+
+def organizations_needing_rollup():
+    """
+    Organizations whose implementations changed since their last rollup.
+    
+    A change is an implementation saved after the last rollup was computed,
+    or a status/maturity counter moved (which also covers deletions); see
+    dashboard.services.OrganizationSummaryService.
+    
+    Returns:
+        QuerySet: Organization ids
+    """
+    from django.db.models import Exists, OuterRef, Subquery
+    from core.models import Organization
+    from compliance.models import ComplianceScoreRollup, ControlImplementation
+    from dashboard.models import OrganizationSummary
+    
+    last_computed = ComplianceScoreRollup.objects.filter(
+        organization=OuterRef('pk')
+    ).order_by('-computed_at').values('computed_at')[:1]
+    
+    implementations = ControlImplementation.objects.filter(organization=OuterRef('pk'))
+    counters = OrganizationSummary.objects.filter(organization=OuterRef('pk'), module='compliance')
+    
+    return Organization.objects.alias(
+        last_computed=Subquery(last_computed),
+    ).alias(
+        has_implementations=Exists(implementations),
+        changed_implementations=Exists(implementations.filter(updated_at__gt=OuterRef('last_computed'))),
+        changed_counters=Exists(counters.filter(updated_at__gt=OuterRef('last_computed'))),
+    ).filter(
+        Q(last_computed__isnull=True, has_implementations=True)
+        | Q(changed_implementations=True)
+        | Q(changed_counters=True)
+    ).values_list('id', flat=True)
+
+
+def rollup_compliance_scores(date=None, organization_id=None, force=False):
+    """
+    Write the daily compliance rollup for organizations that changed.
+    
+    Each organization's rows for the day are replaced in one transaction.
+    Frameworks or domains that lost all their implementations get a zero
+    row, so the trend does not carry their old score forward.
+    
+    Args:
+        date: Rollup date (defaults to today)
+        organization_id: Optional organization to restrict to
+        force: Roll up even if nothing changed
+    
+    Returns:
+        int: Number of organizations rolled up
+    """
+    from core.cache import bump_organization
+    from core.models import Organization
+    from compliance.models import ComplianceScoreRollup
+    
+    date = date or timezone.localdate()
+    org_ids = Organization.objects.values_list('id', flat=True) if force else organizations_needing_rollup()
+    if organization_id:
+        org_ids = org_ids.filter(pk=organization_id)
+    org_ids = list(org_ids)
+    
+    computed_at = timezone.now()
+    empty = _rollup_values(Counter(), Counter())
+    
+    for org_id in org_ids:
+        values = compute_compliance_rollups(org_id)
+        
+        # Buckets rolled up before but empty now are closed with a zero row
+        previous = ComplianceScoreRollup.objects.filter(
+            organization_id=org_id
+        ).values_list('framework_id', 'domain_id').distinct()
+        for key in previous:
+            values.setdefault(key, empty)
+        
+        with transaction.atomic():
+            ComplianceScoreRollup.objects.filter(organization_id=org_id, date=date).delete()
+            ComplianceScoreRollup.objects.bulk_create([
+                ComplianceScoreRollup(
+                    organization_id=org_id,
+                    framework_id=framework_id,
+                    domain_id=domain_id,
+                    date=date,
+                    computed_at=computed_at,
+                    **fields
+                )
+                for (framework_id, domain_id), fields in values.items()
+            ], batch_size=1000)
+            bump_organization(org_id)
+    
+    logger.info(f"Rolled up compliance scores for {len(org_ids)} organization(s) on {date}")
+    return len(org_ids)
+
+
+def get_compliance_trend(organization_id, framework_id, start, end, domain_id=None):
+    """
+    Daily compliance trend from the rollup table.
+    
+    Reads the rows in [start, end] plus the last row before start in one
+    range scan of the (organization, framework, domain, date) index, then
+    carries each row forward over the days without a rollup.
+    
+    Args:
+        organization_id: Organization id
+        framework_id: Framework id
+        start: First date
+        end: Last date
+        domain_id: Optional domain; framework totals if omitted
+    
+    Returns:
+        list: One dict per day from the first available rollup to end
+    """
+    from datetime import timedelta
+    from django.db.models import Subquery
+    from django.db.models.functions import Coalesce
+    from compliance.models import ComplianceScoreRollup
+    
+    rollups = ComplianceScoreRollup.objects.filter(
+        organization_id=organization_id, framework_id=framework_id, domain_id=domain_id
+    )
+    seed = rollups.filter(date__lte=start).order_by('-date').values('date')[:1]
+    rows = rollups.filter(
+        date__gte=Coalesce(Subquery(seed), Value(start)), date__lte=end
+    ).order_by('date').values(
+        'date', 'total_controls', 'implemented_controls', 'partially_implemented',
+        'not_implemented', 'not_applicable', 'compliance_score', 'maturity_score',
+        'maturity_distribution',
+    )
+    
+    trend = []
+    current = None
+    rows = iter(rows)
+    upcoming = next(rows, None)
+    day = start
+    while day <= end:
+        while upcoming is not None and upcoming['date'] <= day:
+            current, upcoming = upcoming, next(rows, None)
+        if current is not None:
+            trend.append({**current, 'date': day})
+        day += timedelta(days=1)
+    return trend
@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.db.models import Count, Avg
+from core.cache import cached_response
 
 from .models import (
     ControlFramework, ControlDomain, Control, ControlImplementation,
@@ -18,7 +19,7 @@ from .serializers import (
     AuditSerializer, AuditListSerializer,
     AuditFindingSerializer, AuditFindingListSerializer,
     CorrectiveActionSerializer, EvidenceSerializer, EvidenceListSerializer,
-    GapAssessmentSerializer, GapAssessmentListSerializer
+    GapAssessmentSerializer, GapAssessmentListSerializer, GapAssessmentSnapshotSerializer
 )
 
 
@@ -130,15 +131,32 @@ class ControlImplementationViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def statistics(self, request):
-        """Get implementation statistics."""
+        """
+        Get implementation statistics.
+        
+        Organization-wide statistics are served from the materialized
+        summary counters; a framework filter falls back to live queries.
+        """
         org_id = request.query_params.get('organization')
         framework_id = request.query_params.get('framework')
         
+        if not framework_id:
+            from dashboard.services import OrganizationSummaryService
+            from dashboard.utils import average_maturity, implementation_breakdown
+            
+            counters = OrganizationSummaryService.get_counters(org_id)['compliance']
+            by_status, by_maturity, _ = implementation_breakdown(counters)
+            return Response({
+                'total': sum(by_status.values()),
+                'by_status': by_status,
+                'avg_maturity': average_maturity(by_maturity),
+                'by_maturity': by_maturity,
+            })
+        
         impls = self.queryset
         if org_id:
             impls = impls.filter(organization_id=org_id)
-        if framework_id:
-            impls = impls.filter(control__domain__framework_id=framework_id)
+        impls = impls.filter(control__domain__framework_id=framework_id)
         
         stats = {
             'total': impls.count(),
@@ -147,6 +165,56 @@ class ControlImplementationViewSet(viewsets.ModelViewSet):
             'by_maturity': dict(impls.values_list('maturity_level').annotate(count=Count('id'))),
         }
         return Response(stats)
+    
+    @action(detail=False, methods=['get'])
+    @cached_response('compliance.trend')
+    def trend(self, request):
+        """
+        Get the daily compliance trend from the rollup table.
+        GET /api/compliance/implementations/trend/?organization=1&framework=2
+        
+        Query params:
+            organization, framework: Required
+            domain: Optional domain (framework totals if omitted)
+            start, end: Optional YYYY-MM-DD range (default: the last 365 days)
+        """
+        from datetime import date, timedelta
+        from django.utils import timezone
+        from compliance.utils import get_compliance_trend
+        
+        org_id = request.query_params.get('organization')
+        framework_id = request.query_params.get('framework')
+        if not org_id or not framework_id:
+            return Response(
+                {'error': 'organization and framework are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            end = request.query_params.get('end')
+            end = date.fromisoformat(end) if end else timezone.localdate()
+            start = request.query_params.get('start')
+            start = date.fromisoformat(start) if start else end - timedelta(days=364)
+        except ValueError:
+            return Response(
+                {'error': 'start and end must be YYYY-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start > end or (end - start).days > 3660:
+            return Response(
+                {'error': 'start must not be after end, and the range is limited to 10 years'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        trend = get_compliance_trend(
+            org_id, framework_id, start, end,
+            domain_id=request.query_params.get('domain') or None
+        )
+        return Response({
+            'start': start,
+            'end': end,
+            'points': trend,
+        })
 
 
 class AuditViewSet(viewsets.ModelViewSet):
@@ -335,9 +403,25 @@ class GapAssessmentViewSet(viewsets.ModelViewSet):
         """
         Auto-calculate gap assessment from current control implementations.
         POST /api/compliance/gap-assessments/{id}/refresh_from_implementations/
+        
+        Large frameworks are refreshed in the background: the response is
+        202 with a task_id to poll via refresh_status. Pass ?async=true or
+        ?async=false to override.
         """
+        from compliance.utils import refresh_gap_assessment
+        
         assessment = self.get_object()
-        result = assessment.refresh_from_implementations()
+        run_async = request.query_params.get('async')
+        if run_async is not None:
+            run_async = run_async.lower() == 'true'
+        
+        task_id, result = refresh_gap_assessment(assessment, run_async=run_async)
+        if task_id:
+            return Response({
+                'message': 'Gap assessment refresh queued',
+                'task_id': task_id,
+                'status': 'PENDING',
+            }, status=status.HTTP_202_ACCEPTED)
         
         return Response({
             'message': 'Gap assessment refreshed from control implementations',
@@ -345,38 +429,94 @@ class GapAssessmentViewSet(viewsets.ModelViewSet):
             'compliance_status': assessment.compliance_status
         })
     
+    @action(detail=True, methods=['get'])
+    def refresh_status(self, request, pk=None):
+        """
+        Get the state of the latest background refresh.
+        GET /api/compliance/gap-assessments/{id}/refresh_status/
+        """
+        from celery.result import AsyncResult
+        
+        assessment = self.get_object()
+        if not assessment.refresh_task_id:
+            return Response({
+                'task_id': None,
+                'status': None,
+                'snapshot_taken_at': assessment.snapshot_taken_at,
+            })
+        
+        result = AsyncResult(assessment.refresh_task_id)
+        data = {
+            'task_id': assessment.refresh_task_id,
+            'status': result.state,
+            'snapshot_taken_at': assessment.snapshot_taken_at,
+        }
+        if result.successful():
+            data['compliance_status'] = assessment.compliance_status
+            data['updated_values'] = result.result
+        elif result.failed():
+            data['error'] = str(result.result)
+        return Response(data)
+    
+    @action(detail=True, methods=['get'])
+    def snapshot(self, request, pk=None):
+        """
+        Get the per-control snapshot captured by the last refresh.
+        GET /api/compliance/gap-assessments/{id}/snapshot/
+        """
+        assessment = self.get_object()
+        snapshots = assessment.snapshots.select_related('control', 'domain')
+        
+        snapshot_status = request.query_params.get('status')
+        if snapshot_status:
+            snapshots = snapshots.filter(status=snapshot_status)
+        
+        page = self.paginate_queryset(snapshots)
+        if page is not None:
+            return self.get_paginated_response(GapAssessmentSnapshotSerializer(page, many=True).data)
+        return Response(GapAssessmentSnapshotSerializer(snapshots, many=True).data)
+    
     @action(detail=True, methods=['get'])
     def gaps(self, request, pk=None):
         """
-        Get list of identified gaps for this assessment.
+        Get list of identified gaps for this assessment, most severe first.
         GET /api/compliance/gap-assessments/{id}/gaps/
+        
+        gap_type is not_assessed, not_implemented or planned (high),
+        partially_implemented or in_progress (medium), or maturity_gap (low).
+        
+        Query params:
+            severity: Optional 'high', 'medium' or 'low' to restrict the list
         """
+        from compliance.utils import GAP_SEVERITY_ORDER, count_gaps, iter_gaps
+        
         assessment = self.get_object()
-        gaps = assessment.get_gaps()
+        severity = request.query_params.get('severity')
+        if severity and severity not in GAP_SEVERITY_ORDER:
+            return Response(
+                {'error': f"severity must be one of {', '.join(GAP_SEVERITY_ORDER)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Group by severity
-        by_severity = {'high': [], 'medium': [], 'low': []}
-        for gap in gaps:
-            severity = gap.get('severity', 'low')
-            by_severity[severity].append(gap)
+        by_severity = count_gaps(assessment.organization_id, assessment.framework_id)
+        gaps = list(iter_gaps(
+            assessment.organization_id, assessment.framework_id, severity=severity
+        ))
         
         return Response({
-            'total_gaps': len(gaps),
-            'by_severity': {
-                'high': len(by_severity['high']),
-                'medium': len(by_severity['medium']),
-                'low': len(by_severity['low']),
-            },
+            'total_gaps': sum(by_severity.values()),
+            'by_severity': by_severity,
             'gaps': gaps,
         })
     
     @action(detail=False, methods=['get'])
+    @cached_response('compliance.dashboard')
     def dashboard(self, request):
         """
         Get compliance dashboard data for all frameworks.
         GET /api/compliance/gap-assessments/dashboard/
         """
-        from compliance.utils import calculate_compliance_score, calculate_maturity_score, check_evidence_status, get_audit_statistics
+        from compliance.utils import calculate_compliance_profile, check_evidence_status, get_audit_statistics
         from core.models import Organization
         
         org_id = request.query_params.get('organization')
@@ -384,14 +524,14 @@ class GapAssessmentViewSet(viewsets.ModelViewSet):
         if org_id:
             try:
                 org = Organization.objects.get(pk=org_id)
-                compliance_data = calculate_compliance_score(org)
-                maturity_data = calculate_maturity_score(org)
+                profile = calculate_compliance_profile(org)
                 evidence_status = check_evidence_status(org)
                 audit_stats = get_audit_statistics(org)
                 
                 return Response({
-                    'compliance': compliance_data,
-                    'maturity': maturity_data,
+                    'compliance': profile['compliance'],
+                    'maturity': profile['maturity'],
+                    'by_maturity_level': profile['by_maturity_level'],
                     'evidence': evidence_status,
                     'audits': audit_stats,
                 })
@@ -0,0 +1,141 @@
+"""
+Benchmark helpers used by the performance management commands.
+Measure query count and latency of API actions against seeded data.
+"""
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import urlencode
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+@contextmanager
+def rolled_back():
+    """
+    Run a block inside a transaction that is always rolled back.
+
+    Benchmarks seed large volumes of synthetic rows; nothing they create
+    should survive the run.
+    """
+    with transaction.atomic():
+        try:
+            yield
+        finally:
+            transaction.set_rollback(True)
+
+
+def create_benchmark_context():
+    """
+    Create a throwaway organization and superuser for a benchmark run.
+
+    Returns:
+        tuple: (Organization, User)
+    """
+    from django.contrib.auth import get_user_model
+    from core.models import Organization
+
+    suffix = uuid.uuid4().hex[:8]
+    organization = Organization.objects.create(
+        name=f'Benchmark {suffix}',
+        code=f'BENCH-{suffix}',
+    )
+    user = get_user_model().objects.create_superuser(
+        username=f'bench-{suffix}',
+        email=f'bench-{suffix}@example.com',
+        password=None,
+    )
+    return organization, user
+
+
+def measure(func, iterations=3):
+    """
+    Measure a callable's query count and latency.
+
+    The first call is a warm-up and is not recorded.
+
+    Args:
+        func: Zero-argument callable to measure
+        iterations: Number of timed calls
+
+    Returns:
+        dict: {
+            'queries': queries issued by one call,
+            'avg_ms': mean latency in milliseconds,
+            'min_ms': fastest call in milliseconds,
+        }
+    """
+    func()
+
+    timings = []
+    queries = 0
+    for _ in range(max(1, iterations)):
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries = len(ctx.captured_queries)
+
+    return {
+        'queries': queries,
+        'avg_ms': round(sum(timings) / len(timings), 1),
+        'min_ms': round(min(timings), 1),
+    }
+
+
+def measure_once(func):
+    """
+    Measure a single call's query count and latency.
+
+    For batch jobs whose first run changes the data they read (sweepers,
+    senders), where a warm-up call would leave nothing to measure.
+
+    Args:
+        func: Zero-argument callable to measure
+
+    Returns:
+        dict: {'queries', 'ms', 'result': the callable's return value}
+    """
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+    return {
+        'queries': len(ctx.captured_queries),
+        'ms': round(elapsed, 1),
+        'result': result,
+    }
+
+
+def call_action(viewset_class, action_name, user, params=None, method='get', data=None, **kwargs):
+    """
+    Invoke a viewset action in-process, bypassing URL routing.
+
+    Args:
+        viewset_class: DRF ViewSet class
+        action_name: Name of the action (e.g. 'list', 'executive_summary')
+        user: User to authenticate the request as
+        params: Query string parameters
+        method: HTTP method
+        data: Request body for write methods
+        **kwargs: URL kwargs such as pk for detail actions
+
+    Returns:
+        Response: Rendered DRF response (streaming responses are returned as is)
+    """
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    path = f'/?{urlencode(params)}' if params else '/'
+    factory = getattr(APIRequestFactory(), method)
+    if data is not None:
+        request = factory(path, data, format='json')
+    else:
+        request = factory(path)
+    force_authenticate(request, user=user)
+
+    view = viewset_class.as_view({method: action_name})
+    response = view(request, **kwargs)
+    if not response.streaming:
+        response.render()
+    return response
@@ -0,0 +1,229 @@
+"""
+Versioned response cache for read-heavy API actions.
+
+Cached responses are keyed by endpoint, organization, query parameters and
+visibility scope. Each key also embeds the current value of the version
+counters the endpoint depends on:
+
+- org:<id>   bumped when organization-scoped data changes (core.signals)
+- org:*      bumped on any organization-scoped change (used without ?organization=)
+- global     bumped when shared reference data changes (categories, frameworks, KPIs)
+- user:<id>  bumped when a user's personal data changes (tasks)
+
+The same counters version other process-local caches, e.g. the
+'workflow-templates' scope of compiled workflow templates (workflow/compiled.py),
+when the backend is shared (see is_shared_cache).
+
+A bump makes every dependent key unreachable and old entries simply age out
+of the backend. The backend is the cache alias named by RESPONSE_CACHE_ALIAS
+(locmem, file or Redis; see settings.CACHES).
+
+Invalidation is exact only when every web and Celery process shares the
+counters: Redis, or the file backend on a single host. With locmem (the
+default) a bump made by a Celery task or another web worker would never reach
+this process, so cached_response serves every request uncached unless the
+backend is shared.
+"""
+import functools
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+KEY_PREFIX = 'grc:response'
+VERSION_PREFIX = 'grc:version'
+STATS_PREFIX = 'grc:cache-stats'
+
+# Endpoints registered through cached_response, for hit/miss reporting
+CACHED_ENDPOINTS = set()
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+# Backends whose entries live in one process and are not seen by others
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared_cache():
+    """Whether version bumps reach every web and Celery process."""
+    alias = getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def _version_key(scope):
+    return f'{VERSION_PREFIX}:{scope}'
+
+
+def get_versions(scopes):
+    """
+    Read the current version of each scope in one cache round trip.
+
+    Missing versions are seeded with a timestamp rather than 0, so an
+    evicted counter can never come back with a value an older key used.
+    """
+    cache = get_cache()
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def bump_version(*scopes):
+    """
+    Invalidate every cached response that depends on the given scopes.
+
+    The bump is deferred until the surrounding transaction commits, so a
+    concurrent request cannot cache pre-commit data under the new version.
+
+    Args:
+        *scopes: Scope names such as 'org:3', 'org:*', 'global' or 'user:7'
+    """
+    def bump():
+        cache = get_cache()
+        for scope in scopes:
+            key = _version_key(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, time.time_ns(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def bump_organization(organization_id):
+    """Invalidate cached responses for one organization."""
+    bump_version(f'org:{organization_id}', 'org:*')
+
+
+def _record(endpoint, outcome):
+    cache = get_cache()
+    key = f'{STATS_PREFIX}:{endpoint}:{outcome}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_cache_stats():
+    """
+    Hit/miss counters for every cached endpoint.
+
+    Returns:
+        dict: {endpoint: {'hits': n, 'misses': n, 'hit_rate': pct}}
+    """
+    endpoints = sorted(CACHED_ENDPOINTS)
+    keys = [
+        f'{STATS_PREFIX}:{endpoint}:{outcome}'
+        for endpoint in endpoints
+        for outcome in ('hit', 'miss')
+    ]
+    values = get_cache().get_many(keys)
+
+    stats = {}
+    for endpoint in endpoints:
+        hits = values.get(f'{STATS_PREFIX}:{endpoint}:hit', 0)
+        misses = values.get(f'{STATS_PREFIX}:{endpoint}:miss', 0)
+        total = hits + misses
+        stats[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total * 100, 1) if total else 0,
+        }
+    return stats
+
+
+def build_cache_key(endpoint, request, per_user=False):
+    """
+    Build the versioned cache key for a request.
+
+    Args:
+        endpoint: Stable endpoint name, e.g. 'risk.matrix'
+        request: DRF request
+        per_user: Whether the response contains data private to the user
+
+    Returns:
+        str: Cache key
+    """
+    org_id = request.query_params.get('organization')
+    params = sorted(
+        (name, value)
+        for name in request.query_params
+        for value in request.query_params.getlist(name)
+    )
+    visibility = f'user:{request.user.pk}' if per_user else 'shared'
+
+    scopes = ['global', f'org:{org_id}' if org_id else 'org:*']
+    if per_user:
+        scopes.append(f'user:{request.user.pk}')
+
+    fingerprint = json.dumps({
+        'endpoint': endpoint,
+        'organization': org_id,
+        'params': params,
+        'visibility': visibility,
+        'versions': get_versions(scopes),
+    }, sort_keys=True, default=str)
+    digest = hashlib.sha256(fingerprint.encode()).hexdigest()
+    return f'{KEY_PREFIX}:{endpoint}:{digest}'
+
+
+def cached_response(endpoint, per_user=False, timeout=None):
+    """
+    Cache successful responses of a viewset action.
+
+    Responses pass through uncached when RESPONSE_CACHE_ENABLED is off or
+    the backend is process-local (see is_shared_cache).
+
+    Usage:
+        @action(detail=False, methods=['get'])
+        @cached_response('risk.matrix')
+        def matrix(self, request): ...
+
+    Args:
+        endpoint: Stable endpoint name used in keys and metrics
+        per_user: Key responses by requesting user as well
+        timeout: Seconds to keep entries (defaults to RESPONSE_CACHE_TIMEOUT);
+                 bounds staleness of date-dependent values such as 'overdue'
+    """
+    from rest_framework.response import Response
+
+    CACHED_ENDPOINTS.add(endpoint)
+
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(self, request, *args, **kwargs):
+            # A process-local backend would miss bumps made by other processes
+            if not getattr(settings, 'RESPONSE_CACHE_ENABLED', True) or not is_shared_cache():
+                return view_func(self, request, *args, **kwargs)
+
+            cache = get_cache()
+            key = build_cache_key(endpoint, request, per_user=per_user)
+            cached = cache.get(key)
+            if cached is not None:
+                _record(endpoint, 'hit')
+                return Response(cached)
+
+            _record(endpoint, 'miss')
+            response = view_func(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache_timeout = timeout
+                if cache_timeout is None:
+                    cache_timeout = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+                cache.set(key, response.data, cache_timeout)
+            return response
+        return wrapper
+    return decorator
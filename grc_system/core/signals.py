@@ -0,0 +1,124 @@
+"""
+Core app signals.
+Bumps response cache versions when cached source data changes, and the
+workflow template version when templates or steps change.
+"""
+from django.apps import apps
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+import logging
+
+from .cache import bump_organization, bump_version
+
+logger = logging.getLogger(__name__)
+
+
+# Models whose rows belong to one organization, with the attribute path
+# to the organization id
+ORGANIZATION_SCOPED_MODELS = {
+    'risk.Risk': 'organization_id',
+    'compliance.ControlImplementation': 'organization_id',
+    'compliance.Audit': 'organization_id',
+    'compliance.AuditFinding': 'audit.organization_id',
+    'compliance.Evidence': 'organization_id',
+    'governance.Policy': 'organization_id',
+    'bcm.BCPlan': 'organization_id',
+    'bcm.DisasterRecoveryPlan': 'organization_id',
+    'bcm.BusinessFunction': 'organization_id',
+    'bcm.BusinessImpactAnalysis': 'organization_id',
+    'bcm.BCMTest': 'organization_id',
+    'dashboard.KPIValue': 'organization_id',
+}
+
+# Many-to-many fields between rows of one organization; either side of
+# the relation has an organization_id
+ORGANIZATION_SCOPED_M2M = [
+    'bcm.BCPlan.covered_functions',
+]
+
+# Shared reference data used by every organization
+GLOBAL_MODELS = [
+    'risk.RiskCategory',
+    'compliance.ControlFramework',
+    'compliance.ControlDomain',
+    'compliance.Control',
+    'dashboard.KPI',
+]
+
+
+def _resolve(instance, path):
+    value = instance
+    for attr in path.split('.'):
+        value = getattr(value, attr, None)
+        if value is None:
+            return None
+    return value
+
+
+def invalidate_organization_cache(sender, instance, **kwargs):
+    """Bump the cache version of the organization that owns the row."""
+    path = ORGANIZATION_SCOPED_MODELS[sender._meta.label]
+    organization_id = _resolve(instance, path)
+    if organization_id is not None:
+        bump_organization(organization_id)
+
+
+def invalidate_organization_m2m_cache(sender, instance, action, **kwargs):
+    """Bump the organization cache version when a scoped relation changes."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        organization_id = getattr(instance, 'organization_id', None)
+        if organization_id is not None:
+            bump_organization(organization_id)
+
+
+def invalidate_global_cache(sender, instance, **kwargs):
+    """Bump the shared cache version."""
+    bump_version('global')
+
+
+def invalidate_workflow_templates(sender, instance, **kwargs):
+    """Bump the compiled workflow template version (workflow.compiled)."""
+    bump_version('workflow-templates')
+
+
+def capture_task_assignee(sender, instance, **kwargs):
+    """Remember a task's previous assignee so both users are invalidated."""
+    instance._cache_previous_assignee = None
+    if instance.pk and not instance._state.adding:
+        instance._cache_previous_assignee = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('assigned_to_id', flat=True).first()
+
+
+def invalidate_task_cache(sender, instance, **kwargs):
+    """Bump the cache version of the users a task is (or was) assigned to."""
+    user_ids = {
+        instance.assigned_to_id,
+        getattr(instance, '_cache_previous_assignee', None),
+    }
+    bump_version(*[f'user:{user_id}' for user_id in user_ids if user_id])
+
+
+for _label in ORGANIZATION_SCOPED_MODELS:
+    _model = apps.get_model(_label)
+    post_save.connect(invalidate_organization_cache, sender=_model, dispatch_uid=f'response_cache:{_label}:save')
+    post_delete.connect(invalidate_organization_cache, sender=_model, dispatch_uid=f'response_cache:{_label}:delete')
+
+for _label in ORGANIZATION_SCOPED_M2M:
+    _model_label, _field = _label.rsplit('.', 1)
+    _through = getattr(apps.get_model(_model_label), _field).through
+    m2m_changed.connect(invalidate_organization_m2m_cache, sender=_through, dispatch_uid=f'response_cache:{_label}:m2m')
+
+for _label in GLOBAL_MODELS:
+    _model = apps.get_model(_label)
+    post_save.connect(invalidate_global_cache, sender=_model, dispatch_uid=f'response_cache:{_label}:save')
+    post_delete.connect(invalidate_global_cache, sender=_model, dispatch_uid=f'response_cache:{_label}:delete')
+
+for _label in ['workflow.WorkflowTemplate', 'workflow.WorkflowStep']:
+    _model = apps.get_model(_label)
+    post_save.connect(invalidate_workflow_templates, sender=_model, dispatch_uid=f'workflow_templates:{_label}:save')
+    post_delete.connect(invalidate_workflow_templates, sender=_model, dispatch_uid=f'workflow_templates:{_label}:delete')
+
+_task = apps.get_model('workflow.Task')
+pre_save.connect(capture_task_assignee, sender=_task, dispatch_uid='response_cache:workflow.Task:pre_save')
+post_save.connect(invalidate_task_cache, sender=_task, dispatch_uid='response_cache:workflow.Task:save')
+post_delete.connect(invalidate_task_cache, sender=_task, dispatch_uid='response_cache:workflow.Task:delete')
@@ -0,0 +1,85 @@
+"""
+Core Utilities - Shared helpers used across GRC modules.
+
+Tree assembly:
+Self-referencing hierarchies (departments, business functions, risk and
+policy categories) are fetched with a single query and assembled in
+memory in O(n), instead of one children query per node.
+"""
+
+
+def build_tree(rows, serialize, parent_field='parent_id', root_id=None, max_depth=None):
+    """
+    Assemble flat rows into a nested tree.
+
+    Rows whose parent is missing from `rows` (no parent, or a parent
+    filtered out of the query) become roots. Assembly is iterative, so
+    deep hierarchies cannot hit the recursion limit.
+
+    Args:
+        rows: Iterable of dicts with 'id' and `parent_field`, in display order
+        serialize: Callable mapping a row to its node dict (without children)
+        parent_field: Key holding the parent id
+        root_id: Optional id whose subtree to return instead of the whole forest
+        max_depth: Optional number of levels to include (1 = roots only)
+
+    Returns:
+        list: Root nodes, each with a nested 'children' list
+    """
+    rows = list(rows)
+    ids = {row['id'] for row in rows}
+
+    children = {}
+    roots = []
+    for row in rows:
+        parent_id = row[parent_field]
+        if parent_id is None or parent_id not in ids:
+            roots.append(row)
+        else:
+            children.setdefault(parent_id, []).append(row)
+
+    if root_id is not None:
+        roots = [row for row in rows if row['id'] == root_id]
+
+    def make_node(row):
+        node = serialize(row)
+        node['children'] = []
+        return node
+
+    tree = [make_node(row) for row in roots]
+    stack = [(node, row, 1) for node, row in zip(tree, roots)]
+    while stack:
+        node, row, depth = stack.pop()
+        if max_depth is not None and depth >= max_depth:
+            continue
+        for child_row in children.get(row['id'], []):
+            child = make_node(child_row)
+            node['children'].append(child)
+            stack.append((child, child_row, depth + 1))
+
+    return tree
+
+
+def parse_tree_params(query_params):
+    """
+    Read the subtree root and depth limit of a tree endpoint.
+
+    Args:
+        query_params: Request query parameters ('root', 'depth')
+
+    Returns:
+        tuple: (root_id or None, max_depth or None)
+
+    Raises:
+        ValueError: If either parameter is not a positive integer
+    """
+    values = []
+    for name in ('root', 'depth'):
+        value = query_params.get(name)
+        if value in (None, ''):
+            values.append(None)
+            continue
+        if not value.isdigit() or int(value) < 1:
+            raise ValueError(f'{name} must be a positive integer')
+        values.append(int(value))
+    return tuple(values)
@@ -51,22 +51,38 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def tree(self, request):
-        """Get department hierarchy as tree."""
+        """
+        Get department hierarchy as tree.
+        
+        Query params:
+            organization: Optional organization filter
+            root: Optional department id whose subtree to return
+            depth: Optional number of levels to include
+        """
+        from core.utils import build_tree, parse_tree_params
+        
+        try:
+            root_id, max_depth = parse_tree_params(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         org_id = request.query_params.get('organization')
-        queryset = self.queryset.filter(parent__isnull=True)
+        departments = Department.objects.all()
         if org_id:
-            queryset = queryset.filter(organization_id=org_id)
-        
-        def build_tree(dept):
-            return {
-                'id': dept.id,
-                'name': dept.name,
-                'name_ar': dept.name_ar,
-                'code': dept.code,
-                'children': [build_tree(child) for child in dept.children.all()]
-            }
+            departments = departments.filter(organization_id=org_id)
         
-        tree = [build_tree(dept) for dept in queryset]
+        rows = departments.values('id', 'name', 'name_ar', 'code', 'parent_id')
+        tree = build_tree(
+            rows,
+            lambda row: {
+                'id': row['id'],
+                'name': row['name'],
+                'name_ar': row['name_ar'],
+                'code': row['code'],
+            },
+            root_id=root_id,
+            max_depth=max_depth,
+        )
         return Response(tree)
 
 
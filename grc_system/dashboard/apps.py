@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "dashboard"
+    
+    def ready(self):
+        # Import signals to register them
+        try:
+            import dashboard.signals  # noqa
+        except ImportError:
+            pass
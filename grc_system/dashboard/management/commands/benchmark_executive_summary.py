@@ -0,0 +1,64 @@
+"""
+Management command to benchmark the executive summary endpoint.
+Seeds synthetic risks in a rolled-back transaction and reports query count and latency.
+"""
+import random
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from core.benchmark import call_action, create_benchmark_context, measure, rolled_back
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks DashboardViewSet.executive_summary at increasing risk volumes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--risks', type=int, nargs='+', default=[10000, 100000],
+            help='Risk volumes to benchmark (default: 10000 100000)'
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=3,
+            help='Timed calls per volume (default: 3)'
+        )
+
+    def handle(self, *args, **options):
+        from risk.models import Risk
+        from dashboard.services import OrganizationSummaryService
+        from dashboard.views import DashboardViewSet
+
+        statuses = [choice[0] for choice in Risk.STATUS_CHOICES]
+        rng = random.Random(42)
+
+        # Measure the computation itself, not the response cache
+        with rolled_back(), override_settings(RESPONSE_CACHE_ENABLED=False):
+            organization, user = create_benchmark_context()
+            params = {'organization': organization.id}
+            seeded = 0
+
+            for volume in sorted(options['risks']):
+                batch = [
+                    Risk(
+                        organization=organization,
+                        risk_id=f'BENCH-{index:07d}',
+                        title=f'Benchmark risk {index}',
+                        status=rng.choice(statuses),
+                        inherent_likelihood=rng.randint(1, 5),
+                        inherent_impact=rng.randint(1, 5),
+                    )
+                    for index in range(seeded, volume)
+                ]
+                Risk.objects.bulk_create(batch, batch_size=5000)
+                seeded = max(seeded, volume)
+                # bulk_create bypasses the summary signals
+                OrganizationSummaryService.rebuild(organization.id)
+
+                result = measure(
+                    lambda: call_action(DashboardViewSet, 'executive_summary', user, params),
+                    iterations=options['iterations'],
+                )
+                self.stdout.write(self.style.SUCCESS(
+                    f"{volume:>7} risks: {result['queries']} queries, "
+                    f"avg {result['avg_ms']} ms, min {result['min_ms']} ms"
+                ))
@@ -0,0 +1,40 @@
+"""
+Management command to rebuild or verify the materialized organization summary.
+"""
+from django.core.management.base import BaseCommand
+
+from dashboard.services import OrganizationSummaryService
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds OrganizationSummary counters from source tables, or checks them with --check'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization', type=int,
+            help='Only process this organization ID'
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Report counters that differ from the source tables without rebuilding'
+        )
+
+    def handle(self, *args, **options):
+        organization_id = options.get('organization')
+
+        if options['check']:
+            mismatches = OrganizationSummaryService.check(organization_id)
+            for mismatch in mismatches:
+                self.stdout.write(self.style.WARNING(
+                    f"Organization {mismatch['organization']} "
+                    f"{mismatch['module']}.{mismatch['metric']}: "
+                    f"stored {mismatch['stored']}, actual {mismatch['actual']}"
+                ))
+            if mismatches:
+                self.stdout.write(self.style.ERROR(f'{len(mismatches)} counter(s) out of sync'))
+            else:
+                self.stdout.write(self.style.SUCCESS('Organization summary is consistent'))
+            return
+
+        count = OrganizationSummaryService.rebuild(organization_id)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt summary for {count} organization(s)'))
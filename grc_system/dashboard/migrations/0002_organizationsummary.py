@@ -0,0 +1,32 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_create_departments'),
+        ('dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('module', models.CharField(choices=[('meta', 'Metadata'), ('risks', 'Risks'), ('compliance', 'Compliance'), ('findings', 'Audit Findings'), ('policies', 'Policies'), ('bcm', 'BCM'), ('audits', 'Audits')], max_length=20, verbose_name='Module')),
+                ('metric', models.CharField(max_length=100, verbose_name='Metric')),
+                ('value', models.IntegerField(default=0, verbose_name='Value')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='summary_counters', to='core.organization', verbose_name='Organization')),
+            ],
+            options={
+                'verbose_name': 'Organization Summary',
+                'verbose_name_plural': 'Organization Summaries',
+                'ordering': ['organization', 'module', 'metric'],
+                'unique_together': {('organization', 'module', 'metric')},
+            },
+        ),
+    ]
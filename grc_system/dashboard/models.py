@@ -359,3 +359,43 @@ class KPIValue(models.Model):
     
     def __str__(self):
         return f"{self.kpi.name}: {self.value} ({self.period_date})"
+
+
+class OrganizationSummary(models.Model):
+    """
+    ملخص المنظمة - Materialized dashboard counter for an organization.
+
+    One row per (organization, module, metric). Rows are maintained
+    incrementally by dashboard.signals and can be rebuilt with the
+    rebuild_organization_summary management command.
+    """
+    MODULE_CHOICES = [
+        ('meta', _('Metadata')),
+        ('risks', _('Risks')),
+        ('compliance', _('Compliance')),
+        ('findings', _('Audit Findings')),
+        ('policies', _('Policies')),
+        ('bcm', _('BCM')),
+        ('audits', _('Audits')),
+    ]
+    
+    organization = models.ForeignKey(
+        'core.Organization', 
+        on_delete=models.CASCADE,
+        related_name='summary_counters',
+        verbose_name=_('Organization')
+    )
+    module = models.CharField(_('Module'), max_length=20, choices=MODULE_CHOICES)
+    metric = models.CharField(_('Metric'), max_length=100)
+    value = models.IntegerField(_('Value'), default=0)
+    
+    updated_at = models.DateTimeField(_('Updated At'), auto_now=True)
+    
+    class Meta:
+        verbose_name = _('Organization Summary')
+        verbose_name_plural = _('Organization Summaries')
+        ordering = ['organization', 'module', 'metric']
+        unique_together = ['organization', 'module', 'metric']
+    
+    def __str__(self):
+        return f"{self.organization.name} {self.module}.{self.metric}: {self.value}"
@@ -0,0 +1,393 @@
+"""
+Dashboard services for the GRC system.
+Maintains the materialized per-organization summary counters.
+"""
+import logging
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, F, OuterRef, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _risk_metrics(row):
+    score = row['inherent_likelihood'] * row['inherent_impact']
+    return [
+        'total',
+        f"status:{row['status']}",
+        f"type:{row['risk_type']}",
+        f"score:{score}",
+    ]
+
+
+def _implementation_metrics(row):
+    return [f"status_maturity:{row['status']}:{row['maturity_level']}"]
+
+
+def _finding_metrics(row):
+    return [f"status_type:{row['status']}:{row['finding_type']}"]
+
+
+def _status_metrics(prefix=''):
+    def metrics(row):
+        return [f'{prefix}total', f"{prefix}status:{row['status']}"]
+    return metrics
+
+
+def _function_metrics(row):
+    return ['function:total', f"function:criticality:{row['criticality']}"]
+
+
+# Each source model feeds one module. 'metrics' maps a row of the tracked
+# fields to the counter keys it contributes one unit to.
+SUMMARY_SOURCES = [
+    {
+        'model': 'risk.Risk',
+        'module': 'risks',
+        'organization': 'organization_id',
+        'fields': ['status', 'risk_type', 'inherent_likelihood', 'inherent_impact'],
+        'metrics': _risk_metrics,
+    },
+    {
+        'model': 'compliance.ControlImplementation',
+        'module': 'compliance',
+        'organization': 'organization_id',
+        'fields': ['status', 'maturity_level'],
+        'metrics': _implementation_metrics,
+    },
+    {
+        'model': 'compliance.AuditFinding',
+        'module': 'findings',
+        'organization': 'audit__organization_id',
+        'fields': ['status', 'finding_type'],
+        'metrics': _finding_metrics,
+    },
+    {
+        'model': 'compliance.Audit',
+        'module': 'audits',
+        'organization': 'organization_id',
+        'fields': ['status'],
+        'metrics': _status_metrics(),
+    },
+    {
+        'model': 'governance.Policy',
+        'module': 'policies',
+        'organization': 'organization_id',
+        'fields': ['status'],
+        'metrics': _status_metrics(),
+    },
+    {
+        'model': 'bcm.BCPlan',
+        'module': 'bcm',
+        'organization': 'organization_id',
+        'fields': ['status'],
+        'metrics': _status_metrics('bc_plan:'),
+    },
+    {
+        'model': 'bcm.DisasterRecoveryPlan',
+        'module': 'bcm',
+        'organization': 'organization_id',
+        'fields': ['status'],
+        'metrics': _status_metrics('dr_plan:'),
+    },
+    {
+        'model': 'bcm.BusinessFunction',
+        'module': 'bcm',
+        'organization': 'organization_id',
+        'fields': ['criticality'],
+        'metrics': _function_metrics,
+    },
+    {
+        'model': 'bcm.BCMTest',
+        'module': 'bcm',
+        'organization': 'organization_id',
+        'fields': ['status'],
+        'metrics': _status_metrics('test:'),
+    },
+]
+
+# Marker written by a full rebuild; organizations without it are rebuilt on read
+BUILT_MARKER = ('meta', 'built')
+
+
+class OrganizationSummaryService:
+    """
+    Service class for the materialized OrganizationSummary counters.
+    """
+
+    @classmethod
+    def get_source(cls, model):
+        """Return the SUMMARY_SOURCES entry for a model class, if tracked."""
+        for source in SUMMARY_SOURCES:
+            if apps.get_model(source['model']) is model:
+                return source
+        return None
+
+    @classmethod
+    def snapshot(cls, source, pk):
+        """
+        Read the tracked fields of one row from the database.
+
+        Returns:
+            tuple: (organization_id, [metric, ...]) or None if the row is gone
+        """
+        model = apps.get_model(source['model'])
+        row = model.objects.filter(pk=pk).values(
+            source['organization'], *source['fields']
+        ).first()
+        if row is None or row[source['organization']] is None:
+            return None
+        return row[source['organization']], source['metrics'](row)
+
+    @classmethod
+    def record_change(cls, source, before, after):
+        """
+        Apply the difference between two snapshots to the counters.
+
+        Args:
+            source: SUMMARY_SOURCES entry
+            before: Snapshot prior to the change (None on create)
+            after: Snapshot after the change (None on delete)
+        """
+        cls.record_changes(source, [(before, after)])
+
+    @classmethod
+    def record_changes(cls, source, changes):
+        """
+        Apply many snapshot changes with one update per counter touched.
+
+        For bulk_create() and queryset update(), which bypass the signals.
+
+        Args:
+            source: SUMMARY_SOURCES entry
+            changes: Iterable of (before, after) snapshot pairs
+        """
+        deltas = Counter()
+        for before, after in changes:
+            if before:
+                org_id, metrics = before
+                for metric in metrics:
+                    deltas[(org_id, metric)] -= 1
+            if after:
+                org_id, metrics = after
+                for metric in metrics:
+                    deltas[(org_id, metric)] += 1
+
+        for (org_id, metric), delta in deltas.items():
+            if delta:
+                cls._increment(org_id, source['module'], metric, delta)
+
+    @classmethod
+    def _increment(cls, organization_id, module, metric, delta):
+        """Atomically add delta to one counter, creating it if needed."""
+        from .models import OrganizationSummary
+
+        counters = OrganizationSummary.objects.filter(
+            organization_id=organization_id, module=module, metric=metric
+        )
+        if counters.update(value=F('value') + delta, updated_at=timezone.now()):
+            return
+
+        # A missing counter can only be created by a positive delta; a
+        # negative one means the row was never counted (or the organization
+        # is being deleted) and the next rebuild settles it.
+        if delta < 0:
+            return
+
+        from core.models import Organization
+
+        try:
+            with transaction.atomic():
+                # Wait out a rebuild of this organization, which holds the
+                # lock, so the new counter lands on top of its result
+                list(Organization.objects.select_for_update().filter(
+                    pk=organization_id
+                ).values_list('pk', flat=True))
+                OrganizationSummary.objects.create(
+                    organization_id=organization_id, module=module, metric=metric, value=delta
+                )
+        except IntegrityError:
+            counters.update(value=F('value') + delta, updated_at=timezone.now())
+
+    @classmethod
+    def compute(cls, organization_id=None):
+        """
+        Compute all counters from the source tables.
+
+        One grouped query per source model.
+
+        Args:
+            organization_id: Optional organization to scope to
+
+        Returns:
+            dict: {organization_id: {(module, metric): value}}
+        """
+        result = defaultdict(Counter)
+
+        for source in SUMMARY_SOURCES:
+            model = apps.get_model(source['model'])
+            org_field = source['organization']
+            rows = model.objects.all()
+            if organization_id:
+                rows = rows.filter(**{org_field: organization_id})
+            rows = rows.values(org_field, *source['fields']).annotate(
+                summary_count=Count('id')
+            ).order_by()
+
+            for row in rows:
+                org_id = row[org_field]
+                if org_id is None:
+                    continue
+                for metric in source['metrics'](row):
+                    result[org_id][(source['module'], metric)] += row['summary_count']
+
+        return result
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, organization_id=None, unbuilt_only=False):
+        """
+        Rebuild counters from scratch.
+
+        The organization rows are locked first, so rebuilds of the same
+        organization run one after another. The counters are deleted before
+        compute() reads the source tables: an increment committed earlier is
+        part of the computation, and one still in flight waits on the deleted
+        row (or on the organization lock, to create a counter) and is applied
+        on top of the rebuilt value.
+
+        Args:
+            organization_id: Optional organization to rebuild; all if omitted
+            unbuilt_only: Skip organizations built while waiting for the lock
+
+        Returns:
+            int: Number of organizations rebuilt
+        """
+        from core.models import Organization
+        from .models import OrganizationSummary
+
+        org_ids = Organization.objects.select_for_update().order_by('pk')
+        if organization_id:
+            org_ids = org_ids.filter(pk=organization_id)
+        org_ids = list(org_ids.values_list('id', flat=True))
+
+        if unbuilt_only:
+            module, metric = BUILT_MARKER
+            built = set(OrganizationSummary.objects.filter(
+                organization_id__in=org_ids, module=module, metric=metric
+            ).values_list('organization_id', flat=True))
+            org_ids = [org_id for org_id in org_ids if org_id not in built]
+            if not org_ids:
+                return 0
+
+        existing = OrganizationSummary.objects.all()
+        if organization_id:
+            existing = existing.filter(organization_id=organization_id)
+        existing.delete()
+
+        computed = cls.compute(organization_id)
+
+        rows = []
+        for org_id in org_ids:
+            counters = computed.get(org_id, {})
+            for (module, metric), value in counters.items():
+                if value:
+                    rows.append(OrganizationSummary(
+                        organization_id=org_id, module=module, metric=metric, value=value
+                    ))
+            module, metric = BUILT_MARKER
+            rows.append(OrganizationSummary(
+                organization_id=org_id, module=module, metric=metric, value=1
+            ))
+
+        OrganizationSummary.objects.bulk_create(rows, batch_size=1000)
+        logger.info(f"Rebuilt organization summary for {len(org_ids)} organization(s)")
+        return len(org_ids)
+
+    @classmethod
+    def check(cls, organization_id=None):
+        """
+        Compare stored counters with a fresh computation.
+
+        Args:
+            organization_id: Optional organization to check
+
+        Returns:
+            list: Mismatches as dicts with organization, module, metric,
+                  stored and actual values
+        """
+        from .models import OrganizationSummary
+
+        stored = OrganizationSummary.objects.exclude(module=BUILT_MARKER[0])
+        if organization_id:
+            stored = stored.filter(organization_id=organization_id)
+
+        stored_map = defaultdict(Counter)
+        for org_id, module, metric, value in stored.values_list(
+            'organization_id', 'module', 'metric', 'value'
+        ):
+            stored_map[org_id][(module, metric)] = value
+
+        computed = cls.compute(organization_id)
+
+        mismatches = []
+        for org_id in set(stored_map) | set(computed):
+            keys = set(stored_map[org_id]) | set(computed.get(org_id, {}))
+            for module, metric in sorted(keys):
+                stored_value = stored_map[org_id][(module, metric)]
+                actual_value = computed.get(org_id, Counter())[(module, metric)]
+                if stored_value != actual_value:
+                    mismatches.append({
+                        'organization': org_id,
+                        'module': module,
+                        'metric': metric,
+                        'stored': stored_value,
+                        'actual': actual_value,
+                    })
+        return mismatches
+
+    @classmethod
+    def get_counters(cls, organization_id=None):
+        """
+        Read all counters for an organization (or summed across all).
+
+        Organizations that were never built are rebuilt first; concurrent
+        first reads wait for a single rebuild.
+
+        Args:
+            organization_id: Optional organization; all organizations if omitted
+
+        Returns:
+            dict: {module: Counter({metric: value})}
+        """
+        from core.models import Organization
+        from .models import OrganizationSummary
+
+        module, metric = BUILT_MARKER
+        unbuilt = Organization.objects.exclude(Exists(
+            OrganizationSummary.objects.filter(
+                organization=OuterRef('pk'), module=module, metric=metric
+            )
+        ))
+        if organization_id:
+            unbuilt = unbuilt.filter(pk=organization_id)
+        for org_id in unbuilt.values_list('id', flat=True):
+            cls.rebuild(org_id, unbuilt_only=True)
+
+        counters = OrganizationSummary.objects.exclude(module=module)
+        if organization_id:
+            rows = counters.filter(organization_id=organization_id).values_list(
+                'module', 'metric', 'value'
+            )
+        else:
+            rows = counters.values_list('module', 'metric').annotate(
+                total=Sum('value')
+            ).order_by()
+
+        result = defaultdict(Counter)
+        for module, metric, value in rows:
+            result[module][metric] = value
+        return result
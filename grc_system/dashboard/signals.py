@@ -0,0 +1,51 @@
+"""
+Dashboard app signals.
+Keeps the materialized OrganizationSummary counters in step with source models.
+"""
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+import logging
+
+from .services import SUMMARY_SOURCES, OrganizationSummaryService
+
+logger = logging.getLogger(__name__)
+
+
+def capture_summary_state(sender, instance, **kwargs):
+    """Remember the counted state of a row before it changes."""
+    if instance.pk is None or instance._state.adding:
+        instance._summary_before = None
+        return
+    source = OrganizationSummaryService.get_source(sender)
+    instance._summary_before = OrganizationSummaryService.snapshot(source, instance.pk)
+
+
+def update_summary_on_save(sender, instance, **kwargs):
+    """
+    Apply the change to the summary counters.
+
+    The new state is read back from the database so that status changes
+    made with queryset.update() by earlier post_save receivers (workflow
+    auto-submission) are counted too.
+    """
+    source = OrganizationSummaryService.get_source(sender)
+    before = getattr(instance, '_summary_before', None)
+    after = OrganizationSummaryService.snapshot(source, instance.pk)
+    OrganizationSummaryService.record_change(source, before, after)
+    instance._summary_before = after
+
+
+def update_summary_on_delete(sender, instance, **kwargs):
+    """Remove a deleted row from the summary counters."""
+    source = OrganizationSummaryService.get_source(sender)
+    before = getattr(instance, '_summary_before', None)
+    OrganizationSummaryService.record_change(source, before, None)
+
+
+for _source in SUMMARY_SOURCES:
+    _model = apps.get_model(_source['model'])
+    _uid = f"organization_summary:{_source['model']}"
+    pre_save.connect(capture_summary_state, sender=_model, dispatch_uid=f'{_uid}:pre_save')
+    post_save.connect(update_summary_on_save, sender=_model, dispatch_uid=f'{_uid}:post_save')
+    pre_delete.connect(capture_summary_state, sender=_model, dispatch_uid=f'{_uid}:pre_delete')
+    post_delete.connect(update_summary_on_delete, sender=_model, dispatch_uid=f'{_uid}:post_delete')
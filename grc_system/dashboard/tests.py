@@ -1,3 +1,121 @@
+"""
+Tests for the materialized OrganizationSummary counters.
+
+Counters maintained by the model signals (and by bulk paths that apply
+their deltas directly) are compared with a full rebuild.
+"""
+import random
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from bcm.models import BCMTest, BCPlan, BusinessFunction, DisasterRecoveryPlan
+from compliance.models import (
+    Audit, AuditFinding, Control, ControlDomain, ControlFramework, ControlImplementation
+)
+from core.models import Organization
+from governance.models import Policy
+from risk.models import Risk
+
+from .models import OrganizationSummary
+from .services import BUILT_MARKER, OrganizationSummaryService
+
+
+class OrganizationSummaryTests(TestCase):
+    """Incremental counters against OrganizationSummaryService.rebuild()."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Summary test', code='SUMMARY')
+        # Build first, so every later change goes through the increments
+        OrganizationSummaryService.get_counters(self.organization.pk)
+
+    def stored_counters(self):
+        return dict(
+            ((module, metric), value)
+            for module, metric, value in OrganizationSummary.objects.filter(
+                organization=self.organization
+            ).exclude(module=BUILT_MARKER[0]).values_list('module', 'metric', 'value')
+            if value
+        )
+
+    def assertMatchesRebuild(self):
+        self.assertEqual(OrganizationSummaryService.check(self.organization.pk), [])
+        incremental = self.stored_counters()
+        OrganizationSummaryService.rebuild(self.organization.pk)
+        self.assertEqual(incremental, self.stored_counters())
+
+    def test_saves_and_deletes_match_rebuild(self):
+        rng = random.Random(5)
+        organization = self.organization
+        framework = ControlFramework.objects.create(name='Summary framework', code='SUM', version='1')
+        domain = ControlDomain.objects.create(framework=framework, code='D1', name='Domain', order=1)
+        audit = Audit.objects.create(
+            organization=organization, audit_id='AUD-1', title='Audit',
+            planned_start_date=date(2026, 1, 1), planned_end_date=date(2026, 2, 1)
+        )
+        plan = BCPlan.objects.create(organization=organization, plan_id='BCP-1', title='Plan', status='draft')
+
+        rows = []
+        for index in range(8):
+            control = Control.objects.create(domain=domain, control_id=f'C-{index}', title='Control', order=index)
+            rows += [
+                Risk.objects.create(
+                    organization=organization, risk_id=f'R-{index}', title='Risk', description='Risk',
+                    inherent_likelihood=rng.randint(1, 5), inherent_impact=rng.randint(1, 5)
+                ),
+                ControlImplementation.objects.create(
+                    organization=organization, control=control, status='not_implemented'
+                ),
+                AuditFinding.objects.create(audit=audit, finding_id=f'F-{index}', title='Finding'),
+                Policy.objects.create(organization=organization, policy_id=f'P-{index}', title='Policy'),
+                BusinessFunction.objects.create(organization=organization, function_id=f'BF-{index}', name='Function'),
+                DisasterRecoveryPlan.objects.create(organization=organization, plan_id=f'DR-{index}', title='DR plan'),
+                BCMTest.objects.create(
+                    organization=organization, test_id=f'T-{index}', title='Test', bc_plan=plan,
+                    scenario='Scenario', scheduled_date=date(2026, 6, 1)
+                ),
+            ]
+        self.assertMatchesRebuild()
+
+        # Change a tracked field through save(), then delete some rows
+        changes = {
+            Risk: ('status', ['assessed', 'treating', 'closed']),
+            ControlImplementation: ('status', ['implemented', 'planned', 'in_progress']),
+            AuditFinding: ('status', ['in_progress', 'closed']),
+            Policy: ('status', ['approved', 'published']),
+            BusinessFunction: ('criticality', ['critical', 'essential']),
+            DisasterRecoveryPlan: ('status', ['approved', 'active']),
+            BCMTest: ('status', ['in_progress', 'completed']),
+        }
+        for row in rng.sample(rows, 30):
+            field, values = changes[type(row)]
+            setattr(row, field, rng.choice(values))
+            row.save()
+        plan.status = 'active'
+        plan.save()
+        for row in rng.sample(rows, 15):
+            row.delete()
+        self.assertMatchesRebuild()
+
+    def test_scheduled_tests_are_counted(self):
+        from bcm.scheduling import create_scheduled_tests, plan_test_calendar
+
+        for kind, model in (('BCP', BCPlan), ('DRP', DisasterRecoveryPlan)):
+            for index in range(2):
+                model.objects.create(
+                    organization=self.organization, plan_id=f'{kind}-{index}', title='Plan', status='active'
+                )
+        calendar = plan_test_calendar(self.organization.pk, date(2026, 1, 4))
+        tests = create_scheduled_tests(self.organization.pk, calendar['scheduled'])
+
+        self.assertEqual(len(tests), 4)
+        self.assertEqual(self.stored_counters()[('bcm', 'test:status:planned')], 4)
+        self.assertMatchesRebuild()
+
+    def test_lazy_rebuild_builds_once(self):
+        Risk.objects.create(organization=self.organization, risk_id='R-1', title='Risk', description='Risk')
+        OrganizationSummary.objects.filter(organization=self.organization).delete()
+
+        counters = OrganizationSummaryService.get_counters(self.organization.pk)
+        self.assertEqual(counters['risks']['total'], 1)
+        self.assertEqual(OrganizationSummaryService.rebuild(self.organization.pk, unbuilt_only=True), 0)
@@ -0,0 +1,307 @@
+"""
+Dashboard Utilities - Executive summary aggregation.
+
+Executive summary blocks are built from two sources:
+1. Materialized OrganizationSummary counters (see dashboard.services),
+   read with a single query per request
+2. Live conditional-aggregate queries only for counters that depend on
+   the current date (overdue findings, expiring policies) or on the
+   requesting user (tasks)
+
+Risk level buckets (inherent score = likelihood x impact):
+- Critical: 20-25
+- High: 12-19
+- Medium: 6-11
+- Low: 1-5
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+
+# Lower bound of each inherent score bucket, highest first
+RISK_SCORE_BUCKETS = [
+    ('critical', 20),
+    ('high', 12),
+    ('medium', 6),
+    ('low', 0),
+]
+
+OPEN_FINDING_STATUSES = ['open', 'in_progress']
+OPEN_TASK_STATUSES = ['pending', 'in_progress']
+POLICY_EXPIRY_WINDOW_DAYS = 30
+
+
+def _scoped(queryset, organization_id, field='organization_id'):
+    """Restrict a queryset to one organization when an id is given."""
+    if organization_id:
+        return queryset.filter(**{field: organization_id})
+    return queryset
+
+
+def risk_level_counts(score_histogram):
+    """
+    Fold an inherent score histogram into risk level buckets.
+
+    Args:
+        score_histogram: dict {score: count}
+
+    Returns:
+        dict: {'critical': n, 'high': n, 'medium': n, 'low': n}
+    """
+    counts = {level: 0 for level, _ in RISK_SCORE_BUCKETS}
+    for score, count in score_histogram.items():
+        for level, lower in RISK_SCORE_BUCKETS:
+            if score >= lower:
+                counts[level] += count
+                break
+    return counts
+
+
+def group_counters(counters, prefix):
+    """Collect counters named '<prefix>:<key>' into {key: value}."""
+    prefix = f'{prefix}:'
+    return {
+        metric[len(prefix):]: value
+        for metric, value in counters.items()
+        if metric.startswith(prefix) and value
+    }
+
+
+def get_risk_summary(counters):
+    """
+    Build the risk block from summary counters.
+
+    Args:
+        counters: 'risks' module counters
+
+    Returns:
+        dict: total, per-level counts, treating count and by_level
+    """
+    scores = {int(score): count for score, count in group_counters(counters, 'score').items()}
+    by_level = risk_level_counts(scores)
+    return {
+        'total': counters['total'],
+        **by_level,
+        'treating': counters['status:treating'],
+        'by_level': by_level,
+    }
+
+
+def implementation_breakdown(counters):
+    """
+    Split status x maturity counters into separate distributions.
+
+    Args:
+        counters: 'compliance' module counters
+
+    Returns:
+        tuple: (by_status dict, by_maturity dict of all implementations,
+                by_maturity dict excluding not_applicable)
+    """
+    by_status = Counter()
+    by_maturity = Counter()
+    applicable_maturity = Counter()
+    for key, value in group_counters(counters, 'status_maturity').items():
+        impl_status, level = key.rsplit(':', 1)
+        by_status[impl_status] += value
+        by_maturity[int(level)] += value
+        if impl_status != 'not_applicable':
+            applicable_maturity[int(level)] += value
+    return dict(by_status), dict(by_maturity), dict(applicable_maturity)
+
+
+def average_maturity(by_maturity):
+    """Mean maturity level of a {level: count} distribution, or None if empty."""
+    total = sum(by_maturity.values())
+    if not total:
+        return None
+    return sum(level * count for level, count in by_maturity.items()) / total
+
+
+def get_compliance_summary(counters):
+    """
+    Build the compliance block from summary counters.
+
+    Args:
+        counters: 'compliance' module counters
+
+    Returns:
+        dict: Implementation counts, compliance rate and average maturity
+    """
+    by_status, by_maturity, _ = implementation_breakdown(counters)
+    total = sum(by_status.values())
+    implemented = by_status.get('implemented', 0)
+    compliance_rate = (implemented / total * 100) if total > 0 else 0
+
+    return {
+        'total_controls': total,
+        'implemented': implemented,
+        'partial': by_status.get('partially_implemented', 0),
+        'not_implemented': by_status.get('not_implemented', 0) + by_status.get('not_applicable', 0),
+        'compliance_rate': round(compliance_rate, 1),
+        'avg_maturity': average_maturity(by_maturity) or 0,
+    }
+
+
+def get_findings_summary(counters, organization_id=None, today=None):
+    """
+    Build the audit findings block.
+
+    Open and major non-conformity counts come from the summary counters;
+    the overdue count depends on today's date and is queried live.
+
+    Args:
+        counters: 'findings' module counters
+        organization_id: Optional organization to scope to
+        today: Reference date for overdue checks (defaults to today)
+
+    Returns:
+        dict: Open, overdue and open major non-conformity counts
+    """
+    from compliance.models import AuditFinding
+
+    today = today or timezone.now().date()
+    total_open = 0
+    major_nc = 0
+    for key, value in group_counters(counters, 'status_type').items():
+        finding_status, finding_type = key.split(':', 1)
+        if finding_status in OPEN_FINDING_STATUSES:
+            total_open += value
+            if finding_type == 'major_nc':
+                major_nc += value
+
+    findings = _scoped(
+        AuditFinding.objects.all(), organization_id, field='audit__organization_id'
+    )
+    overdue = findings.filter(
+        status__in=OPEN_FINDING_STATUSES, due_date__lt=today
+    ).count()
+
+    return {
+        'total_open': total_open,
+        'overdue': overdue,
+        'major_nc': major_nc,
+    }
+
+
+def get_tasks_summary(user, now=None):
+    """
+    Summarize a user's assigned tasks in a single query.
+
+    Args:
+        user: User whose tasks are counted
+        now: Reference time for overdue checks (defaults to now)
+
+    Returns:
+        dict: Pending, in-progress and overdue counts
+    """
+    from workflow.models import Task
+
+    now = now or timezone.now()
+    return Task.objects.filter(assigned_to=user).aggregate(
+        pending=Count('id', filter=Q(status='pending')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        overdue=Count('id', filter=Q(status__in=OPEN_TASK_STATUSES, due_date__lt=now)),
+    )
+
+
+def get_policies_summary(counters, organization_id=None, today=None):
+    """
+    Build the policies block.
+
+    Status counts come from the summary counters; policies due for review
+    within 30 days depend on today's date and are queried live.
+
+    Args:
+        counters: 'policies' module counters
+        organization_id: Optional organization to scope to
+        today: Reference date for the expiry window (defaults to today)
+
+    Returns:
+        dict: Status counts and policies due for review within 30 days
+    """
+    from governance.models import Policy
+
+    today = today or timezone.now().date()
+    expiring_soon = _scoped(Policy.objects.all(), organization_id).filter(
+        review_date__lte=today + timedelta(days=POLICY_EXPIRY_WINDOW_DAYS)
+    ).count()
+
+    return {
+        'total': counters['total'],
+        'published': counters['status:published'],
+        'draft': counters['status:draft'],
+        'pending_review': counters['status:pending_review'],
+        'expiring_soon': expiring_soon,
+    }
+
+
+def get_bcm_summary(counters):
+    """
+    Build the BCM block from summary counters.
+
+    Args:
+        counters: 'bcm' module counters
+
+    Returns:
+        dict: Plan, function and test counts
+    """
+    return {
+        'bc_plans': counters['bc_plan:total'],
+        'bc_plans_active': counters['bc_plan:status:active'],
+        'dr_plans': counters['dr_plan:total'],
+        'dr_plans_active': counters['dr_plan:status:active'],
+        'business_functions': counters['function:total'],
+        'critical_functions': counters['function:criticality:critical'],
+        'tests_completed': counters['test:status:completed'],
+        'tests_planned': counters['test:status:planned'],
+    }
+
+
+def get_audits_summary(counters):
+    """
+    Build the audits block from summary counters.
+
+    Args:
+        counters: 'audits' module counters
+
+    Returns:
+        dict: Total, planned, in-progress and completed counts
+    """
+    return {
+        'total': counters['total'],
+        'planned': counters['status:planned'],
+        'in_progress': counters['status:in_progress'],
+        'completed': counters['status:completed'],
+    }
+
+
+def get_executive_summary(user, organization_id=None):
+    """
+    Build the complete executive summary.
+
+    Args:
+        user: Requesting user (for the personal task block)
+        organization_id: Optional organization to scope to
+
+    Returns:
+        dict: risks, compliance, findings, tasks, policies, bcm and audits blocks
+    """
+    from .services import OrganizationSummaryService
+
+    counters = OrganizationSummaryService.get_counters(organization_id)
+    now = timezone.now()
+    today = now.date()
+
+    return {
+        'risks': get_risk_summary(counters['risks']),
+        'compliance': get_compliance_summary(counters['compliance']),
+        'findings': get_findings_summary(counters['findings'], organization_id, today=today),
+        'tasks': get_tasks_summary(user, now=now),
+        'policies': get_policies_summary(counters['policies'], organization_id, today=today),
+        'bcm': get_bcm_summary(counters['bcm']),
+        'audits': get_audits_summary(counters['audits']),
+    }
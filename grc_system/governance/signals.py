@@ -54,7 +54,7 @@ def trigger_policy_workflow(sender, instance, created, **kwargs):
     - If created by Manager: auto-approve
     """
     from workflow.services import WorkflowService
-    from workflow.models import WorkflowTemplate
+    from workflow.compiled import get_compiled_template
     
     # Skip if no created_by (bulk operations, migrations, etc.)
     if not instance.created_by:
@@ -74,10 +74,7 @@ def trigger_policy_workflow(sender, instance, created, **kwargs):
                     instance.refresh_from_db()
                 
                 # Check if workflow template exists
-                template = WorkflowTemplate.objects.filter(
-                    code='content-approval',
-                    is_active=True
-                ).first()
+                template = get_compiled_template('content-approval')
                 
                 if template:
                     # Check if workflow already exists
@@ -111,7 +108,7 @@ def trigger_procedure_workflow(sender, instance, created, **kwargs):
     Trigger approval workflow when a procedure is created.
     """
     from workflow.services import WorkflowService
-    from workflow.models import WorkflowTemplate
+    from workflow.compiled import get_compiled_template
     
     if not instance.created_by:
         return
@@ -126,10 +123,7 @@ def trigger_procedure_workflow(sender, instance, created, **kwargs):
                     Procedure.objects.filter(pk=instance.pk).update(status='pending_approval')
                     instance.refresh_from_db()
                 
-                template = WorkflowTemplate.objects.filter(
-                    code='content-approval',
-                    is_active=True
-                ).first()
+                template = get_compiled_template('content-approval')
                 
                 if template:
                     existing_workflow = WorkflowService.get_workflow_for_object(instance)
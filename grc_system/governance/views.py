@@ -55,6 +55,43 @@ class PolicyCategoryViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_fields = ['is_active', 'parent']
     search_fields = ['name', 'name_ar', 'code']
+    
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """
+        Get policy category hierarchy as tree.
+        
+        Query params:
+            is_active: Optional 'true' / 'false' filter
+            root: Optional category id whose subtree to return
+            depth: Optional number of levels to include
+        """
+        from core.utils import build_tree, parse_tree_params
+        
+        try:
+            root_id, max_depth = parse_tree_params(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        categories = PolicyCategory.objects.all()
+        is_active = request.query_params.get('is_active')
+        if is_active is not None:
+            categories = categories.filter(is_active=is_active.lower() == 'true')
+        
+        rows = categories.values('id', 'name', 'name_ar', 'code', 'order', 'parent_id')
+        tree = build_tree(
+            rows,
+            lambda row: {
+                'id': row['id'],
+                'name': row['name'],
+                'name_ar': row['name_ar'],
+                'code': row['code'],
+                'order': row['order'],
+            },
+            root_id=root_id,
+            max_depth=max_depth,
+        )
+        return Response(tree)
 
 
 class PolicyViewSet(viewsets.ModelViewSet):
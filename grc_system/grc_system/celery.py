@@ -3,6 +3,7 @@ Celery configuration for GRC System.
 """
 import os
 from celery import Celery
+from celery.schedules import crontab
 
 # Set default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'grc_system.settings')
@@ -15,6 +16,21 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Auto-discover tasks in all installed apps
 app.autodiscover_tasks()
 
+# Periodic tasks; the DatabaseScheduler syncs these into django-celery-beat
+app.conf.beat_schedule = {
+    'compliance-daily-rollup': {
+        'task': 'compliance.tasks.rollup_compliance_scores',
+        'schedule': crontab(hour=23, minute=50),
+    },
+    # Safety net for the debounced drain: the scheduled flag lives in the
+    # default cache, which is per process with locmem, so a change made
+    # while a worker clears it can be queued without a drain scheduled
+    'risk-residual-drain': {
+        'task': 'risk.tasks.recalculate_queued_residuals',
+        'schedule': crontab(minute='*/5'),
+    },
+}
+
 
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
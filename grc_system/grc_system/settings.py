@@ -189,6 +189,33 @@ CORS_ALLOW_HEADERS = [
     'x-requested-with',
 ]
 
+# Cache configuration
+# CACHE_BACKEND selects locmem (default, per process), file or redis.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'grc-default',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://localhost:6379/1'),
+    },
+}
+CACHES = {
+    'default': CACHE_BACKENDS[CACHE_BACKEND],
+}
+
+# Versioned API response cache (see core/cache.py). Only used with a shared
+# CACHE_BACKEND (file or redis); with locmem responses are never cached.
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True').lower() == 'true'
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+
 # Celery configuration
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = 'django-db'
@@ -199,6 +226,25 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
+# Residual risk recalculation after control effectiveness changes is
+# batched: the drain task runs this many seconds after the first change
+RISK_RESIDUAL_DEBOUNCE_SECONDS = int(os.environ.get('RISK_RESIDUAL_DEBOUNCE_SECONDS', 30))
+
+# Gap assessment refreshes of frameworks with at least this many controls
+# run as a Celery task and return a job handle instead of blocking
+GAP_SNAPSHOT_ASYNC_THRESHOLD = int(os.environ.get('GAP_SNAPSHOT_ASYNC_THRESHOLD', 500))
+
+# Crisis readiness packs are rebuilt this many seconds after the first
+# change to their source data
+CRISIS_READINESS_DEBOUNCE_SECONDS = int(os.environ.get('CRISIS_READINESS_DEBOUNCE_SECONDS', 30))
+
+# Hours an escalation may stay unresolved at each level before it moves up
+# to the manager of the next parent department: the first entry moves level
+# 1 to level 2, the second level 2 to level 3, and so on
+WORKFLOW_ESCALATION_LADDER = [
+    int(hours) for hours in os.environ.get('WORKFLOW_ESCALATION_LADDER', '24,48').split(',') if hours.strip()
+]
+
 # Email configuration
 EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
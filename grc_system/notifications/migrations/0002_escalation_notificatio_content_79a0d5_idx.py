@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='escalation',
+            index=models.Index(fields=['content_type', 'object_id', 'status'], name='notificatio_content_79a0d5_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_escalation_notificatio_content_79a0d5_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['content_type', 'object_id', 'created_at'], name='notificatio_content_3ade9e_idx'),
+        ),
+    ]
@@ -125,6 +125,7 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['recipient', 'status']),
             models.Index(fields=['recipient', 'read_at']),
+            models.Index(fields=['content_type', 'object_id', 'created_at']),
         ]
     
     def __str__(self):
@@ -250,6 +251,9 @@ class Escalation(models.Model):
         verbose_name = _('Escalation')
         verbose_name_plural = _('Escalations')
         ordering = ['-escalated_at']
+        indexes = [
+            models.Index(fields=['content_type', 'object_id', 'status']),
+        ]
     
     def __str__(self):
         return f"Escalation L{self.level}: {self.object_title}"
@@ -0,0 +1,34 @@
+"""
+Management command to recalculate residual risk from linked control effectiveness.
+"""
+from django.core.management.base import BaseCommand
+
+from risk.models import Risk
+from risk.utils import recalculate_residuals
+
+
+class Command(BaseCommand):
+    help = 'Recalculates residual likelihood/impact for risks with linked controls'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization', type=int,
+            help='Only recalculate risks of this organization ID'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Risks per batch (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        risks = Risk.objects.all()
+        if options.get('organization'):
+            risks = risks.filter(organization_id=options['organization'])
+
+        result = recalculate_residuals(risks, batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {result['processed']} risks "
+            f"({result['with_controls']} with controls), "
+            f"updated {result['updated']} in {result['duration_ms']} ms"
+        ))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('risk', '0003_alter_risk_description'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='risk',
+            name='status',
+            field=models.CharField(choices=[('identified', 'Identified'), ('pending_approval', 'Pending Approval'), ('assessed', 'Assessed'), ('treating', 'Under Treatment'), ('monitoring', 'Monitoring'), ('closed', 'Closed')], default='identified', max_length=20, verbose_name='Status'),
+        ),
+        migrations.CreateModel(
+            name='ResidualRecalculationQueue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('queued_at', models.DateTimeField(auto_now_add=True, verbose_name='Queued At')),
+                ('risk', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='residual_recalculation', to='risk.risk', verbose_name='Risk')),
+            ],
+            options={
+                'verbose_name': 'Residual Recalculation Queue Entry',
+                'verbose_name_plural': 'Residual Recalculation Queue',
+                'ordering': ['queued_at'],
+            },
+        ),
+    ]
@@ -367,13 +367,18 @@ class Risk(models.Model):
         Auto-calculate residual risk based on linked control effectiveness.
         Updates residual_likelihood and residual_impact.
         """
-        from risk.utils import calculate_control_effectiveness_from_linked_controls, calculate_residual_risk
+        from risk.utils import calculate_control_effectiveness_bulk, calculate_residual_risk
         
-        if not self.controls.exists():
+        if self.pk is None:
+            return
+        
+        effectiveness = calculate_control_effectiveness_bulk(
+            Risk.objects.filter(pk=self.pk)
+        ).get(self.pk)
+        if effectiveness is None:
             # No controls - residual equals inherent
             return
         
-        effectiveness = calculate_control_effectiveness_from_linked_controls(self)
         res_likelihood, res_impact, _ = calculate_residual_risk(
             self.inherent_likelihood,
             self.inherent_impact,
@@ -645,3 +650,28 @@ class RiskAcceptance(models.Model):
     @property
     def accepted_risk_score(self):
         return self.accepted_likelihood * self.accepted_impact
+
+
+class ResidualRecalculationQueue(models.Model):
+    """
+    طابور إعادة حساب المخاطر المتبقية - Risks awaiting residual recalculation
+
+    Filled when the effectiveness of a linked control changes and drained
+    in batches by risk.tasks.recalculate_queued_residuals. One row per risk,
+    so repeated control updates coalesce into a single recalculation.
+    """
+    risk = models.OneToOneField(
+        Risk, 
+        on_delete=models.CASCADE,
+        related_name='residual_recalculation',
+        verbose_name=_('Risk')
+    )
+    queued_at = models.DateTimeField(_('Queued At'), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Residual Recalculation Queue Entry')
+        verbose_name_plural = _('Residual Recalculation Queue')
+        ordering = ['queued_at']
+    
+    def __str__(self):
+        return f"Recalculate residual: {self.risk_id}"
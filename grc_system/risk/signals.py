@@ -2,10 +2,11 @@
 Risk app signals for workflow integration.
 Auto-triggers workflows when authors create risks.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 import logging
 
+from compliance.models import ControlImplementation
 from .models import Risk, RiskAcceptance
 
 logger = logging.getLogger(__name__)
@@ -41,7 +42,7 @@ def trigger_risk_workflow(sender, instance, created, **kwargs):
     - If created by Manager: auto-approve
     """
     from workflow.services import WorkflowService
-    from workflow.models import WorkflowTemplate
+    from workflow.compiled import get_compiled_template
     
     # Get creator - could be created_by or owner
     creator = getattr(instance, 'created_by', None) or instance.owner
@@ -60,10 +61,7 @@ def trigger_risk_workflow(sender, instance, created, **kwargs):
                     Risk.objects.filter(pk=instance.pk).update(status='pending_approval')
                     instance.refresh_from_db()
                 
-                template = WorkflowTemplate.objects.filter(
-                    code='content-approval',
-                    is_active=True
-                ).first()
+                template = get_compiled_template('content-approval')
                 
                 if template:
                     existing_workflow = WorkflowService.get_workflow_for_object(instance)
@@ -93,17 +91,14 @@ def trigger_risk_acceptance_workflow(sender, instance, created, **kwargs):
     Trigger approval workflow for risk acceptance requests.
     """
     from workflow.services import WorkflowService
-    from workflow.models import WorkflowTemplate
+    from workflow.compiled import get_compiled_template
     
     if not instance.requested_by:
         return
     
     if created and instance.status == 'pending':
         try:
-            template = WorkflowTemplate.objects.filter(
-                code='content-approval',
-                is_active=True
-            ).first()
+            template = get_compiled_template('content-approval')
             
             if template:
                 existing_workflow = WorkflowService.get_workflow_for_object(instance)
@@ -153,3 +148,61 @@ def handle_workflow_completed(sender, instance, **kwargs):
 # Connect to workflow signals
 from workflow.signals import workflow_completed
 workflow_completed.connect(handle_workflow_completed)
+
+
+# Residual risk follows the effectiveness of linked controls
+@receiver(pre_save, sender=ControlImplementation)
+def capture_effectiveness_rating(sender, instance, **kwargs):
+    """Remember the stored effectiveness rating before an implementation changes."""
+    instance._previous_effectiveness = None
+    if instance.pk and not instance._state.adding:
+        instance._previous_effectiveness = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('effectiveness_rating', flat=True).first()
+
+
+@receiver(post_save, sender=ControlImplementation)
+@receiver(post_delete, sender=ControlImplementation)
+def queue_residuals_for_implementation(sender, instance, **kwargs):
+    """
+    Queue risks mitigated by a control whose effectiveness changed.
+    Only risks of the implementation's organization are affected.
+    """
+    from .utils import queue_residual_recalculation
+    
+    if kwargs.get('signal') is post_delete:
+        # The deleted row's rating no longer applies
+        previous, current = instance.effectiveness_rating, None
+    else:
+        previous = getattr(instance, '_previous_effectiveness', None)
+        current = instance.effectiveness_rating
+    if previous == current:
+        return
+    
+    risk_ids = Risk.objects.filter(
+        organization_id=instance.organization_id,
+        controls=instance.control_id
+    ).values_list('pk', flat=True)
+    queue_residual_recalculation(risk_ids)
+
+
+@receiver(m2m_changed, sender=Risk.controls.through)
+def queue_residuals_for_control_links(sender, instance, action, reverse, pk_set, **kwargs):
+    """Queue risks whose set of linked controls changed."""
+    from .utils import queue_residual_recalculation
+    
+    if action == 'pre_clear' and reverse:
+        # Control.mitigated_risks.clear(): remember the risks before unlinking
+        instance._cleared_risk_ids = list(instance.mitigated_risks.values_list('pk', flat=True))
+        return
+    
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    if not reverse:
+        risk_ids = [instance.pk]
+    elif action == 'post_clear':
+        risk_ids = getattr(instance, '_cleared_risk_ids', [])
+    else:
+        risk_ids = pk_set or []
+    queue_residual_recalculation(risk_ids)
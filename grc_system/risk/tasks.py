@@ -0,0 +1,59 @@
+"""
+Celery tasks for risk management.
+Handles asynchronous residual risk recalculation.
+"""
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def recalculate_queued_residuals(self, batch_size=2000):
+    """
+    Drain the residual recalculation queue.
+    Scheduled (debounced) when linked control effectiveness changes, and
+    every 5 minutes via Celery Beat for changes whose drain was not scheduled.
+    """
+    from django.core.cache import cache
+    from .models import ResidualRecalculationQueue, Risk
+    from .utils import RESIDUAL_RECALCULATION_SCHEDULED_KEY, recalculate_residuals
+    
+    # Changes arriving from now on schedule a fresh run
+    cache.delete(RESIDUAL_RECALCULATION_SCHEDULED_KEY)
+    
+    processed = 0
+    updated = 0
+    try:
+        while True:
+            risk_ids = list(
+                ResidualRecalculationQueue.objects.values_list('risk_id', flat=True)[:batch_size]
+            )
+            if not risk_ids:
+                break
+            
+            # Claim the batch before computing, so a control change made
+            # while it runs re-queues the risk instead of being lost
+            ResidualRecalculationQueue.objects.filter(risk_id__in=risk_ids).delete()
+            try:
+                result = recalculate_residuals(Risk.objects.filter(pk__in=risk_ids), batch_size=batch_size)
+            except Exception:
+                ResidualRecalculationQueue.objects.bulk_create(
+                    [ResidualRecalculationQueue(risk_id=risk_id) for risk_id in risk_ids],
+                    ignore_conflicts=True
+                )
+                raise
+            
+            processed += result['processed']
+            updated += result['updated']
+        
+        logger.info(f"Recalculated residual risk for {processed} queued risks, {updated} changed")
+        
+        return {
+            'processed': processed,
+            'updated': updated
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in recalculate_queued_residuals: {e}")
+        raise self.retry(exc=e, countdown=60)
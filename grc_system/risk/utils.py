@@ -7,8 +7,12 @@ As a Risk Management Specialist, these are the key calculations:
 3. Risk Level based on 5x5 matrix
 4. Risk Appetite comparison
 """
+import logging
+
 from django.core.exceptions import ValidationError
 
+logger = logging.getLogger(__name__)
+
 
 # Risk Matrix Configuration (5x5)
 RISK_MATRIX = {
@@ -156,35 +160,162 @@ def calculate_control_effectiveness_from_linked_controls(risk):
     Returns:
         int: Aggregate control effectiveness percentage (0-100)
     """
-    from compliance.models import ControlImplementation
+    from risk.models import Risk
     
-    if not risk.controls.exists():
+    if risk.pk is None:
         return 0
     
-    total_effectiveness = 0
-    control_count = 0
+    effectiveness = calculate_control_effectiveness_bulk(Risk.objects.filter(pk=risk.pk))
+    return effectiveness.get(risk.pk, 0)
+
+
+def effectiveness_from_ratings(ratings):
+    """
+    Aggregate control effectiveness from implementation ratings.
     
-    for control in risk.controls.all():
-        # Get implementation for the risk's organization
-        impl = ControlImplementation.objects.filter(
-            organization=risk.organization,
-            control=control
-        ).first()
-        
-        if impl and impl.effectiveness_rating:
-            # Convert 1-5 effectiveness to percentage
-            # 5 = 100%, 4 = 80%, 3 = 60%, 2 = 40%, 1 = 20%
-            total_effectiveness += impl.effectiveness_rating * 20
-            control_count += 1
+    Args:
+        ratings: Effectiveness ratings (1-5) of linked controls; None for
+                 controls without a rated implementation
     
-    if control_count == 0:
+    Returns:
+        int: Aggregate control effectiveness percentage (0-95)
+    """
+    # Convert 1-5 effectiveness to percentage
+    # 5 = 100%, 4 = 80%, 3 = 60%, 2 = 40%, 1 = 20%
+    percentages = [rating * 20 for rating in ratings if rating]
+    
+    if not percentages:
         return 0
     
     # Average effectiveness, capped at 95% (no control is perfect)
-    avg_effectiveness = min(95, total_effectiveness / control_count)
+    avg_effectiveness = min(95, sum(percentages) / len(percentages))
     return round(avg_effectiveness)
 
 
+def calculate_control_effectiveness_bulk(risks):
+    """
+    Calculate control effectiveness for many risks at once.
+    
+    Loads every (risk, control, implementation rating) triple in a single
+    query: the risk-control link table joined to each control's
+    implementation in the risk's own organization.
+    
+    Args:
+        risks: QuerySet of Risk objects
+    
+    Returns:
+        dict: {risk_id: effectiveness_pct} for every risk with at least one
+              linked control (risks without controls are absent)
+    """
+    from collections import defaultdict
+    from django.db.models import OuterRef, Subquery
+    from compliance.models import ControlImplementation
+    from risk.models import Risk
+    
+    implementation_rating = ControlImplementation.objects.filter(
+        organization_id=OuterRef('risk__organization_id'),
+        control_id=OuterRef('control_id'),
+    ).values('effectiveness_rating')[:1]
+    
+    triples = Risk.controls.through.objects.filter(
+        risk__in=risks.order_by().values('pk')
+    ).annotate(
+        rating=Subquery(implementation_rating)
+    ).values_list('risk_id', 'rating')
+    
+    ratings = defaultdict(list)
+    for risk_id, rating in triples:
+        ratings[risk_id].append(rating)
+    
+    return {
+        risk_id: effectiveness_from_ratings(risk_ratings)
+        for risk_id, risk_ratings in ratings.items()
+    }
+
+
+def recalculate_residuals(risks, batch_size=2000):
+    """
+    Recalculate residual likelihood/impact for many risks.
+    
+    Works through the queryset in batches: per batch, one query for the
+    risk scores, one for the control triples and one UPDATE per distinct
+    new residual cell. Risks without linked controls are left untouched,
+    as in Risk.calculate_residual_from_controls.
+    
+    Args:
+        risks: QuerySet of Risk objects
+        batch_size: Risks per batch
+    
+    Returns:
+        dict: {
+            'processed': risks examined,
+            'with_controls': risks that have linked controls,
+            'updated': risks whose residual values changed,
+            'duration_ms': elapsed time
+        }
+    """
+    import time
+    from collections import defaultdict
+    from django.utils import timezone
+    from core.cache import bump_organization
+    from risk.models import Risk
+    
+    started = time.perf_counter()
+    processed = with_controls = updated = 0
+    organizations = set()
+    
+    rows = risks.order_by('pk').values_list(
+        'pk', 'organization_id', 'inherent_likelihood', 'inherent_impact',
+        'residual_likelihood', 'residual_impact'
+    )
+    
+    last_pk = 0
+    while True:
+        batch = list(rows.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        processed += len(batch)
+        
+        effectiveness = calculate_control_effectiveness_bulk(
+            Risk.objects.filter(pk__in=[row[0] for row in batch])
+        )
+        
+        # Residual values fall on the 5x5 grid, so changed risks are grouped
+        # by their new (likelihood, impact) and written with at most 25
+        # set-based UPDATEs per batch
+        changed = defaultdict(list)
+        for pk, org_id, likelihood, impact, old_likelihood, old_impact in batch:
+            if pk not in effectiveness:
+                continue
+            with_controls += 1
+            res_likelihood, res_impact, _ = calculate_residual_risk(
+                likelihood, impact, effectiveness[pk]
+            )
+            if (res_likelihood, res_impact) != (old_likelihood, old_impact):
+                changed[(res_likelihood, res_impact)].append(pk)
+                organizations.add(org_id)
+        
+        now = timezone.now()
+        for (res_likelihood, res_impact), pks in changed.items():
+            updated += Risk.objects.filter(pk__in=pks).update(
+                residual_likelihood=res_likelihood,
+                residual_impact=res_impact,
+                updated_at=now,
+            )
+    
+    # Queryset updates bypass signals; refresh cached residual matrices
+    for org_id in organizations:
+        bump_organization(org_id)
+    
+    return {
+        'processed': processed,
+        'with_controls': with_controls,
+        'updated': updated,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
 def check_risk_appetite(risk, appetite_threshold):
     """
     Check if risk exceeds organization's risk appetite.
@@ -288,3 +419,111 @@ def aggregate_risks_by_category(risks):
         stats[category_name][f'{level}_count'] += 1
     
     return dict(stats)
+
+
+# Statuses plotted on the risk heat map
+MATRIX_RISK_STATUSES = ['identified', 'assessed', 'treating', 'monitoring']
+
+# Likelihood/impact field pairs for each matrix variant
+MATRIX_VARIANTS = {
+    'inherent': ('inherent_likelihood', 'inherent_impact'),
+    'residual': ('residual_likelihood', 'residual_impact'),
+    'target': ('target_likelihood', 'target_impact'),
+}
+
+
+def build_risk_matrix_counts(risks):
+    """
+    Count risks per heat map cell for every matrix variant.
+    
+    One GROUP BY per variant over its likelihood/impact pair returns one
+    row per distinct pair (36 for scores 1-5 or empty), independent of
+    register size; grouping all six columns together could return up to
+    6^6 rows. The rows are folded into one 5x5 count grid per variant.
+    Grids use the same orientation as the full matrix: row 0 is
+    likelihood 5, column 0 is impact 1.
+    
+    Args:
+        risks: QuerySet of Risk objects (already filtered)
+    
+    Returns:
+        dict: {
+            variant: {
+                'matrix': 5x5 list of counts,
+                'total': risks plotted,
+                'not_assessed': risks without a score for this variant
+            }
+        }
+    """
+    from django.db.models import Count
+    
+    result = {}
+    for variant, (likelihood_field, impact_field) in MATRIX_VARIANTS.items():
+        cell = result[variant] = {
+            'matrix': [[0] * 5 for _ in range(5)],
+            'total': 0,
+            'not_assessed': 0,
+        }
+        rows = risks.order_by().values_list(likelihood_field, impact_field).annotate(count=Count('id'))
+        for likelihood, impact, count in rows:
+            if not likelihood or not impact:
+                cell['not_assessed'] += count
+                continue
+            likelihood = min(likelihood - 1, 4)
+            impact = min(impact - 1, 4)
+            cell['matrix'][4 - likelihood][impact] += count
+            cell['total'] += count
+    
+    return result
+
+
+# Cache flag set while a debounced drain task is pending
+RESIDUAL_RECALCULATION_SCHEDULED_KEY = 'risk:residual-recalculation:scheduled'
+
+
+def queue_residual_recalculation(risk_ids):
+    """
+    Queue risks for asynchronous residual recalculation.
+    
+    Risks already in the queue are not added twice. A drain task is
+    scheduled RISK_RESIDUAL_DEBOUNCE_SECONDS after the first change of a
+    burst; every change until it runs joins the same batch.
+    
+    Args:
+        risk_ids: Iterable of Risk primary keys
+    """
+    from risk.models import ResidualRecalculationQueue
+    
+    risk_ids = set(risk_ids)
+    if not risk_ids:
+        return
+    
+    ResidualRecalculationQueue.objects.bulk_create(
+        [ResidualRecalculationQueue(risk_id=risk_id) for risk_id in risk_ids],
+        ignore_conflicts=True
+    )
+    schedule_residual_recalculation()
+
+
+def schedule_residual_recalculation():
+    """Schedule the debounced drain task unless one is already pending."""
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.db import transaction
+    
+    debounce = getattr(settings, 'RISK_RESIDUAL_DEBOUNCE_SECONDS', 30)
+    
+    if not cache.add(RESIDUAL_RECALCULATION_SCHEDULED_KEY, True, timeout=debounce * 2):
+        return
+    
+    def enqueue():
+        from risk.tasks import recalculate_queued_residuals
+        try:
+            recalculate_queued_residuals.apply_async(countdown=debounce)
+        except Exception as e:
+            # Queue rows persist; the periodic drain (or the next change) picks them up
+            cache.delete(RESIDUAL_RECALCULATION_SCHEDULED_KEY)
+            logger.warning(f"Could not schedule residual recalculation: {e}")
+    
+    transaction.on_commit(enqueue)
+
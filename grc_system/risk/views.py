@@ -8,7 +8,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count
+from core.cache import cached_response
 
 from .models import AssetCategory, Asset, RiskCategory, Risk, RiskAssessment, RiskTreatment, RiskAcceptance
 from .serializers import (
@@ -58,6 +58,43 @@ class RiskCategoryViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_fields = ['is_active', 'parent']
     search_fields = ['name', 'name_ar', 'code']
+    
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """
+        Get risk category hierarchy as tree.
+        
+        Query params:
+            is_active: Optional 'true' / 'false' filter
+            root: Optional category id whose subtree to return
+            depth: Optional number of levels to include
+        """
+        from core.utils import build_tree, parse_tree_params
+        
+        try:
+            root_id, max_depth = parse_tree_params(request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        categories = RiskCategory.objects.all()
+        is_active = request.query_params.get('is_active')
+        if is_active is not None:
+            categories = categories.filter(is_active=is_active.lower() == 'true')
+        
+        rows = categories.values('id', 'name', 'name_ar', 'code', 'color', 'parent_id')
+        tree = build_tree(
+            rows,
+            lambda row: {
+                'id': row['id'],
+                'name': row['name'],
+                'name_ar': row['name_ar'],
+                'code': row['code'],
+                'color': row['color'],
+            },
+            root_id=root_id,
+            max_depth=max_depth,
+        )
+        return Response(tree)
 
 
 class RiskViewSet(viewsets.ModelViewSet):
@@ -94,50 +131,100 @@ class RiskViewSet(viewsets.ModelViewSet):
     # endregion
     
     @action(detail=False, methods=['get'])
+    @cached_response('risk.matrix')
     def matrix(self, request):
-        """Get risk matrix data."""
+        """
+        Get risk matrix data.
+        
+        ?mode=counts returns per-cell counts for the inherent, residual and
+        target variants instead of the risk list of every cell.
+        """
+        from risk.utils import MATRIX_RISK_STATUSES, build_risk_matrix_counts
+        
         org_id = request.query_params.get('organization')
-        risks = self.queryset
+        risks = Risk.objects.filter(status__in=MATRIX_RISK_STATUSES)
         if org_id:
             risks = risks.filter(organization_id=org_id)
         
+        if request.query_params.get('mode') == 'counts':
+            return Response(build_risk_matrix_counts(risks))
+        
         # Create 5x5 matrix
         matrix = [[[] for _ in range(5)] for _ in range(5)]
         
-        for risk in risks.filter(status__in=['identified', 'assessed', 'treating', 'monitoring']):
-            likelihood = min(risk.inherent_likelihood - 1, 4)
-            impact = min(risk.inherent_impact - 1, 4)
-            matrix[4 - likelihood][impact].append({
-                'id': risk.id,
-                'risk_id': risk.risk_id,
-                'title': risk.title,
-                'title_ar': risk.title_ar,
-            })
+        for risk in risks.values('id', 'risk_id', 'title', 'title_ar', 'inherent_likelihood', 'inherent_impact'):
+            likelihood = min(risk.pop('inherent_likelihood') - 1, 4)
+            impact = min(risk.pop('inherent_impact') - 1, 4)
+            matrix[4 - likelihood][impact].append(risk)
         
         return Response({'matrix': matrix})
     
     @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Get risk statistics."""
+    @cached_response('risk.matrix_cell')
+    def matrix_cell(self, request):
+        """
+        Paginated drill-down into one risk matrix cell.
+        GET /api/risk/risks/matrix_cell/?likelihood=4&impact=5&variant=inherent
+        """
+        from risk.utils import MATRIX_RISK_STATUSES, MATRIX_VARIANTS
+        
+        variant = request.query_params.get('variant', 'inherent')
+        if variant not in MATRIX_VARIANTS:
+            return Response(
+                {'error': f"variant must be one of: {', '.join(MATRIX_VARIANTS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            likelihood = int(request.query_params['likelihood'])
+            impact = int(request.query_params['impact'])
+        except (KeyError, ValueError):
+            return Response(
+                {'error': 'likelihood and impact are required integers (1-5)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not (1 <= likelihood <= 5 and 1 <= impact <= 5):
+            return Response(
+                {'error': 'likelihood and impact must be between 1 and 5'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        likelihood_field, impact_field = MATRIX_VARIANTS[variant]
+        risks = Risk.objects.filter(
+            status__in=MATRIX_RISK_STATUSES,
+            **{likelihood_field: likelihood, impact_field: impact}
+        )
         org_id = request.query_params.get('organization')
-        risks = self.queryset
         if org_id:
             risks = risks.filter(organization_id=org_id)
         
+        risks = risks.order_by('risk_id').values('id', 'risk_id', 'title', 'title_ar', 'status')
+        page = self.paginate_queryset(risks)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(risks))
+    
+    @action(detail=False, methods=['get'])
+    @cached_response('risk.statistics')
+    def statistics(self, request):
+        """
+        Get risk statistics.
+        
+        Served from the materialized organization summary counters; risk
+        levels use the same inherent score buckets as the executive summary.
+        """
+        from dashboard.services import OrganizationSummaryService
+        from dashboard.utils import group_counters, risk_level_counts
+        
+        org_id = request.query_params.get('organization')
+        counters = OrganizationSummaryService.get_counters(org_id)['risks']
+        scores = {int(score): count for score, count in group_counters(counters, 'score').items()}
+        
         stats = {
-            'total': risks.count(),
-            'by_status': dict(risks.values_list('status').annotate(count=Count('id'))),
-            'by_type': dict(risks.values_list('risk_type').annotate(count=Count('id'))),
-            'by_level': {
-                'critical': risks.filter(inherent_likelihood__gte=4, inherent_impact__gte=4).count(),
-                'high': risks.filter(inherent_likelihood__gte=3, inherent_impact__gte=3).exclude(
-                    inherent_likelihood__gte=4, inherent_impact__gte=4
-                ).count(),
-                'medium': risks.filter(inherent_likelihood__gte=2, inherent_impact__gte=2).exclude(
-                    inherent_likelihood__gte=3, inherent_impact__gte=3
-                ).count(),
-                'low': risks.filter(inherent_likelihood__lte=2).filter(inherent_impact__lte=2).count(),
-            }
+            'total': counters['total'],
+            'by_status': group_counters(counters, 'status'),
+            'by_type': group_counters(counters, 'type'),
+            'by_level': risk_level_counts(scores),
         }
         return Response(stats)
     
@@ -159,6 +246,21 @@ class RiskViewSet(viewsets.ModelViewSet):
             'treatment_recommendation': risk.get_treatment_recommendation()
         })
     
+    @action(detail=False, methods=['post'])
+    def recalculate_residuals(self, request):
+        """
+        Recalculate residual risk for all risks from linked control effectiveness.
+        POST /api/risk/risks/recalculate_residuals/?organization={id}
+        """
+        from risk.utils import recalculate_residuals
+        
+        org_id = request.query_params.get('organization') or request.data.get('organization')
+        risks = Risk.objects.all()
+        if org_id:
+            risks = risks.filter(organization_id=org_id)
+        
+        return Response(recalculate_residuals(risks))
+    
     @action(detail=True, methods=['get'])
     def analysis(self, request, pk=None):
         """
@@ -203,6 +305,7 @@ class RiskViewSet(viewsets.ModelViewSet):
         })
     
     @action(detail=False, methods=['get'])
+    @cached_response('risk.by_category')
     def by_category(self, request):
         """
         Get risks aggregated by category.
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import WorkflowTemplate, WorkflowStep, WorkflowInstance, Approval, Task
+from .models import WorkflowTemplate, WorkflowStep, WorkflowInstance, Approval, ApproverWorkload, Task
 
 
 @admin.register(WorkflowTemplate)
@@ -11,8 +11,8 @@ class WorkflowTemplateAdmin(admin.ModelAdmin):
 
 @admin.register(WorkflowStep)
 class WorkflowStepAdmin(admin.ModelAdmin):
-    list_display = ['template', 'order', 'name', 'step_type']
-    list_filter = ['template', 'step_type']
+    list_display = ['template', 'order', 'name', 'step_type', 'assignee_type', 'assignment_strategy']
+    list_filter = ['template', 'step_type', 'assignment_strategy']
 
 
 @admin.register(WorkflowInstance)
@@ -28,6 +28,13 @@ class ApprovalAdmin(admin.ModelAdmin):
     list_filter = ['status']
 
 
+@admin.register(ApproverWorkload)
+class ApproverWorkloadAdmin(admin.ModelAdmin):
+    list_display = ['user', 'open_approvals', 'last_assigned_at']
+    search_fields = ['user__username', 'user__first_name', 'user__last_name']
+    readonly_fields = ['open_approvals', 'last_assigned_at']
+
+
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = ['title', 'task_type', 'priority', 'status', 'assigned_to', 'due_date']
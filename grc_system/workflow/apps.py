@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class WorkflowConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "workflow"
+    
+    def ready(self):
+        # Import signals to register them
+        try:
+            import workflow.signals  # noqa
+        except ImportError:
+            pass
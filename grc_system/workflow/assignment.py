@@ -0,0 +1,214 @@
+"""
+Approval assignment strategies for role-based workflow steps.
+
+A step assigned to a role picks one of the active users holding that role,
+according to the step's assignment_strategy:
+
+1. first_available: The first user with the role (original behaviour)
+2. round_robin: The user whose last assignment is the oldest
+3. least_pending: The user with the fewest open approvals, then round robin
+4. department_affinity: least_pending among users in the initiator's
+   department, falling back to all users with the role
+
+Each strategy is a single query ordered over ApproverWorkload, a per-user
+counter of open approvals. The counter is adjusted with F() updates by the
+Approval signals (workflow.signals) when approvals are created, decided,
+delegated or removed, and can be rebuilt with rebuild_approver_workload.
+
+Concurrent workflows read the same counters, so the workload-based
+strategies lock the chosen user's counter row until the approval-creation
+transaction commits, and pick again if another assignment claimed that
+user first (see _claim).
+"""
+from collections import Counter
+
+from django.db.models import Case, F, IntegerField, Max, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+
+def _candidates(role_id):
+    from django.contrib.auth import get_user_model
+
+    return get_user_model().objects.filter(profile__roles=role_id, is_active=True)
+
+
+def _oldest_assignment_first():
+    return [F('approval_workload__last_assigned_at').asc(nulls_first=True), 'pk']
+
+
+def _claim(candidates, ordering, attempts=3):
+    """
+    Pick the first candidate in order and hold their workload row.
+
+    The chosen user's ApproverWorkload row is locked with select_for_update
+    for the rest of the caller's transaction, in which the approval is
+    created and the signals bump the counters. If the locked row no longer
+    matches the counters the pick was based on, another assignment committed
+    to that user in between and the pick is made again.
+
+    Args:
+        candidates: User queryset
+        ordering: order_by() arguments, best candidate first
+        attempts: Picks to make before keeping the last locked user
+
+    Returns:
+        User or None
+    """
+    from django.db import transaction
+    from .models import ApproverWorkload
+
+    candidates = candidates.annotate(
+        seen_open_approvals=Coalesce('approval_workload__open_approvals', 0),
+        seen_last_assigned_at=F('approval_workload__last_assigned_at')
+    ).order_by(*ordering)
+
+    with transaction.atomic():
+        user = candidates.first()
+        for attempt in range(attempts):
+            if user is None:
+                return None
+            ApproverWorkload.objects.get_or_create(user_id=user.pk)
+            locked = ApproverWorkload.objects.select_for_update().filter(
+                user_id=user.pk
+            ).values_list('open_approvals', 'last_assigned_at').get()
+            if locked == (user.seen_open_approvals, user.seen_last_assigned_at) or attempt == attempts - 1:
+                return user
+            user = candidates.first()
+
+
+def first_available(role_id, instance):
+    """The first user holding the role."""
+    return _candidates(role_id).order_by('profile__pk').first()
+
+
+def round_robin(role_id, instance):
+    """The user who has waited longest since their last assignment."""
+    return _claim(_candidates(role_id), _oldest_assignment_first())
+
+
+def least_pending(role_id, instance):
+    """The user with the fewest open approvals."""
+    return _claim(
+        _candidates(role_id).annotate(open_approvals=Coalesce('approval_workload__open_approvals', 0)),
+        ['open_approvals', *_oldest_assignment_first()]
+    )
+
+
+def department_affinity(role_id, instance):
+    """The least loaded user in the initiator's department, else anyone with the role."""
+    from core.models import UserProfile
+
+    initiator_department = UserProfile.objects.filter(
+        user_id=instance.initiated_by_id
+    ).values('department_id')[:1]
+    return _claim(
+        _candidates(role_id).annotate(
+            other_department=Case(
+                When(profile__department_id=Subquery(initiator_department), then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField()
+            ),
+            open_approvals=Coalesce('approval_workload__open_approvals', 0)
+        ),
+        ['other_department', 'open_approvals', *_oldest_assignment_first()]
+    )
+
+
+ASSIGNMENT_STRATEGIES = {
+    'first_available': first_available,
+    'round_robin': round_robin,
+    'least_pending': least_pending,
+    'department_affinity': department_affinity,
+}
+
+
+def get_assignment_strategy(name):
+    """
+    Look up a strategy by WorkflowStep.assignment_strategy.
+
+    Returns:
+        callable: strategy(role_id, instance) returning a User or None;
+                  first_available for unknown names
+    """
+    return ASSIGNMENT_STRATEGIES.get(name, first_available)
+
+
+def adjust_workload(deltas, assigned_to=None):
+    """
+    Apply open-approval count changes.
+
+    Args:
+        deltas: {user id: change in open approvals}
+        assigned_to: User id that just received an approval (its
+                     last_assigned_at is set to now)
+    """
+    from .models import ApproverWorkload
+
+    now = timezone.now()
+    for user_id, delta in deltas.items():
+        if not user_id or (not delta and user_id != assigned_to):
+            continue
+        fields = {'open_approvals': Greatest(F('open_approvals') + delta, Value(0))}
+        if user_id == assigned_to:
+            fields['last_assigned_at'] = now
+        if not ApproverWorkload.objects.filter(user_id=user_id).update(**fields):
+            ApproverWorkload.objects.get_or_create(user_id=user_id)
+            ApproverWorkload.objects.filter(user_id=user_id).update(**fields)
+
+
+def release_approvals(approvals):
+    """
+    Decrement the counters of pending approvals about to be closed by a
+    queryset update(), which bypasses the Approval signals.
+
+    Args:
+        approvals: Approval queryset
+    """
+    released = Counter(
+        approvals.filter(status='pending', assignee__isnull=False).values_list('assignee_id', flat=True)
+    )
+    adjust_workload({user_id: -count for user_id, count in released.items()})
+
+
+def rebuild_approver_workload():
+    """
+    Recompute every counter from the Approval table.
+
+    Returns:
+        int: Number of approvers with open approvals
+    """
+    from django.db import transaction
+    from django.db.models import Count, Q
+    from .models import Approval, ApproverWorkload
+
+    rows = Approval.objects.filter(assignee__isnull=False).values('assignee_id').annotate(
+        open_approvals=Count('id', filter=Q(status='pending')),
+        last_assigned_at=Max('created_at')
+    ).order_by()
+    workloads = {
+        row['assignee_id']: ApproverWorkload(
+            user_id=row['assignee_id'],
+            open_approvals=row['open_approvals'],
+            last_assigned_at=row['last_assigned_at']
+        )
+        for row in rows
+    }
+
+    with transaction.atomic():
+        ApproverWorkload.objects.exclude(user_id__in=list(workloads)).delete()
+        existing = dict(
+            ApproverWorkload.objects.filter(user_id__in=list(workloads)).values_list('user_id', 'pk')
+        )
+        updates = []
+        for user_id, workload in workloads.items():
+            if user_id in existing:
+                workload.pk = existing[user_id]
+                updates.append(workload)
+        ApproverWorkload.objects.bulk_update(updates, ['open_approvals', 'last_assigned_at'], batch_size=1000)
+        ApproverWorkload.objects.bulk_create(
+            [workload for user_id, workload in workloads.items() if user_id not in existing],
+            batch_size=1000
+        )
+
+    return sum(1 for workload in workloads.values() if workload.open_approvals)
@@ -0,0 +1,142 @@
+"""
+Compiled workflow templates - In-process cache of templates and their steps.
+
+Starting a workflow and advancing it on every approval need the template,
+the step for a given order and that step's assignee rule. Templates change
+rarely, so each process compiles all of them once (two queries) into
+CompiledTemplate objects with steps indexed by order and assignee rules
+resolved to callables.
+
+When the cache backend is shared between processes (file or Redis), the
+compiled set is tagged with the 'workflow-templates' version counter of the
+response cache (core.cache). Saving or deleting a template or step bumps
+that counter on commit (core.signals), and every process recompiles on its
+next lookup, so a lookup costs one cache read. With a process-local backend
+(locmem, the default) a bump would not reach other web or Celery workers, so
+the set is tagged instead with a fingerprint of the templates and steps
+(row counts and latest updated_at), read with one query per lookup.
+
+Compiled templates and steps are shared between requests and must be
+treated as read-only.
+"""
+from core.cache import get_versions, is_shared_cache
+
+
+VERSION_SCOPE = 'workflow-templates'
+
+# (version or fingerprint, {template id: CompiledTemplate}, {code: CompiledTemplate})
+_compiled = (None, {}, {})
+
+
+class CompiledTemplate:
+    """
+    A workflow template with its steps ready for the workflow engine.
+
+    Attributes:
+        template: The WorkflowTemplate
+        steps: {order: WorkflowStep}
+        resolvers: {order: callable(instance) returning the assignee or None}
+    """
+
+    def __init__(self, template, steps):
+        from .services import WorkflowService
+
+        self.template = template
+        self.steps = {step.order: step for step in steps}
+        self.resolvers = {
+            order: WorkflowService.compile_assignee_resolver(step)
+            for order, step in self.steps.items()
+        }
+
+    def step(self, order):
+        """The step with the given order, or None after the last step."""
+        return self.steps.get(order)
+
+    def resolve_assignee(self, step, instance):
+        """Resolve the assignee of one of this template's steps for an instance."""
+        return self.resolvers[step.order](instance)
+
+
+def _compile(templates):
+    from .models import WorkflowStep
+
+    templates = {template.pk: template for template in templates}
+    steps = {pk: [] for pk in templates}
+    for step in WorkflowStep.objects.filter(
+        template__in=list(templates)
+    ).select_related('assignee_user', 'assignee_role'):
+        step.template = templates[step.template_id]
+        steps[step.template_id].append(step)
+    return [CompiledTemplate(template, steps[pk]) for pk, template in templates.items()]
+
+
+def _fingerprint():
+    from django.db.models import Count, Max
+    from .models import WorkflowTemplate
+
+    if is_shared_cache():
+        return get_versions([VERSION_SCOPE])[0]
+
+    # Counts catch deletions, latest updated_at catches edits
+    stats = WorkflowTemplate.objects.aggregate(
+        template_count=Count('pk', distinct=True),
+        step_count=Count('steps'),
+        template_updated=Max('updated_at'),
+        step_updated=Max('steps__updated_at'),
+    )
+    return tuple(sorted(stats.items()))
+
+
+def _current():
+    global _compiled
+    from .models import WorkflowTemplate
+
+    version = _fingerprint()
+    if _compiled[0] != version:
+        compiled = _compile(WorkflowTemplate.objects.all())
+        _compiled = (
+            version,
+            {entry.template.pk: entry for entry in compiled},
+            {entry.template.code: entry for entry in compiled},
+        )
+    return _compiled
+
+
+def get_compiled_template(code):
+    """
+    Get an active template by code.
+
+    Args:
+        code: WorkflowTemplate code
+
+    Returns:
+        CompiledTemplate or None if the template is missing or inactive
+    """
+    from .models import WorkflowTemplate
+
+    compiled = _current()[2].get(code)
+    if compiled is None:
+        # Created in a transaction that has not committed yet; the version
+        # bump comes with the commit, so compile it without caching
+        compiled = next(iter(_compile(WorkflowTemplate.objects.filter(code=code))), None)
+    if compiled is None or not compiled.template.is_active:
+        return None
+    return compiled
+
+
+def get_compiled_template_by_id(template_id):
+    """
+    Get a template by id, active or not (running instances still need it).
+
+    Args:
+        template_id: WorkflowTemplate id
+
+    Returns:
+        CompiledTemplate or None if the template does not exist
+    """
+    from .models import WorkflowTemplate
+
+    compiled = _current()[1].get(template_id)
+    if compiled is None:
+        compiled = next(iter(_compile(WorkflowTemplate.objects.filter(pk=template_id))), None)
+    return compiled
@@ -0,0 +1,103 @@
+"""
+Management command to benchmark the workflow SLA jobs (overdue sweep, due reminders, escalations).
+Seeds synthetic open approvals in a rolled-back transaction and reports query count and throughput.
+"""
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.benchmark import create_benchmark_context, measure_once, rolled_back
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the overdue approval sweep, due reminders and escalation processing at a volume of open approvals'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--approvals', type=int, default=50000,
+            help='Open approvals to seed (default: 50000)'
+        )
+        parser.add_argument(
+            '--assignees', type=int, default=200,
+            help='Approvers the approvals are spread over (default: 200)'
+        )
+        parser.add_argument(
+            '--overdue-share', type=float, default=0.5,
+            help='Share of approvals past their due date (default: 0.5)'
+        )
+
+    def handle(self, *args, **options):
+        from django.contrib.auth import get_user_model
+        from core.models import Department, UserProfile
+        from workflow.models import Approval, WorkflowInstance, WorkflowStep, WorkflowTemplate
+        from workflow.services import WorkflowService
+
+        User = get_user_model()
+        rng = random.Random(42)
+        now = timezone.now()
+
+        with rolled_back():
+            organization, user = create_benchmark_context()
+            suffix = organization.code
+
+            template = WorkflowTemplate.objects.create(
+                name='Benchmark approval', code=f'bench-{suffix}', created_by=user
+            )
+            step = WorkflowStep.objects.create(
+                template=template, order=1, name='Review', assignee_type='user'
+            )
+
+            departments = Department.objects.bulk_create([
+                Department(organization=organization, name=f'Department {index}', code=f'D{index}', manager=user)
+                for index in range(10)
+            ])
+            assignees = User.objects.bulk_create([
+                User(username=f'{suffix}-approver-{index}')
+                for index in range(options['assignees'])
+            ])
+            UserProfile.objects.bulk_create([
+                UserProfile(user=assignee, organization=organization, department=rng.choice(departments))
+                for assignee in assignees
+            ])
+
+            instances = WorkflowInstance.objects.bulk_create([
+                WorkflowInstance(
+                    template=template,
+                    content_type='governance.policy',
+                    object_id=index + 1,
+                    object_title=f'Benchmark item {index}',
+                    status='in_progress',
+                    initiated_by=user,
+                )
+                for index in range(options['approvals'])
+            ], batch_size=5000)
+            Approval.objects.bulk_create([
+                Approval(
+                    workflow_instance=instance,
+                    step=step,
+                    assignee=rng.choice(assignees),
+                    status='pending',
+                    due_date=now + timedelta(
+                        hours=rng.randint(1, 240) * (-1 if rng.random() < options['overdue_share'] else 1)
+                    ),
+                )
+                for instance in instances
+            ], batch_size=5000)
+
+            jobs = [
+                ('sweep', WorkflowService.escalate_overdue_approvals, 'escalated_count'),
+                ('reminders', WorkflowService.send_due_reminders, 'reminders_sent'),
+                ('escalations', WorkflowService.process_escalations, 'processed_count'),
+            ]
+            for job, func, count_key in jobs:
+                for label in ('first run', 'steady state'):
+                    result = measure_once(func)
+                    processed = result['result'][count_key]
+                    throughput = round(processed / (result['ms'] / 1000)) if processed else 0
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{job:>11} {label:>12} ({options['approvals']} open approvals): "
+                        f"{result['queries']} queries, {result['ms']} ms, "
+                        f"{processed} processed ({throughput}/s)"
+                    ))
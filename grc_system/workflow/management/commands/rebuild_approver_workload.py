@@ -0,0 +1,16 @@
+"""
+Management command to rebuild approver workload counters.
+"""
+from django.core.management.base import BaseCommand
+
+from workflow.assignment import rebuild_approver_workload
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds ApproverWorkload open-approval counters from pending approvals'
+
+    def handle(self, *args, **options):
+        approvers = rebuild_approver_workload()
+        self.stdout.write(self.style.SUCCESS(
+            f'{approvers} approver(s) with open approvals'
+        ))
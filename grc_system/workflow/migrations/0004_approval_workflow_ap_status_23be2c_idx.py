@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow', '0003_merge_20260121_1416'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='approval',
+            index=models.Index(fields=['status', 'due_date'], name='workflow_ap_status_23be2c_idx'),
+        ),
+    ]
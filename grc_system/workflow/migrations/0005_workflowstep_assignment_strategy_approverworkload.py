@@ -0,0 +1,54 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_approver_workload(apps, schema_editor):
+    Approval = apps.get_model('workflow', 'Approval')
+    ApproverWorkload = apps.get_model('workflow', 'ApproverWorkload')
+
+    rows = Approval.objects.filter(assignee__isnull=False).values('assignee_id').annotate(
+        open_approvals=models.Count('id', filter=models.Q(status='pending')),
+        last_assigned_at=models.Max('created_at')
+    ).order_by()
+    ApproverWorkload.objects.bulk_create([
+        ApproverWorkload(
+            user_id=row['assignee_id'],
+            open_approvals=row['open_approvals'],
+            last_assigned_at=row['last_assigned_at']
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('workflow', '0004_approval_workflow_ap_status_23be2c_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workflowstep',
+            name='assignment_strategy',
+            field=models.CharField(choices=[('first_available', 'First Available'), ('round_robin', 'Round Robin'), ('least_pending', 'Least Pending Approvals'), ('department_affinity', 'Department Affinity')], default='first_available', help_text='How a role step picks one of the users holding the role', max_length=30, verbose_name='Assignment Strategy'),
+        ),
+        migrations.CreateModel(
+            name='ApproverWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('open_approvals', models.PositiveIntegerField(default=0, verbose_name='Open Approvals')),
+                ('last_assigned_at', models.DateTimeField(blank=True, null=True, verbose_name='Last Assigned At')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='approval_workload', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Approver Workload',
+                'verbose_name_plural': 'Approver Workloads',
+                'ordering': ['-open_approvals'],
+            },
+        ),
+        migrations.RunPython(populate_approver_workload, migrations.RunPython.noop),
+    ]
@@ -77,6 +77,13 @@ class WorkflowStep(models.Model):
         ('owner', _('Object Owner')),
     ]
     
+    ASSIGNMENT_STRATEGIES = [
+        ('first_available', _('First Available')),
+        ('round_robin', _('Round Robin')),
+        ('least_pending', _('Least Pending Approvals')),
+        ('department_affinity', _('Department Affinity')),
+    ]
+    
     template = models.ForeignKey(
         WorkflowTemplate, 
         on_delete=models.CASCADE, 
@@ -106,6 +113,13 @@ class WorkflowStep(models.Model):
         related_name='workflow_steps',
         verbose_name=_('Assignee Role')
     )
+    assignment_strategy = models.CharField(
+        _('Assignment Strategy'),
+        max_length=30,
+        choices=ASSIGNMENT_STRATEGIES,
+        default='first_available',
+        help_text=_('How a role step picks one of the users holding the role')
+    )
     
     # Step settings
     sla_days = models.PositiveIntegerField(_('SLA (Days)'), null=True, blank=True)
@@ -115,6 +129,8 @@ class WorkflowStep(models.Model):
     instructions = models.TextField(_('Instructions'), blank=True)
     instructions_ar = models.TextField(_('التعليمات'), blank=True)
     
+    updated_at = models.DateTimeField(_('Updated At'), auto_now=True)
+    
     class Meta:
         verbose_name = _('Workflow Step')
         verbose_name_plural = _('Workflow Steps')
@@ -251,11 +267,38 @@ class Approval(models.Model):
         verbose_name = _('Approval')
         verbose_name_plural = _('Approvals')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'due_date']),
+        ]
     
     def __str__(self):
         return f"{self.workflow_instance} - {self.step.name} - {self.status}"
 
 
+class ApproverWorkload(models.Model):
+    """
+    عبء الاعتمادات - Open approvals per approver
+    Maintained by workflow signals for the assignment strategies; rebuild
+    with the rebuild_approver_workload command.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='approval_workload',
+        verbose_name=_('User')
+    )
+    open_approvals = models.PositiveIntegerField(_('Open Approvals'), default=0)
+    last_assigned_at = models.DateTimeField(_('Last Assigned At'), null=True, blank=True)
+    
+    class Meta:
+        verbose_name = _('Approver Workload')
+        verbose_name_plural = _('Approver Workloads')
+        ordering = ['-open_approvals']
+    
+    def __str__(self):
+        return f"{self.user} - {self.open_approvals} open"
+
+
 class Task(models.Model):
     """
     المهمة - Task assignment and tracking
@@ -7,9 +7,45 @@ from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 from datetime import timedelta
 
+from .compiled import get_compiled_template, get_compiled_template_by_id
 from .models import WorkflowTemplate, WorkflowStep, WorkflowInstance, Approval, Task
 
 
+# Escalations still awaiting resolution; later levels are raised by the
+# escalation ladder, not by the overdue sweep
+OPEN_ESCALATION_STATUSES = ['pending', 'escalated']
+
+
+def _manager_above(departments, department_id, steps, exclude=None):
+    """
+    Find the manager `steps` parent departments above a department.
+
+    Args:
+        departments: {department id: (parent id, manager id)}
+        department_id: Starting department id
+        steps: Number of parent departments to climb
+        exclude: Manager id to skip (e.g. the current escalation target)
+
+    Returns:
+        int: Manager user id, or None at the top of the chain
+    """
+    seen = set()
+    for _ in range(steps):
+        if department_id is None or department_id in seen:
+            return None
+        seen.add(department_id)
+        department_id = departments.get(department_id, (None, None))[0]
+
+    # Departments without their own manager defer to the next parent
+    while department_id is not None and department_id not in seen:
+        seen.add(department_id)
+        parent_id, manager_id = departments.get(department_id, (None, None))
+        if manager_id and manager_id != exclude:
+            return manager_id
+        department_id = parent_id
+    return None
+
+
 class WorkflowService:
     """
     Centralized service for managing workflow operations.
@@ -33,10 +69,10 @@ class WorkflowService:
         Raises:
             ValueError: If template not found or inactive
         """
-        try:
-            template = WorkflowTemplate.objects.get(code=template_code, is_active=True)
-        except WorkflowTemplate.DoesNotExist:
+        compiled = get_compiled_template(template_code)
+        if compiled is None:
             raise ValueError(f"Workflow template '{template_code}' not found or inactive")
+        template = compiled.template
         
         # Get content type for the object
         content_type = ContentType.objects.get_for_model(obj)
@@ -58,9 +94,9 @@ class WorkflowService:
             )
             
             # Create approval for first step
-            first_step = template.steps.filter(order=1).first()
+            first_step = compiled.step(1)
             if first_step:
-                cls._create_approval_for_step(instance, first_step)
+                cls._create_approval_for_step(instance, first_step, compiled)
             
             # Import here to avoid circular imports
             from .signals import workflow_started
@@ -69,19 +105,23 @@ class WorkflowService:
             return instance
     
     @classmethod
-    def _create_approval_for_step(cls, instance, step):
+    def _create_approval_for_step(cls, instance, step, compiled=None):
         """
         Create an approval record for a workflow step.
         
         Args:
             instance: The WorkflowInstance
             step: The WorkflowStep to create approval for
+            compiled: The instance's CompiledTemplate, if already loaded
             
         Returns:
             Approval: The created approval record
         """
         # Determine assignee based on step configuration
-        assignee = cls._resolve_assignee(instance, step)
+        if compiled is not None:
+            assignee = compiled.resolve_assignee(step, instance)
+        else:
+            assignee = cls._resolve_assignee(instance, step)
         
         # Calculate due date for this step
         sla_days = step.sla_days or instance.template.default_sla_days
@@ -112,52 +152,75 @@ class WorkflowService:
         Returns:
             User: The resolved assignee or None
         """
+        return cls.compile_assignee_resolver(step)(instance)
+    
+    @classmethod
+    def compile_assignee_resolver(cls, step):
+        """
+        Turn a step's assignee configuration into a callable.
+        
+        Args:
+            step: The WorkflowStep
+            
+        Returns:
+            callable: resolver(instance) returning the assignee User or None
+        """
         if step.assignee_type == 'user' and step.assignee_user:
-            return step.assignee_user
+            assignee = step.assignee_user
+            return lambda instance: assignee
         
-        elif step.assignee_type == 'role' and step.assignee_role:
-            # Get first user with this role (can be enhanced for round-robin)
-            from core.models import UserProfile
-            profile = UserProfile.objects.filter(roles=step.assignee_role).first()
-            return profile.user if profile else None
+        elif step.assignee_type == 'role' and step.assignee_role_id:
+            from .assignment import get_assignment_strategy
+            role_id = step.assignee_role_id
+            strategy = get_assignment_strategy(step.assignment_strategy)
+            return lambda instance: strategy(role_id, instance)
         
         elif step.assignee_type == 'manager':
-            # First, try to get manager from the creator's department
-            if instance.initiated_by:
-                try:
-                    from core.models import UserProfile
-                    creator_profile = UserProfile.objects.get(user=instance.initiated_by)
-                    if creator_profile.department and creator_profile.department.manager:
-                        return creator_profile.department.manager
-                except Exception:
-                    pass
-            
-            # Fallback: Get the object and find department manager
-            obj = cls._get_workflow_object(instance)
-            if obj and hasattr(obj, 'department') and obj.department:
-                return obj.department.manager
-            
-            # Fallback 2: Check if object has owner with department
-            if obj and hasattr(obj, 'owner') and obj.owner:
-                try:
-                    from core.models import UserProfile
-                    owner_profile = UserProfile.objects.get(user=obj.owner)
-                    if owner_profile.department and owner_profile.department.manager:
-                        return owner_profile.department.manager
-                except Exception:
-                    pass
-            
-            return None
+            return cls._assign_manager
         
         elif step.assignee_type == 'owner':
-            # Get the object owner
-            obj = cls._get_workflow_object(instance)
-            if obj and hasattr(obj, 'owner'):
-                return obj.owner
-            return None
+            return cls._assign_owner
+        
+        return lambda instance: None
+    
+    @classmethod
+    def _assign_manager(cls, instance):
+        """Department manager of the initiator, the object or the object's owner."""
+        # First, try to get manager from the creator's department
+        if instance.initiated_by:
+            try:
+                from core.models import UserProfile
+                creator_profile = UserProfile.objects.get(user=instance.initiated_by)
+                if creator_profile.department and creator_profile.department.manager:
+                    return creator_profile.department.manager
+            except Exception:
+                pass
+        
+        # Fallback: Get the object and find department manager
+        obj = cls._get_workflow_object(instance)
+        if obj and hasattr(obj, 'department') and obj.department:
+            return obj.department.manager
+        
+        # Fallback 2: Check if object has owner with department
+        if obj and hasattr(obj, 'owner') and obj.owner:
+            try:
+                from core.models import UserProfile
+                owner_profile = UserProfile.objects.get(user=obj.owner)
+                if owner_profile.department and owner_profile.department.manager:
+                    return owner_profile.department.manager
+            except Exception:
+                pass
         
         return None
     
+    @classmethod
+    def _assign_owner(cls, instance):
+        """Owner of the object under approval."""
+        obj = cls._get_workflow_object(instance)
+        if obj and hasattr(obj, 'owner'):
+            return obj.owner
+        return None
+    
     @classmethod
     def _get_workflow_object(cls, instance):
         """
@@ -281,8 +344,9 @@ Due Date: {approval.due_date.strftime('%Y-%m-%d %H:%M') if approval.due_date els
         Returns:
             tuple: (instance, workflow_completed)
         """
-        current_step_num = instance.current_step
-        next_step = instance.template.steps.filter(order=current_step_num + 1).first()
+        compiled = get_compiled_template_by_id(instance.template_id)
+        instance.template = compiled.template
+        next_step = compiled.step(instance.current_step + 1)
         
         if next_step:
             # Move to next step
@@ -290,7 +354,7 @@ Due Date: {approval.due_date.strftime('%Y-%m-%d %H:%M') if approval.due_date els
             instance.save()
             
             # Create approval for next step
-            cls._create_approval_for_step(instance, next_step)
+            cls._create_approval_for_step(instance, next_step, compiled)
             
             return instance, False
         else:
@@ -378,6 +442,8 @@ Due Date: {approval.due_date.strftime('%Y-%m-%d %H:%M') if approval.due_date els
             instance.save()
             
             # Cancel all pending approvals
+            from .assignment import release_approvals
+            release_approvals(instance.approvals.all())
             instance.approvals.filter(status='pending').update(
                 status='delegated',  # Using delegated as cancelled equivalent
                 decided_at=timezone.now()
@@ -479,9 +545,315 @@ Due Date: {approval.due_date.strftime('%Y-%m-%d %H:%M') if approval.due_date els
         workflow_escalated.send(sender=cls, instance=instance, approval=pending_approval)
         
         cls._record_history(instance, 'escalation', None, f"Escalated due to SLA breach")
-        
+
         return True
-    
+
+    @classmethod
+    def escalate_overdue_approvals(cls, now=None, batch_size=1000):
+        """
+        Escalate every overdue approval in one set-based sweep.
+
+        Overdue pending approvals of escalation-enabled templates that have
+        no open escalation are found with a single anti-join, assignees'
+        department managers are resolved with one query, and the Escalation
+        and WorkflowHistory rows are bulk inserted.
+
+        Args:
+            now: Reference time (defaults to timezone.now())
+            batch_size: Rows per bulk insert
+
+        Returns:
+            dict: {'overdue_count', 'escalated_count'}
+        """
+        from django.db.models import Exists, OuterRef
+        from core.models import UserProfile
+        from notifications.models import Escalation
+        from .models import WorkflowHistory
+        from .signals import workflow_escalated
+
+        now = now or timezone.now()
+        overdue = Approval.objects.filter(status='pending', due_date__lt=now)
+        overdue_count = overdue.count()
+
+        open_escalations = Escalation.objects.filter(
+            content_type='workflow.approval',
+            object_id=OuterRef('pk'),
+            status__in=OPEN_ESCALATION_STATUSES
+        )
+        rows = list(
+            overdue.filter(
+                workflow_instance__template__escalation_enabled=True
+            ).filter(
+                ~Exists(open_escalations)
+            ).values_list(
+                'pk', 'assignee_id', 'step__name', 'workflow_instance_id',
+                'workflow_instance__object_title', 'workflow_instance__current_step'
+            ).order_by('pk')
+        )
+        if not rows:
+            return {'overdue_count': overdue_count, 'escalated_count': 0}
+
+        managers = dict(
+            UserProfile.objects.filter(
+                user_id__in={row[1] for row in rows if row[1]},
+                department__manager__isnull=False
+            ).values_list('user_id', 'department__manager_id')
+        )
+
+        escalations = []
+        history = []
+        for approval_id, assignee_id, step_name, instance_id, object_title, current_step in rows:
+            escalations.append(Escalation(
+                content_type='workflow.approval',
+                object_id=approval_id,
+                object_title=object_title,
+                level=1,
+                escalated_from_id=assignee_id,
+                escalated_to_id=managers.get(assignee_id),
+                reason=f"SLA breached for approval step: {step_name}",
+                status='pending'
+            ))
+            history.append(WorkflowHistory(
+                workflow_instance_id=instance_id,
+                action='escalation',
+                details="Escalated due to SLA breach",
+                step_number=current_step
+            ))
+
+        with transaction.atomic():
+            Escalation.objects.bulk_create(escalations, batch_size=batch_size)
+            WorkflowHistory.objects.bulk_create(history, batch_size=batch_size)
+
+        # Only load instances when something listens for escalations
+        if workflow_escalated.has_listeners(cls):
+            for approval in Approval.objects.filter(
+                pk__in=[row[0] for row in rows]
+            ).select_related('workflow_instance', 'step'):
+                workflow_escalated.send(sender=cls, instance=approval.workflow_instance, approval=approval)
+
+        return {'overdue_count': overdue_count, 'escalated_count': len(rows)}
+
+    @classmethod
+    def send_due_reminders(cls, now=None, batch_size=1000):
+        """
+        Remind assignees of pending approvals due within 24 hours.
+
+        Approvals are read with one query, the (recipient, approval) pairs
+        notified in the last 24 hours with one more, and reminders and
+        history rows are rendered in memory and bulk inserted, so the query
+        count does not grow with the number of approvals.
+
+        Args:
+            now: Reference time (defaults to timezone.now())
+            batch_size: Rows per bulk insert
+
+        Returns:
+            dict: {'reminders_sent'}
+        """
+        from django.db.models import Subquery
+        from notifications.models import Notification, NotificationTemplate
+        from .models import WorkflowHistory
+
+        now = now or timezone.now()
+        upcoming = Approval.objects.filter(
+            status='pending',
+            due_date__gte=now,
+            due_date__lte=now + timedelta(days=1),
+            assignee__isnull=False
+        )
+        rows = list(upcoming.values_list(
+            'pk', 'assignee_id', 'assignee__first_name', 'assignee__last_name',
+            'workflow_instance_id', 'workflow_instance__object_title',
+            'workflow_instance__template__name', 'step__name', 'step__order', 'due_date'
+        ).order_by('due_date', 'pk'))
+        if not rows:
+            return {'reminders_sent': 0}
+
+        already_notified = set(
+            Notification.objects.filter(
+                content_type='workflow.approval',
+                object_id__in=Subquery(upcoming.values('pk')),
+                created_at__gte=now - timedelta(hours=24)
+            ).values_list('recipient_id', 'object_id')
+        )
+
+        template = NotificationTemplate.objects.filter(
+            event_type='task_due',
+            is_active=True
+        ).first()
+
+        notifications = []
+        history = []
+        for (approval_id, assignee_id, first_name, last_name, instance_id, object_title,
+                template_name, step_name, step_order, due_date) in rows:
+            if (assignee_id, approval_id) in already_notified:
+                continue
+            notifications.append(Notification(
+                template=template,
+                recipient_id=assignee_id,
+                subject=f"Reminder: Approval Due Tomorrow - {object_title}",
+                body=f"""
+This is a reminder that you have a pending approval due tomorrow.
+
+Workflow: {template_name}
+Item: {object_title}
+Step: {step_name}
+Due Date: {due_date.strftime('%Y-%m-%d %H:%M')}
+
+Please take action before the deadline to avoid escalation.
+""",
+                channel='in_app',
+                priority='high',
+                content_type='workflow.approval',
+                object_id=approval_id
+            ))
+            history.append(WorkflowHistory(
+                workflow_instance_id=instance_id,
+                action='reminder_sent',
+                details=f"Reminder sent to {f'{first_name} {last_name}'.strip()}",
+                step_number=step_order
+            ))
+
+        if notifications:
+            with transaction.atomic():
+                Notification.objects.bulk_create(notifications, batch_size=batch_size)
+                WorkflowHistory.objects.bulk_create(history, batch_size=batch_size)
+
+        return {'reminders_sent': len(notifications)}
+
+    @classmethod
+    def process_escalations(cls, now=None, batch_size=1000):
+        """
+        Climb the escalation ladder, then notify all pending escalations.
+
+        Ladder (settings.WORKFLOW_ESCALATION_LADDER): an escalated item that
+        is still unresolved after the configured hours for its level is
+        raised one level, to the manager of the next parent department
+        above the original assignee's department. Departments without a
+        manager, or managed by the current target, are skipped. Approvals
+        that are no longer pending do not climb.
+
+        Candidates and their originating assignee are read with one query,
+        the department tree with one more, and new escalations,
+        notifications and status updates are written in bulk.
+
+        Args:
+            now: Reference time (defaults to timezone.now())
+            batch_size: Rows per bulk insert or update
+
+        Returns:
+            dict: {'raised_count', 'processed_count'}
+        """
+        from django.conf import settings
+        from django.db.models import Exists, OuterRef, Q, Subquery
+        from core.models import Department, UserProfile
+        from notifications.models import Escalation, Notification
+
+        now = now or timezone.now()
+        ladder = getattr(settings, 'WORKFLOW_ESCALATION_LADDER', [24, 48])
+
+        # Escalations due to move up: unresolved past their level's wait,
+        # not yet raised further, and (for approvals) still pending
+        due = Q(pk__in=[])
+        for level, hours in enumerate(ladder, start=1):
+            due |= Q(level=level, escalated_at__lte=now - timedelta(hours=hours))
+        raised_above = Escalation.objects.filter(
+            content_type=OuterRef('content_type'),
+            object_id=OuterRef('object_id'),
+            level__gt=OuterRef('level')
+        )
+        approval_pending = Approval.objects.filter(pk=OuterRef('object_id'), status='pending')
+        origin = Escalation.objects.filter(
+            content_type=OuterRef('content_type'),
+            object_id=OuterRef('object_id'),
+            level=1
+        ).order_by('-escalated_at').values('escalated_from_id')[:1]
+        candidates = list(
+            Escalation.objects.filter(due, status='escalated').filter(
+                ~Exists(raised_above)
+            ).filter(
+                ~Q(content_type='workflow.approval') | Q(Exists(approval_pending))
+            ).annotate(
+                origin_user_id=Subquery(origin)
+            ).values_list(
+                'content_type', 'object_id', 'object_title', 'level',
+                'escalated_to_id', 'origin_user_id'
+            )
+        )
+
+        raised = []
+        if candidates:
+            departments = {
+                pk: (parent_id, manager_id)
+                for pk, parent_id, manager_id in Department.objects.values_list('id', 'parent_id', 'manager_id')
+            }
+            user_departments = dict(
+                UserProfile.objects.filter(
+                    user_id__in={row[5] for row in candidates if row[5]},
+                    department__isnull=False
+                ).values_list('user_id', 'department_id')
+            )
+            for content_type, object_id, object_title, level, current_id, origin_id in candidates:
+                target_id = _manager_above(
+                    departments, user_departments.get(origin_id), level, exclude=current_id
+                )
+                if target_id is None:
+                    continue
+                raised.append(Escalation(
+                    content_type=content_type,
+                    object_id=object_id,
+                    object_title=object_title,
+                    level=level + 1,
+                    escalated_from_id=current_id,
+                    escalated_to_id=target_id,
+                    reason=f"Unresolved {ladder[level - 1]} hours after level {level} escalation",
+                    status='pending'
+                ))
+            Escalation.objects.bulk_create(raised, batch_size=batch_size)
+
+        pending = list(Escalation.objects.filter(status='pending').values_list(
+            'pk', 'escalated_to_id', 'escalated_from__first_name', 'escalated_from__last_name',
+            'escalated_from_id', 'object_title', 'reason', 'level', 'content_type', 'object_id'
+        ))
+        ids = [row[0] for row in pending]
+        claimed = set()
+        with transaction.atomic():
+            # Only escalations still pending are flipped and notified; one
+            # resolved since the read above keeps its status
+            for start in range(0, len(ids), batch_size):
+                batch_ids = list(Escalation.objects.select_for_update().filter(
+                    pk__in=ids[start:start + batch_size], status='pending'
+                ).values_list('pk', flat=True))
+                Escalation.objects.filter(pk__in=batch_ids, status='pending').update(status='escalated')
+                claimed.update(batch_ids)
+
+            notifications = [
+                Notification(
+                    recipient_id=escalated_to_id,
+                    subject=f"Escalation: {object_title}",
+                    body=f"""
+An item has been escalated to you due to SLA breach.
+
+Item: {object_title}
+Reason: {reason}
+Level: {level}
+Originally assigned to: {f'{first_name} {last_name}'.strip() if escalated_from_id else 'Unknown'}
+
+Please review and take appropriate action.
+""",
+                    channel='in_app',
+                    priority='urgent',
+                    content_type=content_type,
+                    object_id=object_id
+                )
+                for (pk, escalated_to_id, first_name, last_name, escalated_from_id,
+                     object_title, reason, level, content_type, object_id) in pending
+                if escalated_to_id and pk in claimed
+            ]
+            Notification.objects.bulk_create(notifications, batch_size=batch_size)
+
+        return {'raised_count': len(raised), 'processed_count': len(claimed)}
+
     @classmethod
     def _record_history(cls, instance, action, user, details):
         """
@@ -3,7 +3,10 @@ Workflow signals for event-driven architecture.
 These signals allow loose coupling between the workflow engine
 and other parts of the system (notifications, integrations, etc.)
 """
-from django.dispatch import Signal
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .models import Approval
 
 # Fired when a new workflow instance is started
 # Arguments: instance (WorkflowInstance), obj (the linked object)
@@ -32,3 +35,42 @@ task_assigned = Signal()
 # Fired when a task is completed
 # Arguments: task (Task), completed_by (User)
 task_completed = Signal()
+
+
+# Approver workload counters (see workflow.assignment)
+
+@receiver(pre_save, sender=Approval)
+def capture_approval_state(sender, instance, **kwargs):
+    """Remember an approval's stored assignee and status before it is saved."""
+    instance._workload_previous = None
+    if instance.pk and not instance._state.adding:
+        instance._workload_previous = sender.objects.filter(
+            pk=instance.pk
+        ).values_list('assignee_id', 'status').first()
+
+
+@receiver(post_save, sender=Approval)
+def update_approver_workload(sender, instance, created, **kwargs):
+    """Move open-approval counts when an approval opens, closes or changes hands."""
+    from .assignment import adjust_workload
+
+    deltas = {}
+    previous = getattr(instance, '_workload_previous', None)
+    if previous and previous[1] == 'pending' and previous[0]:
+        deltas[previous[0]] = deltas.get(previous[0], 0) - 1
+    if instance.status == 'pending' and instance.assignee_id:
+        deltas[instance.assignee_id] = deltas.get(instance.assignee_id, 0) + 1
+
+    newly_assigned = instance.status == 'pending' and instance.assignee_id and (
+        created or not previous or previous[0] != instance.assignee_id
+    )
+    adjust_workload(deltas, assigned_to=instance.assignee_id if newly_assigned else None)
+
+
+@receiver(post_delete, sender=Approval)
+def release_approver_workload(sender, instance, **kwargs):
+    """Decrement the assignee's count when a pending approval is deleted."""
+    from .assignment import adjust_workload
+
+    if instance.status == 'pending' and instance.assignee_id:
+        adjust_workload({instance.assignee_id: -1})
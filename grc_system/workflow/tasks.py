@@ -4,7 +4,6 @@ Handles SLA monitoring, reminders, and escalations.
 """
 from celery import shared_task
 from django.utils import timezone
-from datetime import timedelta
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,33 +15,17 @@ def check_overdue_approvals(self):
     Check for overdue approvals and mark them accordingly.
     Runs hourly via Celery Beat.
     """
-    from .models import Approval, WorkflowInstance
     from .services import WorkflowService
     
     try:
-        now = timezone.now()
-        
-        # Find pending approvals that are past due
-        overdue_approvals = Approval.objects.filter(
-            status='pending',
-            due_date__lt=now
-        ).select_related('workflow_instance', 'step', 'assignee')
+        result = WorkflowService.escalate_overdue_approvals()
         
-        escalated_count = 0
-        for approval in overdue_approvals:
-            try:
-                # Check if escalation is needed
-                if WorkflowService.check_and_escalate(approval.workflow_instance):
-                    escalated_count += 1
-            except Exception as e:
-                logger.error(f"Error processing overdue approval {approval.pk}: {e}")
-        
-        logger.info(f"Checked overdue approvals: {overdue_approvals.count()} overdue, {escalated_count} escalated")
+        logger.info(
+            f"Checked overdue approvals: {result['overdue_count']} overdue, "
+            f"{result['escalated_count']} escalated"
+        )
         
-        return {
-            'overdue_count': overdue_approvals.count(),
-            'escalated_count': escalated_count
-        }
+        return result
         
     except Exception as e:
         logger.error(f"Error in check_overdue_approvals: {e}")
@@ -55,80 +38,14 @@ def send_reminder_notifications(self):
     Send reminder notifications for approvals due soon.
     Runs daily via Celery Beat.
     """
-    from .models import Approval
-    from notifications.models import Notification, NotificationTemplate
+    from .services import WorkflowService
     
     try:
-        now = timezone.now()
-        tomorrow = now + timedelta(days=1)
-        
-        # Find approvals due within 24 hours that haven't been reminded
-        upcoming_approvals = Approval.objects.filter(
-            status='pending',
-            due_date__gte=now,
-            due_date__lte=tomorrow
-        ).select_related('workflow_instance', 'step', 'assignee')
-        
-        # Get reminder template
-        template = NotificationTemplate.objects.filter(
-            event_type='task_due',
-            is_active=True
-        ).first()
-        
-        reminders_sent = 0
-        for approval in upcoming_approvals:
-            if not approval.assignee:
-                continue
-            
-            # Check if reminder already sent today
-            existing_reminder = Notification.objects.filter(
-                recipient=approval.assignee,
-                content_type='workflow.approval',
-                object_id=approval.pk,
-                created_at__gte=now - timedelta(hours=24)
-            ).exists()
-            
-            if existing_reminder:
-                continue
-            
-            # Send reminder
-            try:
-                Notification.objects.create(
-                    template=template,
-                    recipient=approval.assignee,
-                    subject=f"Reminder: Approval Due Tomorrow - {approval.workflow_instance.object_title}",
-                    body=f"""
-This is a reminder that you have a pending approval due tomorrow.
-
-Workflow: {approval.workflow_instance.template.name}
-Item: {approval.workflow_instance.object_title}
-Step: {approval.step.name}
-Due Date: {approval.due_date.strftime('%Y-%m-%d %H:%M')}
-
-Please take action before the deadline to avoid escalation.
-""",
-                    channel='in_app',
-                    priority='high',
-                    content_type='workflow.approval',
-                    object_id=approval.pk
-                )
-                reminders_sent += 1
-                
-                # Record in history
-                from .models import WorkflowHistory
-                WorkflowHistory.objects.create(
-                    workflow_instance=approval.workflow_instance,
-                    action='reminder_sent',
-                    details=f"Reminder sent to {approval.assignee.get_full_name()}",
-                    step_number=approval.step.order
-                )
-                
-            except Exception as e:
-                logger.error(f"Error sending reminder for approval {approval.pk}: {e}")
+        result = WorkflowService.send_due_reminders()
         
-        logger.info(f"Sent {reminders_sent} reminder notifications")
+        logger.info(f"Sent {result['reminders_sent']} reminder notifications")
         
-        return {'reminders_sent': reminders_sent}
+        return result
         
     except Exception as e:
         logger.error(f"Error in send_reminder_notifications: {e}")
@@ -138,52 +55,21 @@ Please take action before the deadline to avoid escalation.
 @shared_task(bind=True, max_retries=3)
 def process_escalations(self):
     """
-    Process pending escalations and notify appropriate parties.
+    Raise unresolved escalations up the manager ladder and notify
+    appropriate parties of pending escalations.
     Runs every 4 hours via Celery Beat.
     """
-    from notifications.models import Escalation, Notification
+    from .services import WorkflowService
     
     try:
-        # Find pending escalations
-        pending_escalations = Escalation.objects.filter(
-            status='pending'
-        ).select_related('escalated_from', 'escalated_to')
+        result = WorkflowService.process_escalations()
         
-        processed_count = 0
-        for escalation in pending_escalations:
-            try:
-                # Send notification to escalated_to user
-                if escalation.escalated_to:
-                    Notification.objects.create(
-                        recipient=escalation.escalated_to,
-                        subject=f"Escalation: {escalation.object_title}",
-                        body=f"""
-An item has been escalated to you due to SLA breach.
-
-Item: {escalation.object_title}
-Reason: {escalation.reason}
-Level: {escalation.level}
-Originally assigned to: {escalation.escalated_from.get_full_name() if escalation.escalated_from else 'Unknown'}
-
-Please review and take appropriate action.
-""",
-                        channel='in_app',
-                        priority='urgent',
-                        content_type=escalation.content_type,
-                        object_id=escalation.object_id
-                    )
-                
-                # Mark as escalated
-                escalation.status = 'escalated'
-                escalation.save()
-                processed_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error processing escalation {escalation.pk}: {e}")
-        
-        logger.info(f"Processed {processed_count} escalations")
+        logger.info(
+            f"Processed {result['processed_count']} escalations, "
+            f"raised {result['raised_count']} to the next level"
+        )
         
-        return {'processed_count': processed_count}
+        return result
         
     except Exception as e:
         logger.error(f"Error in process_escalations: {e}")
@@ -1,3 +1,86 @@
+"""
+Tests for the approver workload counters and assignment strategies.
+
+Counters adjusted by the Approval signals are compared with
+rebuild_approver_workload() after a random mix of workflow operations.
+"""
+import random
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from core.models import Organization, Role, UserProfile
+from risk.models import Risk
+
+from .assignment import rebuild_approver_workload
+from .models import Approval, ApproverWorkload, WorkflowStep, WorkflowTemplate
+from .services import WorkflowService
+
+
+class ApproverWorkloadTests(TestCase):
+    """Incremental open-approval counts against a rebuild from Approval."""
+
+    def setUp(self):
+        self.organization = Organization.objects.create(name='Workload test', code='WORKLOAD')
+        self.role = Role.objects.create(name='Workload approver', code='workload-approver')
+        User = get_user_model()
+        self.initiator = User.objects.create(username='workload-initiator')
+        self.approvers = []
+        for index in range(4):
+            user = User.objects.create(username=f'workload-approver-{index}')
+            profile, _ = UserProfile.objects.get_or_create(user=user)
+            profile.roles.add(self.role)
+            self.approvers.append(user)
+
+        template = WorkflowTemplate.objects.create(name='Workload review', code='workload-review')
+        for order, strategy in enumerate(['least_pending', 'round_robin'], start=1):
+            WorkflowStep.objects.create(
+                template=template, order=order, name=f'Step {order}',
+                assignee_type='role', assignee_role=self.role, assignment_strategy=strategy
+            )
+
+    def start(self, index):
+        risk = Risk.objects.create(
+            organization=self.organization, risk_id=f'R-{index}', title='Risk', description='Risk'
+        )
+        return WorkflowService.start_workflow('workload-review', risk, self.initiator)
+
+    def stored_counts(self):
+        return dict(ApproverWorkload.objects.filter(open_approvals__gt=0).values_list('user_id', 'open_approvals'))
+
+    def assertMatchesRebuild(self):
+        incremental = self.stored_counts()
+        rebuild_approver_workload()
+        self.assertEqual(incremental, self.stored_counts())
+
+    def test_random_operations_match_rebuild(self):
+        rng = random.Random(9)
+        for index in range(12):
+            self.start(index)
+        self.assertMatchesRebuild()
+
+        for _ in range(25):
+            pending = list(Approval.objects.filter(status='pending').select_related('step', 'workflow_instance'))
+            if not pending:
+                break
+            approval = rng.choice(pending)
+            action = rng.random()
+            if action < 0.4:
+                WorkflowService.handle_approval_decision(approval, 'approved', approval.assignee)
+            elif action < 0.55:
+                WorkflowService.handle_approval_decision(approval, 'rejected', approval.assignee)
+            elif action < 0.75:
+                others = [user for user in self.approvers if user.pk != approval.assignee_id]
+                WorkflowService.delegate_approval(approval, approval.assignee, rng.choice(others))
+            elif action < 0.9:
+                WorkflowService.cancel_workflow(approval.workflow_instance, self.initiator)
+            else:
+                approval.delete()
+        self.assertTrue(Approval.objects.exclude(status='pending').exists())
+        self.assertMatchesRebuild()
+
+    def test_least_pending_spreads_assignments(self):
+        for index in range(8):
+            self.start(index)
+        self.assertEqual(sorted(self.stored_counts().values()), [2, 2, 2, 2])
+        self.assertMatchesRebuild()